@@ -97,6 +97,92 @@ def print_device_metadata():
     print(device_data)
 
 
+def report_backup_load_outcome():
+    """
+    Prints the result of a background asset load that has finished since
+    the backup was loaded, if there is one.
+    """
+    outcome = backup_service.take_load_outcome()
+    if outcome is None:
+        return
+
+    success, message, warning = outcome
+    if success:
+        print(f"{message}\n")
+        print(backup_service.get_formatted_load_stats())
+        if warning:
+            print("\033[31m" + f"{warning}\n" + "\033[0m", file=sys.stderr)
+    else:
+        print("\033[31m" + f"{message}\n" + "\033[0m", file=sys.stderr)
+
+
+def print_load_progress(loaded, total):
+    """Rewrites the current terminal line with the asset load progress."""
+    sys.stdout.write(f"\r  Assets loaded: {loaded} of {total}")
+    sys.stdout.flush()
+
+
+def wait_for_backup_assets():
+    """
+    Waits for the loaded backup's assets if they are still loading in the
+    background.
+
+    Returns:
+        BackupModel | None: The complete backup model, or None if the load
+        failed.
+    """
+    if backup_service.is_loading():
+        print("\nWaiting for the backup's assets to finish loading...")
+        backup_model = backup_service.wait_for_backup_load(
+            on_progress=print_load_progress
+        )
+        print("")
+    else:
+        backup_model = backup_service.current_model
+
+    if backup_model is None:
+        report_backup_load_outcome()
+    return backup_model
+
+
+def pick_backup_from_catalog():
+    """
+    Scans a folder of backups into the backup catalog and lets the user
+    pick one of them.
+
+    Returns:
+        str | None: The chosen backup folder, or None if the user cancels.
+    """
+    print("")
+    backups_root = input(
+        r"Enter the folder holding your backups (e.g 'C:\Users\[Username]\Apple\MobileSync\Backup' or '~/Library/Application Support/MobileSync/Backup'): "
+    ).strip()
+
+    success, message, entries = backup_service.scan_backup_folder(
+        os.path.expanduser(backups_root)
+    )
+    if not success:
+        print("\033[31m" + f"\n{message}\n" + "\033[0m", file=sys.stderr)
+        return None
+
+    print(f"\n{message}")
+    for number, entry in enumerate(entries, start=1):
+        print(f"{number}. {backup_service.format_catalog_entry(entry)}")
+
+    while True:
+        choice = input("\nChoose a backup (or 'cancel' to go back): ").strip()
+        if choice.lower() == "cancel":
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(entries):
+            return entries[int(choice) - 1].backup_path
+        print(
+            "\033[31m"
+            + "Error: Invalid input. Choose one of the displayed backups."
+            + "\033[0m",
+            file=sys.stderr,
+        )
+
+
 def load_backup_menu():
     """
     Handles the user interaction for locating and loading an iPhone backup folder.
@@ -111,7 +197,8 @@ def load_backup_menu():
         )
         print("1. Load iPhone Backup Folder Via GUI")
         print("2. Load iPhone Backup Folder By Entering File Path")
-        print("3. Go Back")
+        print("3. Choose From A Folder Of Backups")
+        print("4. Go Back")
 
         folder_picker_method = input("\nChoose an option: ")
         selected_folder = None
@@ -128,6 +215,12 @@ def load_backup_menu():
             print("")
             print("You chose:", selected_folder)
         elif folder_picker_method == "3":
+            selected_folder = pick_backup_from_catalog()
+            if not selected_folder:
+                continue
+            print("")
+            print("You chose:", selected_folder)
+        elif folder_picker_method == "4":
             print("\nGoing back...\n")
             return
         else:
@@ -150,6 +243,13 @@ def load_backup_menu():
             print(backup_service.get_formatted_device_metadata())
             if warning:
                 print("\033[31m" + f"\n{warning}" + "\033[0m", file=sys.stderr)
+            if backup_service.is_loading():
+                print(
+                    "You can browse albums and change settings while the "
+                    "remaining assets load. Exports wait for them to finish."
+                )
+            else:
+                print(backup_service.get_formatted_load_stats())
             print("")
             return
         else:
@@ -161,6 +261,10 @@ def main_menu():
     Main program command-line interface loop.
     """
     while True:
+        report_backup_load_outcome()
+        if backup_service.is_loading():
+            print(f"[LOADING] {backup_service.get_load_status()}\n")
+
         print(
             "\033[33m"
             + "=========================== iExtract Menu ============================\n"
@@ -286,9 +390,13 @@ def export_all_menu():
     if not dest_path:
         return  # User cancelled somewhere in the helper loop
 
+    backup_model = wait_for_backup_assets()
+    if backup_model is None:
+        return
+
     # Attempt extraction.
     success, message = export_service.export_all(
-        backup_service.current_model, dest_path, settings_service, conversion_service
+        backup_model, dest_path, settings_service, conversion_service
     )
     flush_input()
     if success:
@@ -352,8 +460,12 @@ def export_specific_menu():
     if not dest_path:
         return
 
+    backup_model = wait_for_backup_assets()
+    if backup_model is None:
+        return
+
     success, message = export_service.export_single_album(
-        backup_model=backup_service.current_model,
+        backup_model=backup_model,
         destination_str=dest_path,
         album_name=selected_album,
         settings_service=settings_service,
@@ -742,8 +742,43 @@ class iExtractApp(App):
 
             if icloud_warning:
                 self.call_from_thread(log.write_line, f"[WARNING] {icloud_warning}")
+            if not self.backup_service.is_loading():
+                self.call_from_thread(
+                    log.write_line, self.backup_service.get_formatted_load_stats()
+                )
         else:
             self.call_from_thread(log.write_line, f"[ERROR] {message}")
+            return
+
+        # Assets keep loading in the background while the menus are usable
+        if self.backup_service.is_loading():
+            self.call_from_thread(
+                log.write_line, f"[LOADING] {self.backup_service.get_load_status()}"
+            )
+            self.call_from_thread(pb.remove_class, "hidden")
+
+            def update_load_bar(loaded, total):
+                self.call_from_thread(pb.update, total=total or None, progress=loaded)
+
+            self.backup_service.wait_for_backup_load(
+                on_progress=update_load_bar, poll_interval=0.5
+            )
+            self.call_from_thread(pb.add_class, "hidden")
+
+            outcome = self.backup_service.take_load_outcome()
+            if outcome is not None:
+                success, message, icloud_warning = outcome
+                if success:
+                    self.call_from_thread(log.write_line, f"[SUCCESS] {message}")
+                    self.call_from_thread(
+                        log.write_line, self.backup_service.get_formatted_load_stats()
+                    )
+                    if icloud_warning:
+                        self.call_from_thread(
+                            log.write_line, f"[WARNING] {icloud_warning}"
+                        )
+                else:
+                    self.call_from_thread(log.write_line, f"[ERROR] {message}")
 
     @work(thread=True)
     def run_export(self, target, dest_path):
@@ -764,6 +799,20 @@ class iExtractApp(App):
         )
         self.call_from_thread(pb.update, total=100, progress=0)
 
+        # Exports need every asset, so wait for a load still in progress
+        if self.backup_service.is_loading():
+            self.call_from_thread(
+                log.write_line, "[LOADING] Waiting for assets to finish loading..."
+            )
+        backup_model = self.backup_service.wait_for_backup_load()
+        if backup_model is None:
+            self.call_from_thread(setattr, export_menu, "disabled", False)
+            self.call_from_thread(pb.add_class, "hidden")
+            self.call_from_thread(
+                log.write_line, "\n[ERROR] The backup failed to finish loading.\n"
+            )
+            return
+
         #  Create the safe UI updater
         def update_textual_bar(pct, new_logs=None):
             self.call_from_thread(pb.update, progress=pct)
@@ -773,7 +822,7 @@ class iExtractApp(App):
 
         if target == "all albums":
             success, message = self.export_service.export_all(
-                self.backup_service.current_model,
+                backup_model,
                 dest_path,
                 self.settings_service,
                 self.conversion_service,
@@ -781,7 +830,7 @@ class iExtractApp(App):
             )
         else:
             success, message = self.export_service.export_single_album(
-                self.backup_service.current_model,
+                backup_model,
                 dest_path,
                 target,
                 self.settings_service,
@@ -0,0 +1,187 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Scans a folder of device backups (such as MobileSync/Backup) into
+ the backup catalog, reading every backup in parallel.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from datetime import datetime, timezone
+
+from pathlib import Path
+
+from typing import List, Optional
+
+from functional_components.backup_locator_and_validator.domain. \
+    backup_catalog_entry import BackupCatalogEntry
+
+from functional_components.backup_locator_and_validator.data.get_device_info \
+    import get_device_info
+
+from functional_components.backup_locator_and_validator.data. \
+    get_device_manifest import get_encryption_status
+
+from functional_components.backup_locator_and_validator.data. \
+    backup_catalog import (
+    delete_catalog_entries,
+    get_catalog_entries,
+    get_catalog_path,
+    open_catalog,
+    upsert_catalog_entries,
+)
+
+from functional_components.sql_cmd_facilitator.data.manifest_db_reader import (
+    get_photos_sqlite_path,
+)
+
+from functional_components.sql_cmd_facilitator.data.sqlite_connection_manager import (
+    open_db,
+)
+
+from functional_components.sql_cmd_facilitator.data.asset_reader import (
+    count_assets,
+)
+
+from functional_components.sql_cmd_facilitator.data.album_reader import (
+    count_albums,
+)
+
+
+# Backups are read from disk, so more threads than cores still help
+DEFAULT_SCAN_WORKERS = 8
+
+_FINGERPRINT_FILES = ("Info.plist", "Manifest.plist", "Manifest.db")
+
+
+def find_backup_dirs(backup_root: Path) -> List[Path]:
+    """Returns the backups in backup_root, or backup_root if it is one itself."""
+    if (backup_root / "Info.plist").is_file():
+        return [backup_root]
+    return sorted(
+        path for path in backup_root.iterdir()
+        if path.is_dir() and (path / "Info.plist").is_file()
+    )
+
+def get_backup_fingerprint(backup_path: Path) -> str:
+    """Combines the size and mtime of the files a scan reads.
+
+    A new backup of the device rewrites them, which changes the
+    fingerprint.
+    """
+    parts = []
+    for name in _FINGERPRINT_FILES:
+        try:
+            stat = (backup_path / name).stat()
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+def scan_backup(backup_path: Path) -> BackupCatalogEntry:
+    """Reads a backup's metadata and Photos.sqlite row counts.
+
+    Problems are recorded on the entry's error rather than raised, so one
+    unreadable backup does not stop a scan of many.
+    """
+    entry = BackupCatalogEntry(
+        backup_path=str(backup_path),
+        fingerprint=get_backup_fingerprint(backup_path),
+        scanned_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+
+    try:
+        raw_info = get_device_info(backup_path)
+        entry.backup_uuid = raw_info.get("GUID")
+        entry.device_name = raw_info.get("Device Name")
+        entry.device_model = raw_info.get("Product Type")
+        entry.ios_version = raw_info.get("Product Version")
+        if raw_info.get("Last Backup Date") is not None:
+            entry.backup_date = raw_info["Last Backup Date"].isoformat()
+    except Exception as e:
+        entry.error = f"Failed loading device info: {e}"
+        return entry
+
+    try:
+        entry.is_encrypted = get_encryption_status(backup_path)
+    except Exception as e:
+        entry.error = f"Failed reading Manifest.plist: {e}"
+        return entry
+
+    # The databases of encrypted backups cannot be read
+    if entry.is_encrypted:
+        return entry
+
+    try:
+        with open_db(get_photos_sqlite_path(backup_path)) as photos_conn:
+            entry.asset_count = count_assets(photos_conn)
+            entry.album_count = count_albums(photos_conn)
+    except Exception as e:
+        entry.error = f"Failed reading Photos.sqlite: {e}"
+    return entry
+
+def scan_backup_catalog(
+    backup_root: Path,
+    catalog_path: Optional[Path] = None,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+    rescan: bool = False,
+) -> List[BackupCatalogEntry]:
+    """Brings the catalog up to date with the backups in backup_root.
+
+    Only backups that are new or have changed since their last scan are
+    read, in parallel; the rest come from the catalog. Catalog entries of
+    backups that have disappeared from backup_root are removed. rescan
+    reads every backup again.
+
+    Entries are keyed by backup paths under the resolved backup_root, so
+    the same folder reached through a relative path, a symlink or ".."
+    maps to the same entries.
+
+    Returns:
+        The catalog entries of every backup in backup_root.
+    """
+    if catalog_path is None:
+        catalog_path = get_catalog_path()
+
+    backup_root = backup_root.resolve()
+    backup_dirs = find_backup_dirs(backup_root)
+
+    with open_catalog(catalog_path) as conn:
+        known = {entry.backup_path: entry for entry in get_catalog_entries(conn)}
+
+    to_scan = [
+        path for path in backup_dirs
+        if rescan
+        or str(path) not in known
+        or known[str(path)].fingerprint != get_backup_fingerprint(path)
+    ]
+
+    scanned = []
+    if to_scan:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(to_scan)),
+            thread_name_prefix="backup-scan",
+        ) as executor:
+            scanned = list(executor.map(scan_backup, to_scan))
+
+    # Backups that used to be in backup_root but are gone now, including
+    #  entries stored under another spelling of a path still present
+    present = {str(path) for path in backup_dirs}
+    removed = [
+        path for path in known
+        if path not in present and Path(path).resolve().parent == backup_root
+    ]
+
+    with open_catalog(catalog_path) as conn:
+        upsert_catalog_entries(conn, scanned)
+        delete_catalog_entries(conn, removed)
+
+    known.update((entry.backup_path, entry) for entry in scanned)
+    return [known[str(path)] for path in backup_dirs]
+
+def list_backup_catalog(catalog_path: Optional[Path] = None) -> List[BackupCatalogEntry]:
+    """Returns every backup in the catalog without reading any backup."""
+    if catalog_path is None:
+        catalog_path = get_catalog_path()
+    with open_catalog(catalog_path) as conn:
+        return get_catalog_entries(conn)
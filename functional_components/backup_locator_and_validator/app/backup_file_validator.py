@@ -0,0 +1,49 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Checks every asset of a BackupModel against the files in the
+ backup before anything is exported.
+"""
+
+from pathlib import Path
+
+from functional_components.backup_locator_and_validator.domain.backup_model \
+    import BackupModel
+
+from functional_components.backup_locator_and_validator.domain. \
+    backup_file_report import BackupFileReport
+
+from functional_components.backup_locator_and_validator.data. \
+    backup_shard_scanner import DEFAULT_SHARD_WORKERS, scan_backup_shards
+
+
+def prevalidate_backup_files(
+    backup_model: BackupModel,
+    backup_root: Path,
+    max_workers: int = DEFAULT_SHARD_WORKERS,
+) -> BackupFileReport:
+    """Records the file size of every asset whose file is in the backup.
+
+    The shard directories are listed once and each asset's
+    backup_hashed_filename is looked up in the listing, so a missing file
+    is reported here instead of failing its copy mid-export. Only asset
+    files are stat'ed for their size. Assets whose file is missing keep a
+    file_size of None.
+    """
+    sizes, shards_scanned = scan_backup_shards(
+        backup_root,
+        (asset.backup_hashed_filename for asset in backup_model.assets),
+        max_workers,
+    )
+
+    report = BackupFileReport(shards_scanned=shards_scanned)
+    for asset in backup_model.assets:
+        size = sizes.get(asset.backup_hashed_filename)
+        asset.file_size = size
+        if size is None:
+            report.missing_asset_uuids.append(asset.asset_uuid)
+        else:
+            report.present_assets += 1
+            report.total_bytes += size
+    report.checked_assets = len(backup_model.assets)
+    return report
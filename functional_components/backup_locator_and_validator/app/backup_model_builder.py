@@ -4,8 +4,16 @@ Date: 2026-02-15
 Description: Process to build the BackupModel.
 """
 
+import queue
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
 from pathlib import Path
 
+from typing import Iterator, Optional
+
 from functional_components.backup_locator_and_validator.domain.backup_model \
     import (
     BackupModel,
@@ -16,27 +24,53 @@ from functional_components.backup_locator_and_validator.domain.backup_model \
 from functional_components.backup_locator_and_validator.domain. \
     backup_model_result import BackupModelResult
 
+from functional_components.backup_locator_and_validator.domain. \
+    backup_load_progress import BackupLoadProgress
+
+from functional_components.backup_locator_and_validator.domain.load_stats \
+    import LoadStats
+
+from functional_components.backup_locator_and_validator.app. \
+    backup_file_validator import prevalidate_backup_files
+
 from functional_components.backup_locator_and_validator.data.get_device_info \
     import get_device_info
 
 from functional_components.backup_locator_and_validator.data. \
     get_device_manifest import get_encryption_status
 
+from functional_components.backup_locator_and_validator.data. \
+    backup_model_cache import (
+    get_cache_dir,
+    get_cache_key,
+    load_cached_result,
+    load_previous_result,
+    store_cached_result,
+)
+
 from functional_components.sql_cmd_facilitator.data.manifest_db_reader import (
     get_photos_sqlite_path,
+    get_manifest_index,
 )
 
 from functional_components.sql_cmd_facilitator.data.sqlite_connection_manager import (
     open_db,
 )
 
+from functional_components.sql_cmd_facilitator.data.sql_executor import (
+    DEFAULT_BATCH_SIZE,
+)
+
 from functional_components.sql_cmd_facilitator.app.schema_inspector import (
-    find_album_asset_join_table,
-    find_join_table_columns,
+    get_schema_profile,
+)
+
+from functional_components.sql_cmd_facilitator.domain.schema_profile import (
+    SchemaProfile,
 )
 
 from functional_components.sql_cmd_facilitator.data.album_reader import (
-    get_albums,
+    iter_albums,
 )
 
 from functional_components.sql_cmd_facilitator.app.album_builder import (
@@ -44,8 +78,9 @@ from functional_components.sql_cmd_facilitator.app.album_builder import (
 )
 
 from functional_components.sql_cmd_facilitator.data.asset_reader import (
-    get_assets,
-    get_asset_album_memberships
+    count_assets,
+    iter_assets,
+    iter_asset_album_memberships
 )
 
 from functional_components.sql_cmd_facilitator.app.asset_builder import (
@@ -64,117 +99,329 @@ def build_device(raw_info: dict) -> SourceDevice:
     return device
 
 
-def build_backup_model(backup_root: Path) -> BackupModelResult:
-    """The function in which the whole backup model is built."""
-
-    # Read source files once
-    try:
-        raw_info = get_device_info(backup_root)
-    except Exception as e:
-        return BackupModelResult(
-            success=False,
-            error=f"Failed loading device info: {e}"
-        )
-
+# Number of ZASSET row batches read ahead of build_assets
+_PREFETCH_BATCHES = 4
+
+_END_OF_ROWS = object()
+
+
+def _timed(stats: LoadStats, phase: str, func, *args):
+    """Calls func(*args), recording its wall time on stats as phase."""
+    with stats.time_phase(phase):
+        return func(*args)
+
+def _read_manifest_index(manifest_db_path: Path, stats: LoadStats):
+    """Reads the Media/ file list of Manifest.db on its own connection."""
+    with stats.time_phase("manifest_index"):
+        with open_db(manifest_db_path) as manifest_conn:
+            manifest_index = get_manifest_index(manifest_conn)
+    stats.count("manifest_paths", len(manifest_index.file_id_by_path))
+    return manifest_index
+
+def _read_albums(photos_sqlite_path: Path, stats: LoadStats):
+    """Reads and builds the albums of Photos.sqlite on its own connection."""
+    with stats.time_phase("albums"):
+        with open_db(photos_sqlite_path) as photos_conn:
+            albums = build_albums(iter_albums(photos_conn))
+    stats.count("album_rows", len(albums))
+    return albums
+
+def _count_assets(photos_sqlite_path: Path) -> int:
+    """Counts the ZASSET rows of Photos.sqlite on its own connection."""
+    with open_db(photos_sqlite_path) as photos_conn:
+        return count_assets(photos_conn)
+
+def _read_schema_profile(photos_sqlite_path: Path, stats: LoadStats) -> SchemaProfile:
+    """Discovers the dynamic schema of Photos.sqlite on its own connection."""
+    with stats.time_phase("schema_inspection"):
+        with open_db(photos_sqlite_path) as photos_conn:
+            return get_schema_profile(photos_conn)
+
+def _read_membership_lookup(
+    photos_sqlite_path: Path,
+    schema_profile: SchemaProfile,
+    stats: LoadStats,
+):
+    """Reads the album membership of every asset on its own connection."""
+    def counted(rows):
+        for row in rows:
+            stats.count("membership_rows")
+            yield row
+
+    with stats.time_phase("memberships"):
+        with open_db(photos_sqlite_path) as photos_conn:
+            raw_memberships = iter_asset_album_memberships(
+                photos_conn,
+                schema_profile.join_table,
+                schema_profile.album_fk,
+                schema_profile.asset_fk,
+            )
+            return build_membership_lookup(counted(raw_memberships))
+
+def _prefetch_assets(
+    photos_sqlite_path: Path,
+    schema_profile: SchemaProfile,
+    row_queue: queue.Queue,
+    stop: threading.Event,
+    stats: Optional[LoadStats] = None,
+) -> None:
+    """Reads ZASSET rows on its own connection into row_queue in batches.
+
+    The queue is bounded, so at most a few batches are held in memory
+    ahead of the consumer. Ends with _END_OF_ROWS, or with the exception
+    that stopped the read. Gives up early once stop is set.
+
+    The asset_scan time recorded on stats leaves out the time spent
+    waiting for the consumer to make room in the queue. It is recorded
+    before the final item is put, since the load may return as soon as the
+    consumer takes it, and not at all if the read is abandoned.
+    """
+    blocked_seconds = 0.0
+    row_count = 0
+
+    def put(item) -> bool:
+        nonlocal blocked_seconds
+        put_start = time.perf_counter()
+        try:
+            while not stop.is_set():
+                try:
+                    row_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            blocked_seconds += time.perf_counter() - put_start
+
+    scan_start = time.perf_counter()
+    last_item = _END_OF_ROWS
     try:
-        is_encrypted = get_encryption_status(backup_root)
+        with open_db(photos_sqlite_path) as photos_conn:
+            batch = []
+            for row in iter_assets(photos_conn, schema_profile):
+                batch.append(row)
+                if len(batch) >= DEFAULT_BATCH_SIZE:
+                    row_count += len(batch)
+                    if not put(batch):
+                        return
+                    batch = []
+            row_count += len(batch)
+            if batch and not put(batch):
+                return
     except Exception as e:
-        return BackupModelResult(
-            success=False,
-            error=f"Failed reading Manifest.plist: {e}"
-        )
+        last_item = e
 
-    # If encrypted, fail immediately
-    if is_encrypted:
-        return BackupModelResult(
-            success=False,
-            error="Backup is encrypted. Please provide an unencrypted backup."
+    if stats is not None:
+        stats.phase_seconds["asset_scan"] = (
+            time.perf_counter() - scan_start - blocked_seconds
         )
+        stats.count("asset_rows", row_count)
+    put(last_item)
+
+def _drain_assets(
+    row_queue: queue.Queue,
+    progress: Optional[BackupLoadProgress] = None,
+) -> Iterator[dict]:
+    """Yields the rows put on row_queue by _prefetch_assets."""
+    while True:
+        item = row_queue.get()
+        if item is _END_OF_ROWS:
+            return
+        if isinstance(item, Exception):
+            raise item
+        if progress is not None:
+            progress.advance(len(item))
+        yield from item
+
+
+def build_backup_model(
+    backup_root: Path,
+    previous_model: Optional[BackupModel] = None,
+    progress: Optional[BackupLoadProgress] = None,
+) -> BackupModelResult:
+    """The function in which the whole backup model is built.
+
+    See _build_backup_model. The returned result carries the LoadStats of
+    the load, whether it succeeded or not. The asset paths are built from
+    the resolved backup_root, so they stay valid from any working directory.
+    """
+    backup_root = Path(backup_root).resolve()
+    stats = LoadStats()
+    with stats.time_phase("total"):
+        result = _build_backup_model(backup_root, previous_model, progress, stats)
+    result.load_stats = stats
+    return result
+
+
+def _build_backup_model(
+    backup_root: Path,
+    previous_model: Optional[BackupModel],
+    progress: Optional[BackupLoadProgress],
+    stats: LoadStats,
+) -> BackupModelResult:
+    """Builds the BackupModel, recording each phase's timings on stats.
+
+    The independent reads (the plists, the Manifest.db index and the
+    album, membership and asset scans of Photos.sqlite) run concurrently,
+    each on its own connection. Failures are still reported in the same
+    order as a sequential load would report them.
+
+    If previous_model is an earlier model of the same backup, assets that
+    have not changed since are reused instead of being rebuilt.
+
+    If progress is given, the device metadata and albums are published to
+    it as soon as they are read, and it counts the asset rows as they are
+    built. Ending the load is left to the caller.
+    """
+    manifest_db_path = backup_root / "Manifest.db"
+    executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="backup-load")
+    stop_prefetch = threading.Event()
 
-    # Build the device object from the already-loaded raw_info
     try:
-        device = build_device(raw_info)
-    except Exception as e:
-        return BackupModelResult(
-            success=False,
-            error=f"Failed building device object: {e}"
+        # Start every read that only needs the backup root
+        info_future = executor.submit(
+            _timed, stats, "device_info", get_device_info, backup_root
         )
-
-    # Locate Photos.sqlite via Manifest.db
-    try:
-        photos_sqlite_path = get_photos_sqlite_path(backup_root)
-    except Exception as e:
-        return BackupModelResult(
-            success=False,
-            error=f"Failed locating Photos.sqlite: {e}"
+        encryption_future = executor.submit(
+            _timed, stats, "manifest_plist", get_encryption_status, backup_root
         )
+        photos_path_future = executor.submit(
+            _timed, stats, "locate_photos_sqlite", get_photos_sqlite_path, backup_root
+        )
+        index_future = executor.submit(_read_manifest_index, manifest_db_path, stats)
+
+        # Read source files once
+        try:
+            raw_info = info_future.result()
+        except Exception as e:
+            return BackupModelResult(
+                success=False,
+                error=f"Failed loading device info: {e}"
+            )
 
-    # Query Photos.sqlite and Manifest.db to build assets and albums
-    try:
-        manifest_db_path = backup_root / "Manifest.db"
-
-        with open_db(photos_sqlite_path) as photos_conn, \
-            open_db(manifest_db_path) as manifest_conn:
-
-            # Discover dynamic schema
-            join_table = find_album_asset_join_table(photos_conn)
-            join_cols = find_join_table_columns(photos_conn, join_table)
-
-            # Build albums
-            raw_albums = get_albums(photos_conn)
-            albums = build_albums(raw_albums)
+        try:
+            is_encrypted = encryption_future.result()
+        except Exception as e:
+            return BackupModelResult(
+                success=False,
+                error=f"Failed reading Manifest.plist: {e}"
+            )
 
-            # Build assets
-            raw_assets = get_assets(photos_conn)
+        # If encrypted, fail immediately
+        if is_encrypted:
+            return BackupModelResult(
+                success=False,
+                error="Backup is encrypted. Please provide an unencrypted backup."
+            )
 
-            # -- Debug live photo videos not appearing.
-            # from collections import Counter
-            # raw_subtype_counts = Counter(row.get("ZKINDSUBTYPE") for row in raw_assets)
-            # print(f"Raw ZKINDSUBTYPE values in DB: {dict(raw_subtype_counts)}")
+        # Build the device object from the already-loaded raw_info
+        try:
+            device = build_device(raw_info)
+        except Exception as e:
+            return BackupModelResult(
+                success=False,
+                error=f"Failed building device object: {e}"
+            )
 
-            # for row in raw_assets:
-            #     if row.get("ZKINDSUBTYPE") == 2:
-            #         print(f"  ZKINDSUBTYPE=2  ZKIND={row.get('ZKIND')}  UTI={row.get('ZUNIFORMTYPEIDENTIFIER')}  FILE={row.get('ZFILENAME')}")
+        # Locate Photos.sqlite via Manifest.db
+        try:
+            photos_sqlite_path = photos_path_future.result()
+        except Exception as e:
+            return BackupModelResult(
+                success=False,
+                error=f"Failed locating Photos.sqlite: {e}"
+            )
 
-            # from functional_components.sql_cmd_facilitator.data.sql_executor import execute_query
-            # from functional_components.sql_cmd_facilitator.data.row_mapper import map_rows
+        backup_metadata = BackupMetadata(
+            backup_uuid=raw_info["GUID"],
+            backup_date=raw_info["Last Backup Date"].isoformat(),
+            is_encrypted=is_encrypted,
+            source_device=device
+        )
 
-            # mov_rows = execute_query(
-            #     manifest_conn,
-            #     "SELECT fileID, relativePath FROM Files WHERE relativePath LIKE '%.MOV'"
-            # )
-            # for row in map_rows(mov_rows):
-            #     print(f"  MOV in Manifest.db: {row['relativePath']}")
+        # Query Photos.sqlite and Manifest.db to build assets and albums
+        try:
+            profile_future = executor.submit(
+                _read_schema_profile, photos_sqlite_path, stats
+            )
+            albums_future = executor.submit(_read_albums, photos_sqlite_path, stats)
+            count_future = None
+            if progress is not None:
+                count_future = executor.submit(_count_assets, photos_sqlite_path)
+
+            # The membership and asset queries are generated from the
+            #  schema, so both wait for it
+            schema_profile = profile_future.result()
+            memberships_future = executor.submit(
+                _read_membership_lookup, photos_sqlite_path, schema_profile, stats
+            )
 
-            raw_memberships = get_asset_album_memberships(
-                photos_conn,
-                join_table,
-                join_cols["album_fk"],
-                join_cols["asset_fk"],
+            # Assets are read ahead through a bounded queue while the
+            #  membership lookup and Manifest.db index are still loading.
+            #  Rows are streamed in batches rather than loaded up front, so
+            #  the whole of ZASSET is never in memory.
+            row_queue = queue.Queue(maxsize=_PREFETCH_BATCHES)
+            executor.submit(
+                _prefetch_assets,
+                photos_sqlite_path,
+                schema_profile,
+                row_queue,
+                stop_prefetch,
+                stats,
             )
-            membership_lookup = build_membership_lookup(raw_memberships)
 
+            albums = albums_future.result()
+
+            # Let the caller show the metadata and albums while the assets
+            #  are still being built
+            if progress is not None:
+                progress.publish_partial(
+                    BackupModel.model_construct(
+                        backup_metadata=backup_metadata,
+                        assets=[],
+                        albums=albums
+                    ),
+                    count_future.result(),
+                )
+
+            membership_lookup = memberships_future.result()
+
+            # Read the Media/ file list once instead of once per asset
+            manifest_index = index_future.result()
+
+            previous_assets = None
+            if previous_model is not None:
+                previous_assets = {
+                    asset.asset_uuid: asset for asset in previous_model.assets
+                }
+
+            # Every lookup is answered by manifest_index, so build_assets
+            #  needs no Manifest.db connection of its own.
             assets, skipped = build_assets(
-                raw_assets,
+                _drain_assets(row_queue, progress),
                 membership_lookup,
                 backup_root,
-                manifest_conn
+                None,
+                manifest_index,
+                previous_assets,
+                stats,
             )
 
-    except Exception as e:
-        return BackupModelResult(
-            success=False,
-            error=f"Failed building assets and albums: {e}"
-        )
+        except Exception as e:
+            return BackupModelResult(
+                success=False,
+                error=f"Failed building assets and albums: {e}"
+            )
 
-    # Make the BackupModel object
-    backup_model = BackupModel(
-        backup_metadata=BackupMetadata(
-            backup_uuid=raw_info["GUID"],
-            backup_date=raw_info["Last Backup Date"].isoformat(),
-            is_encrypted=is_encrypted,
-            source_device=device
-        ),
+    finally:
+        # Reads still running after a failure are abandoned, not awaited
+        stop_prefetch.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Make the BackupModel object. The assets are trusted AssetRecords, so
+    #  the model is constructed without re-validating each of them.
+    backup_model = BackupModel.model_construct(
+        backup_metadata=backup_metadata,
         assets=assets,
         albums=albums
     )
@@ -212,3 +459,106 @@ def build_backup_model(backup_root: Path) -> BackupModelResult:
         backup_model=backup_model,
         icloud_warning=icloud_warning
     )
+
+
+def load_backup_model(
+    backup_root: Path,
+    cache_dir: Optional[Path] = None,
+    progress: Optional[BackupLoadProgress] = None,
+) -> BackupModelResult:
+    """Returns the BackupModel for a backup, reusing a cached one if unchanged.
+
+    Falls back to build_backup_model when the backup is new or has
+    changed since it was cached. A changed backup is rebuilt incrementally
+    from its previously cached model. Failed builds are never cached.
+    progress is passed on to build_backup_model.
+
+    Files can disappear from a backup without its databases changing, so
+    every successful load, cached or not, then checks the asset files
+    with prevalidate_backup_files.
+
+    backup_root is resolved first, since the cache identifies a backup by
+    its resolved root and cached asset paths must match it.
+    """
+    backup_root = Path(backup_root).resolve()
+    result = _load_backup_model(backup_root, cache_dir, progress)
+    if result.success and result.backup_model is not None:
+        stats = result.load_stats
+        if stats is None:
+            stats = LoadStats()
+        result.file_report = _timed(
+            stats,
+            "file_prevalidation",
+            prevalidate_backup_files,
+            result.backup_model,
+            backup_root,
+        )
+        stats.count("missing_files", result.file_report.missing_assets)
+    return result
+
+
+def _load_backup_model(
+    backup_root: Path,
+    cache_dir: Optional[Path],
+    progress: Optional[BackupLoadProgress],
+) -> BackupModelResult:
+    """Returns the cached or freshly built result for load_backup_model."""
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+
+    # A backup that cannot be identified is left for the full build to
+    #  report on.
+    try:
+        key = get_cache_key(backup_root)
+    except Exception:
+        return build_backup_model(backup_root, progress=progress)
+
+    stats = LoadStats(from_cache=True)
+    with stats.time_phase("cache_lookup"):
+        cached = load_cached_result(cache_dir, key)
+    if cached is not None:
+        # The cached stats describe the original build, not this load
+        stats.phase_seconds["total"] = stats.phase_seconds["cache_lookup"]
+        stats.count("assets_cached", len(cached.backup_model.assets))
+        cached.load_stats = stats
+        return cached
+
+    previous = load_previous_result(cache_dir, key)
+    previous_model = previous.backup_model if previous is not None else None
+
+    result = build_backup_model(backup_root, previous_model, progress)
+    if result.load_stats is not None:
+        result.load_stats.phase_seconds["cache_lookup"] = (
+            stats.phase_seconds["cache_lookup"]
+        )
+    if result.success:
+        try:
+            store_cached_result(cache_dir, key, result)
+        except OSError:
+            pass  # Caching is an optimization; the load itself succeeded
+    return result
+
+
+def start_backup_model_load(
+    backup_root: Path,
+    cache_dir: Optional[Path] = None,
+) -> BackupLoadProgress:
+    """Starts load_backup_model on a background thread and returns at once.
+
+    The returned BackupLoadProgress receives the metadata and albums as
+    soon as they are read, then the final result when the load ends.
+    """
+    progress = BackupLoadProgress()
+
+    def run():
+        try:
+            result = load_backup_model(backup_root, cache_dir, progress)
+        except Exception as e:
+            result = BackupModelResult(
+                success=False,
+                error=f"Failed building assets and albums: {e}"
+            )
+        progress.finish(result)
+
+    threading.Thread(target=run, name="backup-load", daemon=True).start()
+    return progress
@@ -0,0 +1,86 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Stores scanned BackupCatalogEntries in a local SQLite catalog so
+ that many backups can be listed without loading any of them.
+"""
+
+import sqlite3
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List
+
+from functional_components.backup_locator_and_validator.data. \
+    backup_model_cache import get_cache_dir
+
+from functional_components.backup_locator_and_validator.domain. \
+    backup_catalog_entry import BackupCatalogEntry
+
+
+_CATALOG_COLUMNS = tuple(BackupCatalogEntry.model_fields)
+
+_CREATE_CATALOG_TABLE = """
+        CREATE TABLE IF NOT EXISTS backups (
+            backup_path TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            scanned_at TEXT NOT NULL,
+            backup_uuid TEXT,
+            device_name TEXT,
+            device_model TEXT,
+            ios_version TEXT,
+            backup_date TEXT,
+            is_encrypted INTEGER,
+            asset_count INTEGER,
+            album_count INTEGER,
+            error TEXT
+        )
+        """
+
+
+def get_catalog_path() -> Path:
+    """Returns the default location of the backup catalog database."""
+    return get_cache_dir().parent / "backup_catalog.sqlite"
+
+@contextmanager
+def open_catalog(catalog_path: Path):
+    """Opens the catalog database, creating it if needed, and commits on exit."""
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(catalog_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute(_CREATE_CATALOG_TABLE)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+def get_catalog_entries(conn: sqlite3.Connection) -> List[BackupCatalogEntry]:
+    """Returns every entry in the catalog, ordered by backup date, newest first."""
+    rows = conn.execute(
+        f"SELECT {', '.join(_CATALOG_COLUMNS)} FROM backups "
+        f"ORDER BY backup_date DESC, backup_path"
+    ).fetchall()
+    return [BackupCatalogEntry(**dict(row)) for row in rows]
+
+def upsert_catalog_entries(
+    conn: sqlite3.Connection,
+    entries: Iterable[BackupCatalogEntry],
+) -> None:
+    """Adds entries to the catalog, replacing earlier scans of the same path."""
+    placeholders = ", ".join("?" for _ in _CATALOG_COLUMNS)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO backups ({', '.join(_CATALOG_COLUMNS)}) "
+        f"VALUES ({placeholders})",
+        (
+            tuple(getattr(entry, column) for column in _CATALOG_COLUMNS)
+            for entry in entries
+        ),
+    )
+
+def delete_catalog_entries(conn: sqlite3.Connection, backup_paths: Iterable[str]) -> None:
+    """Removes the entries of backups that no longer exist."""
+    conn.executemany(
+        "DELETE FROM backups WHERE backup_path = ?",
+        ((path,) for path in backup_paths),
+    )
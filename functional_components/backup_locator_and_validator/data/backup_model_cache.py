@@ -0,0 +1,167 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-17
+Description: Stores built BackupModelResults on disk so that re-opening an
+ unchanged backup skips the whole Photos.sqlite parse.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import zlib
+
+from pathlib import Path
+from typing import Optional
+
+from functional_components.backup_locator_and_validator.data.get_device_info \
+    import get_device_info
+
+from functional_components.backup_locator_and_validator.domain. \
+    backup_model_result import BackupModelResult
+
+from functional_components.sql_cmd_facilitator.data.manifest_db_reader import (
+    get_photos_sqlite_path,
+)
+
+
+# Bump whenever the BackupModel layout changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 6
+
+# Total size the cache directory may grow to before old entries are evicted
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+_CACHE_FILE_SUFFIX = ".bmc"
+_CACHE_MAGIC = b"IEXTRACT-BMC"
+
+
+def get_cache_dir() -> Path:
+    """Returns the per-user directory that holds cached backup models."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "iExtract" / "backup_models"
+
+def get_cache_key(backup_root: Path) -> str:
+    """Identifies a backup by its GUID, where it is on disk, and the size
+    and mtime of its databases.
+
+    Any new backup of the device rewrites Manifest.db and Photos.sqlite,
+    which changes the key. Keys start with a digest of the GUID and the
+    resolved backup root, so that earlier models of the same backup can
+    still be found. Cached assets hold absolute paths into the backup, so
+    a copy of it elsewhere never shares entries with the original.
+    """
+    guid = get_device_info(backup_root)["GUID"]
+    root = str(Path(backup_root).resolve())
+    manifest_stat = (backup_root / "Manifest.db").stat()
+    photos_stat = get_photos_sqlite_path(backup_root).stat()
+
+    identity = "|".join(str(part) for part in (
+        CACHE_FORMAT_VERSION,
+        guid,
+        root,
+        manifest_stat.st_size,
+        manifest_stat.st_mtime_ns,
+        photos_stat.st_size,
+        photos_stat.st_mtime_ns,
+    ))
+    location = f"{guid}|{root}"
+    guid_digest = hashlib.sha256(location.encode("utf-8")).hexdigest()[:16]
+    identity_digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+    return f"{guid_digest}_{identity_digest}"
+
+def _same_device_entries(cache_dir: Path, key: str) -> list:
+    """Returns cache files for the same backup GUID and root as key, except
+    key's own.
+    """
+    guid_digest = key.split("_", 1)[0]
+    own_name = key + _CACHE_FILE_SUFFIX
+    return [
+        path for path in cache_dir.glob(f"{guid_digest}_*{_CACHE_FILE_SUFFIX}")
+        if path.name != own_name
+    ]
+
+def load_cached_result(cache_dir: Path, key: str) -> Optional[BackupModelResult]:
+    """Returns the cached result for key, or None if there is no usable entry."""
+    cache_path = cache_dir / (key + _CACHE_FILE_SUFFIX)
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+
+    try:
+        if not data.startswith(_CACHE_MAGIC):
+            raise ValueError("Not a backup model cache file")
+        result = pickle.loads(zlib.decompress(data[len(_CACHE_MAGIC):]))
+        if not isinstance(result, BackupModelResult):
+            raise ValueError("Unexpected object in backup model cache")
+    except Exception:
+        # Unreadable entries are dropped so they get rebuilt next time
+        cache_path.unlink(missing_ok=True)
+        return None
+
+    # Mark as recently used for eviction
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return result
+
+def load_previous_result(cache_dir: Path, key: str) -> Optional[BackupModelResult]:
+    """Returns the most recent cached result for an older copy of key's backup.
+
+    Used as the starting point for an incremental rebuild.
+    """
+    try:
+        candidates = _same_device_entries(cache_dir, key)
+    except OSError:
+        return None
+    for path in sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True):
+        result = load_cached_result(cache_dir, path.name[:-len(_CACHE_FILE_SUFFIX)])
+        if result is not None:
+            return result
+    return None
+
+def store_cached_result(
+    cache_dir: Path,
+    key: str,
+    result: BackupModelResult,
+    max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+) -> None:
+    """Writes result to the cache, then evicts old entries over max_bytes."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = cache_dir / (key + _CACHE_FILE_SUFFIX)
+    temp_path = cache_path.with_suffix(".tmp")
+
+    payload = zlib.compress(
+        pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 1
+    )
+    temp_path.write_bytes(_CACHE_MAGIC + payload)
+    # Replace atomically so a crash never leaves a half-written entry
+    os.replace(temp_path, cache_path)
+
+    # Older models of the same backup in the same place can never be hit
+    #  again
+    for stale_path in _same_device_entries(cache_dir, key):
+        stale_path.unlink(missing_ok=True)
+
+    evict_cache(cache_dir, max_bytes)
+
+def evict_cache(cache_dir: Path, max_bytes: int = DEFAULT_MAX_CACHE_BYTES) -> None:
+    """Deletes least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(_CACHE_FILE_SUFFIX) and entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
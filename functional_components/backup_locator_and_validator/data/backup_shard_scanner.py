@@ -0,0 +1,83 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Lists the hashed files of a backup's shard directories, so that
+ every asset file can be checked without probing for it by path.
+"""
+
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pathlib import Path
+
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+
+# Listing directories waits on the disk, so more threads than cores help
+DEFAULT_SHARD_WORKERS = 8
+
+# A backup stores each file in the shard named by its fileID's first two
+#  hex digits
+SHARD_NAMES = tuple(f"{index:02x}" for index in range(256))
+
+
+def list_shard(
+    shard_dir: Path, wanted: FrozenSet[str] = frozenset()
+) -> Optional[Dict[str, int]]:
+    """Returns the size in bytes of every wanted file in one shard directory,
+    or None if the shard does not exist.
+
+    Entries not in wanted, such as other apps' data, are skipped by name
+    alone, so only the wanted files cost a stat call.
+    """
+    sizes = {}
+    try:
+        with os.scandir(shard_dir) as entries:
+            for entry in entries:
+                if entry.name not in wanted:
+                    continue
+                try:
+                    if entry.is_file():
+                        sizes[entry.name] = entry.stat().st_size
+                except OSError:
+                    continue  # Removed while listing
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return sizes
+
+def scan_backup_shards(
+    backup_root: Path,
+    file_ids: Iterable[str],
+    max_workers: int = DEFAULT_SHARD_WORKERS,
+) -> Tuple[Dict[str, int], int]:
+    """Lists all 256 shard directories of a backup in parallel, looking for
+    file_ids.
+
+    Returns:
+        A dict mapping each of file_ids found to its size in bytes, and
+        the number of shard directories that exist.
+    """
+    wanted_by_shard: Dict[str, Set[str]] = {name: set() for name in SHARD_NAMES}
+    for file_id in file_ids:
+        shard = wanted_by_shard.get(file_id[:2])
+        if shard is not None:
+            shard.add(file_id)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="shard-scan",
+    ) as executor:
+        listings = list(executor.map(
+            list_shard,
+            [backup_root / name for name in SHARD_NAMES],
+            [frozenset(wanted_by_shard[name]) for name in SHARD_NAMES],
+        ))
+
+    sizes = {}
+    shards_scanned = 0
+    for listing in listings:
+        if listing is not None:
+            sizes.update(listing)
+            shards_scanned += 1
+    return sizes, shards_scanned
@@ -0,0 +1,209 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the AssetColumns object, a columnar view of a
+ BackupModel's assets used to select assets without walking them in Python.
+"""
+
+from datetime import datetime
+
+from typing import Iterable, List, Optional, Set
+
+import numpy as np
+
+from functional_components.backup_locator_and_validator.domain.backup_model import (
+    APPLE_EPOCH_OFFSET,
+)
+
+
+# Integer codes for the media_type literals of Asset
+MEDIA_TYPE_CODES = {
+    "photo": 0,
+    "video": 1,
+}
+
+# Integer codes for the subtype literals of Asset
+SUBTYPE_CODES = {
+    "standard": 0,
+    "live_photo_still": 1,
+    "live_photo_video": 2,
+    "burst_frame": 3,
+    "panorama": 4,
+    "screenshot": 5,
+    "portrait": 6,
+    "slo_mo": 7,
+    "time_lapse": 8,
+}
+
+# Bit per smart folder in the smart_folders column
+SMART_FOLDER_BITS = {
+    "favorites": 1,
+    "hidden": 2,
+    "recently_deleted": 4,
+    "selfies": 8,
+}
+
+
+def _to_timestamp(iso_date: str) -> float:
+    """Converts an ISO 8601 date to Unix seconds, or NaN if there is none."""
+    try:
+        return datetime.fromisoformat(iso_date).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
+def _creation_timestamp(asset) -> float:
+    """Returns an asset's creation time in Unix seconds, or NaN if there is none.
+
+    The raw creation_time is used when the asset has one, so loaded
+    assets never have their ISO date formatted and parsed back.
+    """
+    creation_time = getattr(asset, "creation_time", None)
+    if creation_time is not None:
+        return creation_time + APPLE_EPOCH_OFFSET
+    return _to_timestamp(asset.creation_date)
+
+def _smart_folder_mask(names: Iterable[str]) -> int:
+    """Combines smart folder names into a SMART_FOLDER_BITS bitmask."""
+    mask = 0
+    for name in names:
+        mask |= SMART_FOLDER_BITS.get(name, 0)
+    return mask
+
+
+class AssetColumns:
+    """Columnar copy of a BackupModel's assets.
+
+    Each per-asset attribute used for filtering is held in a NumPy array
+    indexed like backup_model.assets. User album membership is stored in
+    CSR form: the album indexes of asset i are
+    album_members[album_offsets[i]:album_offsets[i + 1]].
+    """
+
+    def __init__(self, assets: list, albums: list):
+        self.assets = assets
+        count = len(assets)
+
+        self.media_type = np.fromiter(
+            (MEDIA_TYPE_CODES[a.media_type] for a in assets),
+            dtype=np.uint8, count=count,
+        )
+        self.subtype = np.fromiter(
+            (SUBTYPE_CODES[a.subtype] for a in assets),
+            dtype=np.uint8, count=count,
+        )
+        self.smart_folders = np.fromiter(
+            (_smart_folder_mask(a.relationships.smart_folders) for a in assets),
+            dtype=np.uint8, count=count,
+        )
+        self.creation_time = np.fromiter(
+            (_creation_timestamp(a) for a in assets),
+            dtype=np.float64, count=count,
+        )
+
+        # Burst group of each burst frame, -1 for every other asset
+        burst_codes = {}
+        self.burst_group = np.fromiter(
+            (
+                burst_codes.setdefault(a.burst_uuid, len(burst_codes))
+                if a.subtype == "burst_frame" and a.burst_uuid is not None
+                else -1
+                for a in assets
+            ),
+            dtype=np.int32, count=count,
+        )
+
+        # User album membership as a CSR matrix of album indexes
+        self.album_uuids: List[str] = [album.album_uuid for album in albums]
+        self.album_index = {
+            uuid: index for index, uuid in enumerate(self.album_uuids)
+        }
+        offsets = [0]
+        members = []
+        for asset in assets:
+            for album_uuid in asset.relationships.user_albums:
+                index = self.album_index.get(album_uuid)
+                if index is not None:
+                    members.append(index)
+            offsets.append(len(members))
+        self.album_offsets = np.asarray(offsets, dtype=np.int64)
+        self.album_members = np.asarray(members, dtype=np.int32)
+
+        # Asset row of every membership entry, for album -> asset lookups
+        self._member_rows = np.repeat(
+            np.arange(count, dtype=np.int64), np.diff(self.album_offsets)
+        )
+
+    @classmethod
+    def from_model(cls, backup_model) -> "AssetColumns":
+        """Builds the columns for every asset and album of a BackupModel."""
+        return cls(backup_model.assets, backup_model.albums)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def present_smart_folders(self) -> Set[str]:
+        """Returns the names of the smart folders at least one asset is in."""
+        present = int(np.bitwise_or.reduce(self.smart_folders)) if len(self) else 0
+        return {name for name, bit in SMART_FOLDER_BITS.items() if present & bit}
+
+    def select(
+        self,
+        album_uuids: Optional[Iterable[str]] = None,
+        smart_folders: Optional[Iterable[str]] = None,
+        media_types: Optional[Iterable[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Returns the indexes of the assets matching every given criterion.
+
+        Within album_uuids, smart_folders and media_types an asset only has
+        to match one entry. Criteria left as None are not applied. The
+        date range is inclusive and drops assets without a creation date.
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if album_uuids is not None or smart_folders is not None:
+            # Albums and smart folders are both collections, so an asset
+            #  in any one of the requested collections is selected.
+            in_collection = np.zeros(len(self), dtype=bool)
+            if album_uuids is not None:
+                wanted = [
+                    self.album_index[uuid] for uuid in album_uuids
+                    if uuid in self.album_index
+                ]
+                hits = np.isin(self.album_members, wanted)
+                in_collection[self._member_rows[hits]] = True
+            if smart_folders is not None:
+                bits = _smart_folder_mask(smart_folders)
+                in_collection |= (self.smart_folders & bits) != 0
+            mask &= in_collection
+
+        if media_types is not None:
+            codes = [MEDIA_TYPE_CODES[name] for name in media_types]
+            mask &= np.isin(self.media_type, codes)
+
+        if created_after is not None:
+            mask &= self.creation_time >= created_after.timestamp()
+        if created_before is not None:
+            mask &= self.creation_time <= created_before.timestamp()
+
+        return np.flatnonzero(mask)
+
+    def with_bursts(self, indexes: np.ndarray) -> np.ndarray:
+        """Adds the other frames of every burst touched by indexes.
+
+        Bursts are exported as a whole, so a selection has to hold either
+        all of a burst's frames or none of them.
+        """
+        groups = self.burst_group[indexes]
+        groups = np.unique(groups[groups >= 0])
+        if groups.size == 0:
+            return indexes
+        mask = np.zeros(len(self), dtype=bool)
+        mask[indexes] = True
+        mask |= np.isin(self.burst_group, groups)
+        return np.flatnonzero(mask)
+
+    def assets_at(self, indexes: Iterable[int]) -> list:
+        """Returns the asset objects at the given indexes, in order."""
+        return [self.assets[index] for index in indexes]
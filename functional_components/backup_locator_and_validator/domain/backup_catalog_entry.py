@@ -0,0 +1,34 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the BackupCatalogEntry object, the summary of one
+ backup kept in the backup catalog.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BackupCatalogEntry(BaseModel):
+    """What the catalog knows about one backup without fully loading it."""
+    backup_path: str
+
+    # Size and mtime of the backup's plists and Manifest.db, used to tell
+    #  whether the backup has changed since it was scanned
+    fingerprint: str
+    scanned_at: str
+
+    backup_uuid: Optional[str] = None
+    device_name: Optional[str] = None
+    device_model: Optional[str] = None
+    ios_version: Optional[str] = None
+    backup_date: Optional[str] = None
+    is_encrypted: Optional[bool] = None
+
+    # Row counts of Photos.sqlite; unknown for encrypted backups
+    asset_count: Optional[int] = None
+    album_count: Optional[int] = None
+
+    # Why the scan could not read the backup, if it could not
+    error: Optional[str] = None
@@ -0,0 +1,31 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the BackupFileReport object, the result of checking
+ a BackupModel's assets against the files in the backup.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class BackupFileReport(BaseModel):
+    """Which asset files exist in the backup, and how large they are."""
+    # Assets checked, and how many of them have their file in the backup
+    checked_assets: int = 0
+    present_assets: int = 0
+
+    # UUIDs of the assets whose hashed file is not in the backup
+    missing_asset_uuids: List[str] = Field(default_factory=list)
+
+    # Combined size in bytes of every present asset file
+    total_bytes: int = 0
+
+    # Shard directories (backup_root/00 to backup_root/ff) that were listed
+    shards_scanned: int = 0
+
+    @property
+    def missing_assets(self) -> int:
+        """The number of assets whose file is not in the backup."""
+        return len(self.missing_asset_uuids)
@@ -0,0 +1,87 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the BackupLoadProgress object, which tracks a
+ backup load whose assets are still being built in the background.
+"""
+
+import threading
+
+from typing import Callable, List, Optional
+
+from functional_components.backup_locator_and_validator.domain.backup_model \
+    import BackupModel
+
+from functional_components.backup_locator_and_validator.domain. \
+    backup_model_result import BackupModelResult
+
+
+class BackupLoadProgress:
+    """Shared state of a progressive backup load.
+
+    The device metadata and albums are published first, as a BackupModel
+    with no assets yet, so a UI can show them while the assets are built.
+    Once the load ends, result holds the final BackupModelResult and
+    backup_model is replaced by the complete model.
+    """
+
+    def __init__(self):
+        self.backup_model: Optional[BackupModel] = None
+        self.total_assets = 0
+        self.loaded_assets = 0
+        self.result: Optional[BackupModelResult] = None
+
+        self._lock = threading.Lock()
+        self._partial = threading.Event()
+        self._done = threading.Event()
+        self._done_callbacks: List[Callable[["BackupLoadProgress"], None]] = []
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the load has ended, successfully or not."""
+        return self._done.is_set()
+
+    def publish_partial(self, backup_model: BackupModel, total_assets: int) -> None:
+        """Makes the metadata and albums available before the assets."""
+        self.backup_model = backup_model
+        self.total_assets = total_assets
+        self._partial.set()
+
+    def advance(self, count: int) -> None:
+        """Records that count more asset rows have been read."""
+        self.loaded_assets += count
+
+    def finish(self, result: BackupModelResult) -> None:
+        """Ends the load with its final result and runs the done callbacks."""
+        with self._lock:
+            self.result = result
+            if result.success:
+                self.backup_model = result.backup_model
+                self.total_assets = len(result.backup_model.assets)
+                self.loaded_assets = self.total_assets
+            self._partial.set()
+            self._done.set()
+            callbacks, self._done_callbacks = self._done_callbacks, []
+
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback: Callable[["BackupLoadProgress"], None]) -> None:
+        """Calls callback(self) once the load ends, or now if it already has."""
+        with self._lock:
+            if not self._done.is_set():
+                self._done_callbacks.append(callback)
+                return
+        callback(self)
+
+    def wait_for_partial(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the metadata and albums, or the final result, are in."""
+        return self._partial.wait(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[BackupModelResult]:
+        """Blocks until the load ends and returns its result.
+
+        Returns None if timeout runs out first.
+        """
+        self._done.wait(timeout)
+        return self.result
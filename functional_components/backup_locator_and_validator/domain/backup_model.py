@@ -4,10 +4,29 @@ Date: 2026-02-13
 Description: Definition for the BackupModel object.
 """
 
+import os
+from datetime import datetime, timezone
 from typing import List, Optional, Literal
 from pydantic import BaseModel
 
 
+# Seconds between Unix epoch (1970-01-01) and Apple epoch (2001-01-01)
+APPLE_EPOCH_OFFSET = 978307200
+
+
+def format_apple_time(apple_time: Optional[float]) -> str:
+    """Converts Apple epoch timestamp to ISO 8601 string."""
+    if apple_time is None:
+        return ""
+    unix_time = apple_time + APPLE_EPOCH_OFFSET
+    return datetime.fromtimestamp(unix_time, tz=timezone.utc).isoformat()
+
+
+def backup_file_path(backup_root: str, file_id: str) -> str:
+    """Returns the path of a hashed file inside its backup's shard directory."""
+    return os.path.join(backup_root, file_id[:2], file_id)
+
+
 class SourceDevice(BaseModel):
     """Keeps the device information in the BackupModel."""
     name: str
@@ -53,9 +72,17 @@ class Asset(BaseModel):
     modification_date: str
     timezone_offset: str
 
+    # Raw Apple epoch seconds of the dates, when read from Photos.sqlite
+    creation_time: Optional[float] = None
+    modification_time: Optional[float] = None
+
     backup_relative_path: str
     backup_hashed_filename: str
 
+    # Size in bytes of the file in the backup; None until the backup's
+    #  files are prevalidated, or if the file is missing
+    file_size: Optional[int] = None
+
     media_type: Literal["photo", "video"]
     subtype: Literal[
         "standard",
@@ -77,6 +104,153 @@ class Asset(BaseModel):
     relationships: Relationships
 
 
+_ASSET_FIELDS = tuple(Asset.model_fields)
+
+# Asset fields an AssetRecord derives from other attributes when read
+_DERIVED_FIELDS = ("creation_date", "modification_date", "backup_relative_path")
+
+
+class AssetRecord:
+    """Compact stand-in for Asset used when loading a backup.
+
+    Holds the same attributes as Asset in __slots__ and is built without
+    pydantic validation, since the loader derives every field itself.
+    This keeps load time and memory down on libraries of 100k+ assets.
+    Call to_asset() wherever a validated Asset is required.
+
+    The loader only stores creation_time and modification_time; the ISO
+    creation_date and modification_date are formatted when first read.
+    Likewise it passes the backup_root string shared by all of a backup's
+    records instead of each record's full path, and backup_relative_path
+    is joined from it and backup_hashed_filename when read.
+    """
+
+    __slots__ = tuple(
+        name for name in _ASSET_FIELDS if name not in _DERIVED_FIELDS
+    ) + (
+        "_creation_date",
+        "_modification_date",
+        "_backup_relative_path",
+        "_backup_root",
+    )
+
+    def __init__(
+        self,
+        *,
+        asset_uuid: str,
+        local_identifier: str,
+        original_filename: str,
+        file_extension: str,
+        uti_type: str,
+        timezone_offset: str,
+        backup_hashed_filename: str,
+        media_type: str,
+        subtype: str,
+        flags: Flags,
+        relationships: Relationships,
+        live_photo_group_uuid: Optional[str] = None,
+        burst_uuid: Optional[str] = None,
+        is_primary_burst_frame: bool = False,
+        creation_date: Optional[str] = None,
+        modification_date: Optional[str] = None,
+        creation_time: Optional[float] = None,
+        modification_time: Optional[float] = None,
+        file_size: Optional[int] = None,
+        backup_relative_path: Optional[str] = None,
+        backup_root: Optional[str] = None,
+    ):
+        self.asset_uuid = asset_uuid
+        self.local_identifier = local_identifier
+        self.original_filename = original_filename
+        self.file_extension = file_extension
+        self.uti_type = uti_type
+        self._creation_date = creation_date
+        self._modification_date = modification_date
+        self.creation_time = creation_time
+        self.modification_time = modification_time
+        self.timezone_offset = timezone_offset
+        self._backup_relative_path = backup_relative_path
+        self._backup_root = backup_root
+        self.backup_hashed_filename = backup_hashed_filename
+        self.file_size = file_size
+        self.media_type = media_type
+        self.subtype = subtype
+        self.live_photo_group_uuid = live_photo_group_uuid
+        self.burst_uuid = burst_uuid
+        self.is_primary_burst_frame = is_primary_burst_frame
+        self.flags = flags
+        self.relationships = relationships
+
+    @property
+    def creation_date(self) -> str:
+        """The ISO 8601 creation date, formatted from creation_time."""
+        if self._creation_date is None:
+            self._creation_date = format_apple_time(self.creation_time)
+        return self._creation_date
+
+    @property
+    def modification_date(self) -> str:
+        """The ISO 8601 modification date, formatted from modification_time."""
+        if self._modification_date is None:
+            self._modification_date = format_apple_time(self.modification_time)
+        return self._modification_date
+
+    @property
+    def backup_relative_path(self) -> str:
+        """The backup file's path, unless one was given explicitly."""
+        if self._backup_relative_path is not None:
+            return self._backup_relative_path
+        return backup_file_path(self._backup_root, self.backup_hashed_filename)
+
+    def _fields(self) -> dict:
+        """Returns the record's attributes as a dict keyed by field name."""
+        return {name: getattr(self, name) for name in _ASSET_FIELDS}
+
+    def to_asset(self) -> Asset:
+        """Returns a validated Asset with the same data."""
+        return Asset(**self._fields())
+
+    def model_copy(self, update: Optional[dict] = None) -> "AssetRecord":
+        """Returns a copy with the given fields replaced, like Asset.model_copy."""
+        fields = self._fields()
+        # A derived path stays derived unless a new one is given
+        if self._backup_relative_path is None and (
+            not update or "backup_relative_path" not in update
+        ):
+            fields["backup_relative_path"] = None
+            fields["backup_root"] = self._backup_root
+        if update:
+            # Changed times are formatted again unless a date is given too
+            for time_name, date_name in (
+                ("creation_time", "creation_date"),
+                ("modification_time", "modification_date"),
+            ):
+                if time_name in update and date_name not in update:
+                    fields[date_name] = None
+            fields.update(update)
+        return AssetRecord(**fields)
+
+    def __eq__(self, other):
+        if isinstance(other, (AssetRecord, Asset)):
+            return all(
+                getattr(self, name) == getattr(other, name)
+                for name in _ASSET_FIELDS
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"AssetRecord({self.asset_uuid!r}, {self.original_filename!r})"
+
+
+def as_asset(asset) -> Asset:
+    """Returns asset as a validated Asset, converting an AssetRecord."""
+    if isinstance(asset, AssetRecord):
+        return asset.to_asset()
+    return asset
+
+
 class Album(BaseModel):
     """Tracks an album's data and metadata."""
     album_uuid: str
@@ -87,7 +261,11 @@ class Album(BaseModel):
 
 
 class BackupModel(BaseModel):
-    """Representation of the entire backup's Photos app contents."""
+    """Representation of the entire backup's Photos app contents.
+
+    Models produced by the backup loader are built with model_construct
+    and hold AssetRecords, which expose the same attributes as Asset.
+    """
     backup_metadata: BackupMetadata
     assets: List[Asset]
     albums: List[Album]
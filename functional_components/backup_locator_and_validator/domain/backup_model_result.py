@@ -11,6 +11,12 @@ from pydantic import BaseModel
 from functional_components.backup_locator_and_validator.domain.backup_model \
     import BackupModel
 
+from functional_components.backup_locator_and_validator.domain.load_stats \
+    import LoadStats
+
+from functional_components.backup_locator_and_validator.domain. \
+    backup_file_report import BackupFileReport
+
 
 class BackupModelResult(BaseModel):
     """Represents the BackupModel and whether it was created or not."""
@@ -18,3 +24,9 @@ class BackupModelResult(BaseModel):
     backup_model: Optional[BackupModel] = None
     error: Optional[str] = None
     icloud_warning: Optional[str] = None
+
+    # How long each phase of the load took and how many rows it read
+    load_stats: Optional[LoadStats] = None
+
+    # Which asset files are in the backup, checked on every load
+    file_report: Optional[BackupFileReport] = None
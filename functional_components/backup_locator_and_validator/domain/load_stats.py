@@ -0,0 +1,63 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the LoadStats object, the per-phase timings and
+ row counts of one backup load.
+"""
+
+import time
+
+from contextlib import contextmanager
+
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+# Phases of build_backup_model, in the order they are reported. Several of
+#  them run at the same time, so their times overlap and add up to more
+#  than "total".
+PHASE_ORDER = (
+    "cache_lookup",
+    "device_info",
+    "manifest_plist",
+    "locate_photos_sqlite",
+    "manifest_index",
+    "schema_inspection",
+    "albums",
+    "memberships",
+    "asset_scan",
+    "build_assets_first_pass",
+    "build_assets_second_pass",
+    "file_prevalidation",
+    "total",
+)
+
+
+class LoadStats(BaseModel):
+    """Wall time and row counts of each phase of a backup load.
+
+    Each phase and counter is only written from the thread running that
+    phase, so no locking is needed.
+    """
+    # Seconds spent in each phase, keyed by a PHASE_ORDER name
+    phase_seconds: Dict[str, float] = Field(default_factory=dict)
+
+    # Rows read and lookup outcomes, e.g. "asset_rows" or "fallback_hits"
+    counters: Dict[str, int] = Field(default_factory=dict)
+
+    # Whether the model came from the on-disk cache instead of being built
+    from_cache: bool = False
+
+    @contextmanager
+    def time_phase(self, phase: str):
+        """Records the wall time of the with-block as phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[phase] = time.perf_counter() - start
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Adds amount to counter."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
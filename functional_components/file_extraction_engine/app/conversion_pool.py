@@ -0,0 +1,132 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Runs the conversions of an extraction on a pool of worker
+ processes, ahead of the copies that use them.
+"""
+
+import multiprocessing
+
+import os
+
+import sys
+
+from collections import deque
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from pathlib import Path
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .extraction_helpers import maybe_convert
+
+
+# Decoding and encoding media is CPU bound, so one process per core
+DEFAULT_CONVERSION_WORKERS = os.cpu_count() or 1
+
+# Jobs converted ahead of the one being copied, per worker
+_JOBS_AHEAD_PER_WORKER = 2
+
+
+class ConversionPool:
+    """Converts the assets of export jobs in worker processes.
+
+    Jobs are (payload, assets) pairs. resolve_in_order converts the assets
+    of up to max_workers * 2 jobs ahead of the one it yields, and yields
+    every job with its resolved assets in the order the jobs were given,
+    so the caller can name and copy the results while later jobs are still
+    converting. Assets without a conversion rule never leave the calling
+    process. With one worker or fewer, conversions run inline.
+
+    Every converted file is written to its own folder under temp_dir, so
+    assets with the same filename never overwrite each other's output.
+
+    Workers are spawned rather than forked, because forking a process that
+    already runs copy threads can hand a worker a lock held by a thread
+    that does not exist in it. The executor is created on entering the
+    pool, before the caller starts any threads of its own.
+    """
+
+    def __init__(
+        self,
+        convert_type_dict: Dict[str, str],
+        temp_dir: Path,
+        max_workers: int = DEFAULT_CONVERSION_WORKERS,
+    ):
+        self._convert_type_dict = convert_type_dict
+        self._temp_dir = temp_dir
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ConversionPool":
+        self._get_executor()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    def needs_conversion(self, asset) -> bool:
+        """Returns whether the asset has a conversion rule."""
+        return asset.file_extension.upper() in self._convert_type_dict
+
+    def resolve_in_order(
+        self, jobs: Iterable[Tuple[object, List]]
+    ) -> Iterator[Tuple[object, List]]:
+        """Yields (payload, resolved_assets) for every job, in job order."""
+        pending = deque()
+        max_pending = max(self._max_workers, 1) * _JOBS_AHEAD_PER_WORKER
+        for payload, assets in jobs:
+            pending.append((payload, assets, [self._submit(a) for a in assets]))
+            if len(pending) >= max_pending:
+                yield self._resolve(*pending.popleft())
+        while pending:
+            yield self._resolve(*pending.popleft())
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, asset):
+        """Starts converting an asset, or returns it if it needs no conversion."""
+        if not self.needs_conversion(asset):
+            return asset
+        temp_dir = self._temp_dir / asset.asset_uuid
+        executor = self._get_executor()
+        if executor is None:
+            return maybe_convert(asset, self._convert_type_dict, temp_dir)
+        return executor.submit(
+            maybe_convert, asset, self._convert_type_dict, temp_dir
+        )
+
+    def _resolve(self, payload, assets, results) -> Tuple[object, List]:
+        """Waits for a job's conversions."""
+        resolved = []
+        for asset, result in zip(assets, results):
+            if isinstance(result, Future):
+                try:
+                    result = result.result()
+                except Exception as e:
+                    # A worker that died takes its conversion with it; the
+                    #  original is exported instead, as for any failure
+                    print(
+                        f"Conversion failed for {asset.original_filename}: {e}",
+                        file=sys.stderr,
+                    )
+                    result = asset
+            resolved.append(result)
+        return payload, resolved
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Starts the worker processes if they are not running yet."""
+        if self._executor is None and self._max_workers > 1:
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError):
+                self._max_workers = 1  # No process support; convert inline
+        return self._executor
@@ -6,30 +6,37 @@ Description: Main extraction entry point for the file‑extraction engine.
 
 import shutil
 
+import threading
+
 from pathlib import Path
 
-from typing import Dict
+from typing import Dict, List, Set, Tuple
 
-from functional_components.file_extraction_engine.data.collection_management import (
-    deduplicate_assets,
-    separate_burst_frames,
-    build_album_uuid_to_title_map
+from functional_components.file_extraction_engine.data.copy_pool import (
+    DEFAULT_COPY_WORKERS,
+    CopyPool,
 )
 
 from functional_components.file_extraction_engine.data.file_management import (
     ensure_folder_exists,
-    copy_file,
-    move_folder,
-    copy_folder,
-    place_symlink,
-    place_folder_symlink,
-    sanitize_folder_name
+    copy_to_path,
+    create_symlink
+)
+
+from functional_components.file_extraction_engine.data.name_allocator import (
+    NameAllocator,
 )
 
-from .extraction_helpers import (
-    get_active_collections, get_dest_name, maybe_convert
+from functional_components.file_extraction_engine.domain.extraction_plan import (
+    ExtractionPlan,
 )
 
+from .conversion_pool import DEFAULT_CONVERSION_WORKERS, ConversionPool
+
+from .extraction_helpers import get_dest_name
+
+from .extraction_planner import build_extraction_plan
+
 
 def _cleanup_temp(resolved_asset, original_asset):
     """Delete the temp file immediately after it has been copied to its destination."""
@@ -38,218 +45,161 @@ def _cleanup_temp(resolved_asset, original_asset):
         if temp_file.exists():
             temp_file.unlink(missing_ok=True)
 
-def run_extraction_engine(
-    backup_model,
-    blacklist,
-    output_root: Path,
-    os_supports_symlinks: bool,
-    user_set_symlinks: bool,
-    convert_type_dict: Dict[str, str],
+def _copy_asset(
+    src_path: Path, dest_paths: List[Path], asset, resolved_asset, on_done, size
+):
+    """Copy one asset to each of its planned destinations, then delete its
+    conversion temp file. Runs on a copy worker.
+    """
+    for dest_path in dest_paths:
+        copy_to_path(src_path, dest_path, asset)
+    _cleanup_temp(resolved_asset, asset)
+    on_done(size)
+
+def _copy_burst(
+    resolved_frames: List[Tuple[object, object]],
+    staging_folder: Path,
+    dest_folders: List[Path],
+    on_done,
+    size,
+):
+    """Copy a burst's frames into its staging folder, then move the folder
+    to the first planned destination and copy it to the rest. Runs on a
+    copy worker.
+    """
+    frame_names = NameAllocator()
+    for frame, resolved in resolved_frames:
+        copy_to_path(
+            Path(resolved.backup_relative_path),
+            frame_names.allocate_path(staging_folder, get_dest_name(frame, resolved)),
+            frame,
+        )
+        _cleanup_temp(resolved, frame)
+
+    shutil.move(staging_folder, dest_folders[0])
+    for dest_folder in dest_folders[1:]:
+        shutil.copytree(dest_folders[0], dest_folder)
+    on_done(size)
+
+def execute_extraction_plan(
+    plan: ExtractionPlan,
     progress,
-    include_unassigned: bool = True,
+    copy_workers: int = DEFAULT_COPY_WORKERS,
+    conversion_workers: int = DEFAULT_CONVERSION_WORKERS,
 ) -> None:
-    """Perform the full extraction process."""
-
-    use_symlinks = os_supports_symlinks and user_set_symlinks
+    """Carry out an ExtractionPlan.
+
+    Conversions run on conversion_workers processes ahead of the file
+    being placed, and copies run on copy_workers threads behind it.
+    progress.percent follows the bytes copied when the plan knows its
+    sizes, and the files copied otherwise. Each asset is reported to
+    progress.add_log, if the progress object has one, as its conversion
+    or copy is started.
+
+    A file whose conversion fails is copied unconverted, under its planned
+    name with the original extension, and links to it follow the rename.
+    """
+    output_root = plan.output_root
+    convert_type_dict = plan.convert_type_dict
     conversion_temp_dir = output_root / "iExtract_conversion_temp"
+    staging_root = output_root / "staging"
 
-    non_excl_assets: Dict[str, Path] = {}
-
-    # --- UUID-to-title lookup for user albums ---
-    album_title_by_uuid = build_album_uuid_to_title_map(backup_model.albums)
+    # Planned paths are taken, so renamed fallbacks never take one
+    names = NameAllocator()
+    names.reserve(plan.dest_paths)
 
-    # --- Deduplicate and partition assets ---
-    unique_assets = deduplicate_assets(backup_model.assets)
-    burst_groups, asset_list = separate_burst_frames(unique_assets)
+    # Planned path -> actual path of files copied under another name
+    renamed: Dict[Path, Path] = {}
 
     # --- Progress tracking setup ---
-    total_units = len(asset_list) + len(burst_groups)
+    total_bytes = plan.total_bytes
+    total_units = len(plan.files) + len(plan.bursts)
+    bytes_done = 0
     units_done = 0
-
-    def tick():
-        nonlocal units_done
-        if total_units == 0:
+    progress_lock = threading.Lock()
+
+    def advance(size: int):
+        nonlocal bytes_done, units_done
+        with progress_lock:
+            bytes_done += size
+            units_done += 1
+            if total_bytes:
+                progress.percent = int((bytes_done / total_bytes) * 100)
+            elif total_units:
+                progress.percent = int((units_done / total_units) * 100)
+
+    add_log = getattr(progress, "add_log", None)
+
+    def log_export(asset):
+        if add_log is None:
             return
-        units_done += 1
-        progress.percent = int((units_done / total_units) * 100)
-
-    # ------------------------------------------------------------------
-    # Regular asset loop
-    # ------------------------------------------------------------------
-    for asset in asset_list:
-        active_collections = get_active_collections(
-            asset, blacklist, album_title_by_uuid
-        )
-        collection_count = len(active_collections)
-
-        # Determine if the asset has any collections before blacklist filtering
-        has_any_collections = (
-            len(asset.relationships.user_albums) > 0
-            or len(asset.relationships.smart_folders) > 0
-        )
-
-        # If the asset had collections but all were blacklisted, skip it
-        #  entirely
-        if has_any_collections and collection_count == 0:
-            tick()
-            continue
-
-        # already extracted earlier when using symlinks
-        if use_symlinks and asset.asset_uuid in non_excl_assets:
-            src_path = non_excl_assets[asset.asset_uuid]
-            for collection in active_collections:
-                dest_folder = ensure_folder_exists(output_root / sanitize_folder_name(collection.title))
-                place_symlink(src_path, dest_folder)
-            tick()
-            continue
-
-        # convert/copy source file
-        resolved_asset = maybe_convert(asset, convert_type_dict, conversion_temp_dir)
-        src_path = Path(resolved_asset.backup_relative_path)
-        dest_name = get_dest_name(asset, resolved_asset)
-
-        if collection_count == 0 or collection_count > 1:
-            # To prevent non-exclusive assets from being included in the
-            #  extraction if undesired
-            if collection_count == 0 and not include_unassigned:
-                tick()
-                continue
-            if use_symlinks:
-                dest_folder = ensure_folder_exists(
-                    output_root / "non_exclusive_assets"
-                )
-                dest_path = copy_file(src_path, dest_folder, dest_name, asset)
-                _cleanup_temp(resolved_asset, asset)
-                non_excl_assets[asset.asset_uuid] = dest_path
-
-                for collection in active_collections:
-                    coll_folder = ensure_folder_exists(
-                        output_root / sanitize_folder_name(collection.title)
-                    )
-                    place_symlink(dest_path, coll_folder)
-            else:
-                if collection_count == 0:
-                    dest_folder = ensure_folder_exists(
-                        output_root / "non_exclusive_assets"
+        ext = asset.file_extension.upper()
+        if ext in convert_type_dict:
+            add_log(f"Converting: {asset.original_filename} → {convert_type_dict[ext]}")
+        else:
+            add_log(f"Exporting: {asset.original_filename}")
+
+    def file_jobs():
+        for planned in plan.files:
+            log_export(planned.asset)
+            yield planned, [planned.asset]
+
+    def burst_jobs():
+        for planned in plan.bursts:
+            for frame in planned.frames:
+                log_export(frame)
+            yield planned, planned.frames
+
+    # Every destination folder is made here, once, so placing a file or
+    #  link never needs a mkdir call
+    known_dirs: Set[Path] = set()
+    for folder in plan.folders:
+        ensure_folder_exists(folder, known_dirs)
+
+    conversion_pool = ConversionPool(
+        convert_type_dict, conversion_temp_dir, conversion_workers
+    )
+    with conversion_pool, CopyPool(copy_workers) as copy_pool:
+        for planned, (resolved_asset,) in conversion_pool.resolve_in_order(file_jobs()):
+            asset = planned.asset
+            dest_paths = planned.dest_paths
+
+            # A failed conversion keeps the original extension
+            suffix = Path(get_dest_name(asset, resolved_asset)).suffix
+            if dest_paths[0].suffix != suffix:
+                for dest_path in dest_paths:
+                    renamed[dest_path] = names.allocate_path(
+                        dest_path.parent, dest_path.with_suffix(suffix).name
                     )
-                    copy_file(src_path, dest_folder, dest_name, asset)
-                    _cleanup_temp(resolved_asset, asset)
-                else:
-                    for collection in active_collections:
-                        dest_folder = ensure_folder_exists(
-                            output_root / sanitize_folder_name(collection.title)
-                        )
-                        copy_file(src_path, dest_folder, dest_name, asset)
-                    _cleanup_temp(resolved_asset, asset)
-        else:  # exactly one collection
-            dest_folder = ensure_folder_exists(
-                output_root / sanitize_folder_name(active_collections[0].title)
+                dest_paths = [renamed[p] for p in dest_paths]
+
+            copy_pool.submit(
+                _copy_asset,
+                Path(resolved_asset.backup_relative_path),
+                dest_paths,
+                asset,
+                resolved_asset,
+                advance,
+                planned.size,
             )
-            copy_file(src_path, dest_folder, dest_name, asset)
-            _cleanup_temp(resolved_asset, asset)
-
-        tick()
-
-    # ------------------------------------------------------------------
-    # Burst group loop
-    # ------------------------------------------------------------------
-    staging_root = output_root / "staging"
-
-    for burst_uuid, frames in burst_groups.items():
-        # choose representative frame for collection membership
-        key_frame = next(
-            (f for f in frames if f.is_primary_burst_frame), frames[0]
-        )
-        active_collections = get_active_collections(
-            key_frame, blacklist, album_title_by_uuid
-        )
-        collection_count = len(active_collections)
-
-        # DEBUG FIGURE OUT WHY BURSTS ARE GOING INTO STAGING PERMANENTLY
-        # print(
-        #     f"BURST {burst_uuid[:8]}: collection_count={collection_count} "
-        #     f"key_frame_albums={key_frame.relationships.user_albums} "
-        #     f"is_primary={key_frame.is_primary_burst_frame}"
-        # )
-
-        # Determine if the burst has any collections before blacklist filtering
-        has_any_collections = any(
-            len(f.relationships.user_albums) > 0
-            or len(f.relationships.smart_folders) > 0
-            for f in frames
-        )
 
-        # If the asset had collections but all were blacklisted, skip it
-        #  entirely
-        if has_any_collections and collection_count == 0:
-            tick()
-            continue
-
-        # build staging folder and populate with converted frames
-        staging_folder = ensure_folder_exists(staging_root / burst_uuid)
-        for frame in frames:
-            resolved = maybe_convert(frame, convert_type_dict, conversion_temp_dir)
-            dest_name = get_dest_name(frame, resolved)
-            copy_file(
-                Path(resolved.backup_relative_path),
-                staging_folder,
-                dest_name,
-                frame,
+        for planned, resolved in conversion_pool.resolve_in_order(burst_jobs()):
+            copy_pool.submit(
+                _copy_burst,
+                list(zip(planned.frames, resolved)),
+                planned.staging_folder,
+                planned.dest_folders,
+                advance,
+                planned.size,
             )
-            _cleanup_temp(resolved, frame)
-
-        # symlink shortcut when already extracted
-        if use_symlinks and burst_uuid in non_excl_assets:
-            shutil.rmtree(staging_folder)
-            src_folder = non_excl_assets[burst_uuid]
-            for collection in active_collections:
-                dest_folder = ensure_folder_exists(output_root / sanitize_folder_name(collection.title))
-                place_folder_symlink(src_folder, dest_folder)
-            tick()
-            continue
-
-        if collection_count == 0 or collection_count > 1:
-            # To prevent non-exclusive assets from being included in the
-            #  extraction if undesired
-            if collection_count == 0 and not include_unassigned:
-                shutil.rmtree(staging_folder)
-                tick()
-                continue
-            if use_symlinks:
-                dest_parent = ensure_folder_exists(
-                    output_root / "non_exclusive_assets"
-                )
-                dest_folder = move_folder(staging_folder, dest_parent)
-                non_excl_assets[burst_uuid] = dest_folder
-
-                for collection in active_collections:
-                    coll_folder = ensure_folder_exists(
-                        output_root / sanitize_folder_name(collection.title)
-                    )
-                    place_folder_symlink(dest_folder, coll_folder)
-            else:
-                if collection_count == 0:
-                    dest_parent = ensure_folder_exists(
-                        output_root / "non_exclusive_assets"
-                    )
-                    move_folder(staging_folder, dest_parent)
-                else:
-                    first_dest = ensure_folder_exists(
-                        output_root / sanitize_folder_name(active_collections[0].title)
-                    )
-                    moved_path = move_folder(staging_folder, first_dest)
-                    for collection in active_collections[1:]:
-                        dest_parent = ensure_folder_exists(
-                            output_root / sanitize_folder_name(collection.title)
-                        )
-                        copy_folder(moved_path, dest_parent)
-        else:  # exactly one collection
-            dest_parent = ensure_folder_exists(
-                output_root / sanitize_folder_name(active_collections[0].title)
-            )
-            move_folder(staging_folder, dest_parent)
 
-        tick()
+    # Links go last, once everything they point at is in place
+    for link in plan.links:
+        target = renamed.get(link.target, link.target)
+        link_path = link.link_path
+        if target is not link.target:
+            link_path = names.allocate_path(link_path.parent, target.name)
+        create_symlink(target, link_path)
 
     # clean up empty staging root
     if staging_root.exists() and not any(staging_root.iterdir()):
@@ -260,3 +210,34 @@ def run_extraction_engine(
         shutil.rmtree(conversion_temp_dir, ignore_errors=True)
 
     progress.percent = 100
+
+def run_extraction_engine(
+    backup_model,
+    blacklist,
+    output_root: Path,
+    os_supports_symlinks: bool,
+    user_set_symlinks: bool,
+    convert_type_dict: Dict[str, str],
+    progress,
+    include_unassigned: bool = True,
+    copy_workers: int = DEFAULT_COPY_WORKERS,
+    conversion_workers: int = DEFAULT_CONVERSION_WORKERS,
+    dry_run: bool = False,
+) -> ExtractionPlan:
+    """Perform the full extraction process.
+
+    The export is planned with build_extraction_plan and then carried out
+    with execute_extraction_plan. With dry_run, the plan is returned
+    without anything being written.
+    """
+    plan = build_extraction_plan(
+        backup_model,
+        blacklist,
+        output_root,
+        use_symlinks=os_supports_symlinks and user_set_symlinks,
+        convert_type_dict=convert_type_dict,
+        include_unassigned=include_unassigned,
+    )
+    if not dry_run:
+        execute_extraction_plan(plan, progress, copy_workers, conversion_workers)
+    return plan
@@ -8,6 +8,10 @@ import sys
 from pathlib import Path
 from typing import Dict, List
 
+from functional_components.backup_locator_and_validator.domain.backup_model import (
+    as_asset,
+)
+
 from functional_components.conversion_engine.app.convert_file import convert_asset
 
 from functional_components.conversion_engine.domain.asset_to_convert import (
@@ -27,8 +31,28 @@ from functional_components.file_extraction_engine.data.file_management import (
 # Collection / naming helpers
 # ---------------------------------------------------------------------------
 
-def get_active_collections(asset, blacklist, album_title_by_uuid) -> List[CollectionRef]:
-    """Return a list of collections this asset belongs to honoring the configured blacklist/whitelist."""
+def get_active_collections(
+    asset, blacklist, album_title_by_uuid, collections_cache=None
+) -> List[CollectionRef]:
+    """Return a list of collections this asset belongs to honoring the configured blacklist/whitelist.
+
+    The result depends only on the asset's albums and smart folders, which
+    many assets share. When a collections_cache dict is given, each
+    combination is resolved once and the same list is returned for every
+    asset with it, so callers must not modify the list.
+    """
+    if collections_cache is not None:
+        key = (
+            tuple(asset.relationships.user_albums),
+            tuple(asset.relationships.smart_folders),
+        )
+        collections = collections_cache.get(key)
+        if collections is None:
+            collections = get_active_collections(
+                asset, blacklist, album_title_by_uuid
+            )
+            collections_cache[key] = collections
+        return collections
 
     ua_names = {e.name for e in blacklist.current_list if not e.is_NUA}
     nua_names = {e.name for e in blacklist.current_list if e.is_NUA}
@@ -80,6 +104,18 @@ def get_dest_name(asset, resolved_asset) -> str:
         ext = "." + asset.file_extension.lower()
     return sanitize_filename(stem + ext)
 
+def get_planned_dest_name(asset, convert_type_dict) -> str:
+    """Return the filename get_dest_name will give the asset once any
+    conversion it has a rule for succeeds.
+    """
+    stem = Path(asset.original_filename).stem
+    target_format = convert_type_dict.get(asset.file_extension.upper())
+    if target_format is not None:
+        ext = "." + target_format.lower()
+    else:
+        ext = "." + asset.file_extension.lower()
+    return sanitize_filename(stem + ext)
+
 def maybe_convert(asset, convert_type_dict, temp_dir=None):
     """Convert the asset according to convert_type_dict if necessary."""
     if asset.file_extension.upper() not in convert_type_dict:
@@ -87,7 +123,7 @@ def maybe_convert(asset, convert_type_dict, temp_dir=None):
 
     try:
         result = convert_asset(AssetToConvert(
-            asset_to_convert=asset,
+            asset_to_convert=as_asset(asset),
             convert_type_dict=convert_type_dict
         ), temp_dir=temp_dir)
         if result.success:
@@ -0,0 +1,204 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Decides where every asset of an export goes, without touching
+ the destination, and records it as an ExtractionPlan.
+"""
+
+from pathlib import Path
+
+from typing import Dict
+
+from functional_components.file_extraction_engine.data.collection_management import (
+    deduplicate_assets,
+    separate_burst_frames,
+    build_album_uuid_to_title_map
+)
+
+from functional_components.file_extraction_engine.data.file_management import (
+    sanitize_folder_name
+)
+
+from functional_components.file_extraction_engine.data.name_allocator import (
+    NameAllocator,
+)
+
+from functional_components.file_extraction_engine.domain.extraction_plan import (
+    ExtractionPlan,
+    PlannedBurst,
+    PlannedFile,
+    PlannedLink,
+)
+
+from .extraction_helpers import get_active_collections, get_planned_dest_name
+
+
+def build_extraction_plan(
+    backup_model,
+    blacklist,
+    output_root: Path,
+    use_symlinks: bool,
+    convert_type_dict: Dict[str, str],
+    include_unassigned: bool = True,
+) -> ExtractionPlan:
+    """Plan every folder, copy and link of an export.
+
+    Names are allocated in asset order against what is already on disk and
+    what the plan has handed out so far, so running the plan never
+    overwrites a file. Converted assets are named for their target format.
+    Each destination folder is listed at most once.
+    """
+    plan = ExtractionPlan(output_root=output_root, convert_type_dict=convert_type_dict)
+
+    non_excl_assets: Dict[str, Path] = {}
+
+    # Names on disk and handed out so far, per destination folder
+    names = NameAllocator()
+
+    # Folders to create, in first-use order
+    folders: Dict[Path, None] = {}
+
+    # --- UUID-to-title lookup for user albums ---
+    album_title_by_uuid = build_album_uuid_to_title_map(backup_model.albums)
+
+    # Active collections per album and smart folder combination
+    collections_cache = {}
+
+    # --- Deduplicate and partition assets ---
+    unique_assets = deduplicate_assets(backup_model.assets)
+    burst_groups, asset_list = separate_burst_frames(unique_assets)
+
+    def collection_folder(collection) -> Path:
+        folder = output_root / sanitize_folder_name(collection.title)
+        folders[folder] = None
+        return folder
+
+    def non_exclusive_folder() -> Path:
+        folder = output_root / "non_exclusive_assets"
+        folders[folder] = None
+        return folder
+
+    def plan_link(target: Path, folder: Path, is_folder: bool = False) -> None:
+        plan.links.append(PlannedLink(
+            target=target,
+            link_path=names.allocate_path(folder, target.name),
+            is_folder=is_folder,
+        ))
+
+    # ------------------------------------------------------------------
+    # Regular assets
+    # ------------------------------------------------------------------
+    for asset in asset_list:
+        active_collections = get_active_collections(
+            asset, blacklist, album_title_by_uuid, collections_cache
+        )
+        collection_count = len(active_collections)
+
+        # Determine if the asset has any collections before blacklist filtering
+        has_any_collections = (
+            len(asset.relationships.user_albums) > 0
+            or len(asset.relationships.smart_folders) > 0
+        )
+
+        # If the asset had collections but all were blacklisted, skip it
+        #  entirely
+        if has_any_collections and collection_count == 0:
+            plan.skipped += 1
+            continue
+
+        # already extracted earlier when using symlinks
+        if use_symlinks and asset.asset_uuid in non_excl_assets:
+            for collection in active_collections:
+                plan_link(non_excl_assets[asset.asset_uuid], collection_folder(collection))
+            continue
+
+        # To prevent non-exclusive assets from being included in the
+        #  extraction if undesired
+        if collection_count == 0 and not include_unassigned:
+            plan.skipped += 1
+            continue
+
+        if collection_count == 0 or (collection_count > 1 and use_symlinks):
+            dest_folders = [non_exclusive_folder()]
+        else:
+            dest_folders = [collection_folder(c) for c in active_collections]
+
+        dest_name = get_planned_dest_name(asset, convert_type_dict)
+        dest_paths = [names.allocate_path(folder, dest_name) for folder in dest_folders]
+        plan.files.append(PlannedFile(
+            asset=asset,
+            dest_paths=dest_paths,
+            convert_to=convert_type_dict.get(asset.file_extension.upper()),
+            size=(asset.file_size or 0) * len(dest_paths),
+        ))
+
+        if use_symlinks and collection_count != 1:
+            non_excl_assets[asset.asset_uuid] = dest_paths[0]
+            for collection in active_collections:
+                plan_link(dest_paths[0], collection_folder(collection))
+
+    # ------------------------------------------------------------------
+    # Burst groups
+    # ------------------------------------------------------------------
+    staging_root = output_root / "staging"
+
+    for burst_uuid, frames in burst_groups.items():
+        # choose representative frame for collection membership
+        key_frame = next(
+            (f for f in frames if f.is_primary_burst_frame), frames[0]
+        )
+        active_collections = get_active_collections(
+            key_frame, blacklist, album_title_by_uuid, collections_cache
+        )
+        collection_count = len(active_collections)
+
+        # Determine if the burst has any collections before blacklist filtering
+        has_any_collections = any(
+            len(f.relationships.user_albums) > 0
+            or len(f.relationships.smart_folders) > 0
+            for f in frames
+        )
+
+        # If the asset had collections but all were blacklisted, skip it
+        #  entirely
+        if has_any_collections and collection_count == 0:
+            plan.skipped += 1
+            continue
+
+        # symlink shortcut when already extracted
+        if use_symlinks and burst_uuid in non_excl_assets:
+            for collection in active_collections:
+                plan_link(
+                    non_excl_assets[burst_uuid], collection_folder(collection), True
+                )
+            continue
+
+        # To prevent non-exclusive assets from being included in the
+        #  extraction if undesired
+        if collection_count == 0 and not include_unassigned:
+            plan.skipped += 1
+            continue
+
+        if collection_count == 0 or (collection_count > 1 and use_symlinks):
+            dest_parents = [non_exclusive_folder()]
+        else:
+            dest_parents = [collection_folder(c) for c in active_collections]
+
+        staging_folder = staging_root / burst_uuid
+        folders[staging_folder] = None
+        dest_folders = [names.allocate_path(parent, burst_uuid) for parent in dest_parents]
+        plan.bursts.append(PlannedBurst(
+            burst_uuid=burst_uuid,
+            frames=frames,
+            staging_folder=staging_folder,
+            dest_folders=dest_folders,
+            size=sum(f.file_size or 0 for f in frames) * len(dest_folders),
+        ))
+
+        if use_symlinks and collection_count != 1:
+            non_excl_assets[burst_uuid] = dest_folders[0]
+            for collection in active_collections:
+                plan_link(dest_folders[0], collection_folder(collection), True)
+
+    plan.folders = list(folders)
+    return plan
@@ -0,0 +1,88 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Runs the file copies of an extraction on a pool of worker threads.
+"""
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Optional
+
+
+# Copies wait on the disk, so more threads than cores help until it saturates
+DEFAULT_COPY_WORKERS = 4
+
+# Tasks queued per worker before submit blocks, bounding memory on big exports
+_QUEUED_PER_WORKER = 4
+
+
+class CopyPool:
+    """Runs copy tasks concurrently on a fixed number of threads.
+
+    The extraction engine resolves every destination path itself, in asset
+    order, before submitting a task, so workers only move bytes and the
+    output names are the same for any number of workers. With one worker
+    or fewer, tasks run inline on the calling thread.
+
+    The first exception raised by a task is raised again from the next
+    submit or from wait, and no further tasks are started.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_COPY_WORKERS):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if max_workers > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="extract-copy",
+            )
+            self._slots = threading.BoundedSemaphore(max_workers * _QUEUED_PER_WORKER)
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "CopyPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.wait()
+        else:
+            self._shutdown()
+
+    def submit(self, task, *args) -> None:
+        """Runs task(*args) on a worker, blocking while the queue is full."""
+        self._raise_error()
+        if self._executor is None:
+            task(*args)
+            return
+        self._slots.acquire()
+        self._raise_error()
+        self._executor.submit(self._run, task, args)
+
+    def wait(self) -> None:
+        """Waits for every submitted task to finish."""
+        self._shutdown()
+        self._raise_error()
+
+    def _run(self, task, args) -> None:
+        """Runs one task unless an earlier task has failed."""
+        try:
+            if self._error is None:
+                task(*args)
+        except BaseException as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+        finally:
+            self._slots.release()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            self._shutdown()
+            raise self._error
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
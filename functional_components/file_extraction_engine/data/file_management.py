@@ -10,67 +10,51 @@ import shutil
 
 from pathlib import Path
 
-from typing import Dict
+from typing import Dict, Optional, Set
 
 from datetime import datetime
 
+from functional_components.backup_locator_and_validator.domain.backup_model import (
+    APPLE_EPOCH_OFFSET,
+)
 
-def ensure_folder_exists(path: Path) -> Path:
-    """Ensure that a folder exists at the given path."""
+
+def ensure_folder_exists(path: Path, known_dirs: Optional[Set[Path]] = None) -> Path:
+    """Ensure that a folder exists at the given path.
+
+    With a known_dirs set, a folder in it is taken to exist without a
+    mkdir call, and a folder that is created is added to it along with
+    its parents.
+    """
+    if known_dirs is not None and path in known_dirs:
+        return path
     path.mkdir(parents=True, exist_ok=True)
+    if known_dirs is not None:
+        known_dirs.add(path)
+        known_dirs.update(path.parents)
     return path
 
-def resolve_free_name(dest_folder: Path, name: str) -> str:
-    """Resolve a free name in the destination folder to avoid overwriting existing files."""
-    base_name, ext = os.path.splitext(name)
-    counter = 1
-    new_name = name
-    while (dest_folder / new_name).exists():
-        new_name = f"{base_name} ({counter}){ext}"
-        counter += 1
-    return new_name
-
-def copy_file(src_path: Path, dest_folder: Path, dest_name: str, asset) -> Path:
-    """Copy a file from src_path to dest_folder with dest_name, ensuring no overwrites."""
-    dest_folder = ensure_folder_exists(dest_folder)
-    dest_name = resolve_free_name(dest_folder, dest_name)
-    dest_path = dest_folder / dest_name
+def copy_to_path(src_path: Path, dest_path: Path, asset) -> None:
+    """Copy a file to a destination path that was already resolved and set
+    its modification time from the asset.
+    """
     shutil.copy(src_path, dest_path)
-    set_file_times(dest_path, asset.modification_date)
-    return dest_path
-
-def move_folder(src_folder: Path, dest_parent: Path) -> Path:
-    """Move a folder from src_folder to dest_parent, ensuring no overwrites."""
-    dest_parent = ensure_folder_exists(dest_parent)
-    dest_folder = dest_parent / src_folder.name
-    dest_folder = dest_folder.with_name(resolve_free_name(dest_parent, src_folder.name))
-    shutil.move(src_folder, dest_folder)
-    return dest_folder
-
-def copy_folder(src_folder: Path, dest_parent: Path) -> Path:
-    """Copy a folder from src_folder to dest_parent, ensuring no overwrites."""
-    dest_parent = ensure_folder_exists(dest_parent)
-    dest_folder = dest_parent / src_folder.name
-    dest_folder = dest_folder.with_name(resolve_free_name(dest_parent, src_folder.name))
-    shutil.copytree(src_folder, dest_folder)
-    return dest_folder
-
-def place_symlink(src_path: Path, dest_folder: Path) -> None:
-    """Place a symbolic link to src_path in dest_folder"""
-    dest_folder = ensure_folder_exists(dest_folder)
-    dest_name = resolve_free_name(dest_folder, src_path.name)
-    dest_path = dest_folder / dest_name
-    os.symlink(src_path, dest_path)
-
-def place_folder_symlink(src_folder: Path, dest_folder: Path) -> None:
-    """Place a symbolic link to src_folder in dest_folder"""
-    dest_folder = ensure_folder_exists(dest_folder)
-    dest_name = resolve_free_name(dest_folder, src_folder.name)
-    dest_path = dest_folder / dest_name
-    os.symlink(src_folder, dest_path)
+    # Loaded assets carry the raw Apple epoch time, which needs no parsing
+    modification_time = getattr(asset, "modification_time", None)
+    if modification_time is not None:
+        set_file_times(dest_path, modification_time + APPLE_EPOCH_OFFSET)
+    else:
+        set_file_times(dest_path, asset.modification_date)
+
+def create_symlink(target: Path, link_path: Path) -> None:
+    """Place a symbolic link to target at a link path that was already resolved."""
+    os.symlink(target, link_path)
 
 def set_file_times(file_path: Path, modification_date) -> None:
-    """Set the modification time of a file to the given date."""
+    """Set the modification time of a file to the given date.
+
+    modification_date is an ISO 8601 string, a datetime, or Unix seconds.
+    """
     if isinstance(modification_date, str):
         try:
             dt = datetime.fromisoformat(modification_date)
@@ -80,7 +64,10 @@ def set_file_times(file_path: Path, modification_date) -> None:
         dt = modification_date
 
     try:
-        mod_time = dt.timestamp()
+        if isinstance(dt, (int, float)):
+            mod_time = float(dt)
+        else:
+            mod_time = dt.timestamp()
         # Windows requires timestamps between 1970 and 3001
         # Clamp to a safe range to avoid OSError
         mod_time = max(0.0, min(mod_time, 32503680000.0))
@@ -0,0 +1,94 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Hands out collision-free file and folder names per destination
+ folder without probing the disk for each candidate.
+"""
+
+import os
+
+import sys
+
+import threading
+
+from pathlib import Path
+
+from typing import Dict, Iterable, Set
+
+
+# Windows and macOS treat names differing only in case as the same file
+_CASE_INSENSITIVE = sys.platform in ("win32", "darwin")
+
+
+def _name_key(name: str) -> str:
+    return name.casefold() if _CASE_INSENSITIVE else name
+
+
+class _FolderNames:
+    """The taken names of one folder, and where to resume numbering each
+    requested name.
+    """
+
+    def __init__(self, taken: Set[str]):
+        self.taken = taken
+        self.next_counter: Dict[str, int] = {}
+
+
+class NameAllocator:
+    """Allocates free names in a folder, "name", then "name (1)",
+    "name (2)" and so on, from memory rather than by probing the disk.
+
+    Each folder is listed once, the first time a name in it is needed, and
+    every name handed out or reserved afterwards is remembered. Numbering
+    of a requested name resumes where it last stopped, so allocating the
+    same name n times costs O(n) in total instead of O(n^2) disk probes.
+    Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._folders: Dict[Path, _FolderNames] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, folder: Path, name: str) -> str:
+        """Returns a name in folder that is neither on disk nor handed out,
+        and marks it as taken.
+        """
+        with self._lock:
+            names = self._get_folder(folder)
+            if _name_key(name) not in names.taken:
+                names.taken.add(_name_key(name))
+                return name
+
+            base_name, ext = os.path.splitext(name)
+            counter = names.next_counter.get(name, 1)
+            new_name = f"{base_name} ({counter}){ext}"
+            while _name_key(new_name) in names.taken:
+                counter += 1
+                new_name = f"{base_name} ({counter}){ext}"
+            names.next_counter[name] = counter + 1
+            names.taken.add(_name_key(new_name))
+            return new_name
+
+    def allocate_path(self, folder: Path, name: str) -> Path:
+        """Returns folder / allocate(folder, name)."""
+        return folder / self.allocate(folder, name)
+
+    def reserve(self, paths: Iterable[Path]) -> None:
+        """Marks paths as taken, e.g. ones planned but not yet written."""
+        with self._lock:
+            for path in paths:
+                self._get_folder(path.parent).taken.add(_name_key(path.name))
+
+    def _get_folder(self, folder: Path) -> _FolderNames:
+        """Returns the names of a folder, listing it on first use."""
+        names = self._folders.get(folder)
+        if names is None:
+            taken = set()
+            try:
+                with os.scandir(folder) as entries:
+                    taken.update(_name_key(entry.name) for entry in entries)
+            except (FileNotFoundError, NotADirectoryError):
+                pass  # Not created yet, so every name is free
+            names = _FolderNames(taken)
+            self._folders[folder] = names
+        return names
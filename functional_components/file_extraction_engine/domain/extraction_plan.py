@@ -0,0 +1,85 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the ExtractionPlan object, every filesystem
+ operation of an export decided before any of them runs.
+"""
+
+from dataclasses import dataclass, field
+
+from pathlib import Path
+
+from typing import Dict, List, Optional
+
+
+@dataclass
+class PlannedFile:
+    """One asset copied, and converted first if convert_to is set, to one or
+    more destination paths.
+    """
+    asset: object
+    dest_paths: List[Path]
+    convert_to: Optional[str] = None
+
+    # Source bytes times the number of destinations, 0 if the size is unknown
+    size: int = 0
+
+
+@dataclass
+class PlannedBurst:
+    """A burst's frames copied into a staging folder, which is then moved to
+    the first destination folder and copied to the rest.
+    """
+    burst_uuid: str
+    frames: List[object]
+    staging_folder: Path
+    dest_folders: List[Path]
+
+    # Source bytes of every frame times the number of destinations
+    size: int = 0
+
+
+@dataclass
+class PlannedLink:
+    """A symbolic link at link_path pointing at a planned file or folder."""
+    target: Path
+    link_path: Path
+    is_folder: bool = False
+
+
+@dataclass
+class ExtractionPlan:
+    """Every folder, copy and link an export makes, in execution order.
+
+    Folders are created first, then files and bursts are copied, then
+    links are placed, so no link is ever made to a path not yet written.
+    Building a plan touches nothing on disk, so it doubles as a dry run.
+    """
+    output_root: Path
+
+    # The conversion rules the plan was named for, e.g. {"HEIC": "JPG"}
+    convert_type_dict: Dict[str, str] = field(default_factory=dict)
+
+    folders: List[Path] = field(default_factory=list)
+    files: List[PlannedFile] = field(default_factory=list)
+    bursts: List[PlannedBurst] = field(default_factory=list)
+    links: List[PlannedLink] = field(default_factory=list)
+
+    # Assets and bursts left out by the blacklist or include_unassigned
+    skipped: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """The number of source bytes the plan copies."""
+        return (
+            sum(f.size for f in self.files)
+            + sum(b.size for b in self.bursts)
+        )
+
+    @property
+    def dest_paths(self) -> List[Path]:
+        """Every file, burst folder and link path the plan writes."""
+        paths = [p for f in self.files for p in f.dest_paths]
+        paths.extend(p for b in self.bursts for p in b.dest_folders)
+        paths.extend(link.link_path for link in self.links)
+        return paths
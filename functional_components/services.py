@@ -5,20 +5,29 @@ Description: Contains the backup service and settings services for the main
     menu.
 """
 
-from .backup_locator_and_validator.app.backup_model_builder import build_backup_model
+from .backup_locator_and_validator.app.backup_model_builder import (
+    start_backup_model_load,
+)
+
+from .backup_locator_and_validator.app.backup_catalog_scanner import (
+    scan_backup_catalog,
+)
+
+from .backup_locator_and_validator.domain.load_stats import PHASE_ORDER
+
+from .backup_locator_and_validator.domain.asset_columns import AssetColumns
 
 from pathlib import Path
 
 from .file_extraction_engine.domain.blacklist import ListEntry, Blacklist
 
-from functional_components.file_extraction_engine.app import extract_files
-
 from functional_components.file_extraction_engine.app.extract_files import (
     run_extraction_engine,
 )
 
 import json
 import os
+import threading
 
 import tempfile, pathlib
 
@@ -99,8 +108,25 @@ class BackupService:
 
     def __init__(self):
         # Holds the fully constructed BackupModel object once successfully loaded.
+        #  While assets are still loading it holds the metadata and albums only.
         self.current_model = None
 
+        # BackupLoadProgress of the load whose assets are still being built
+        self._load_progress = None
+
+        # (success, message, icloud_warning) of a background load that
+        #  finished after attempt_load_backup returned, until it is taken
+        self._load_outcome = None
+
+        # Guards the swap from _load_progress to the complete model, which
+        #  both the loader thread and wait_for_backup_load may attempt
+        self._load_lock = threading.Lock()
+
+        # LoadStats and BackupFileReport of the most recent load that
+        #  finished
+        self._load_stats = None
+        self._file_report = None
+
         # Load the technical -> branded mapping from JSON file
         self._load_model_mappings()
 
@@ -123,11 +149,15 @@ class BackupService:
             str: A formatted string containing device details, or an error
             message if no backup is currently loaded in memory.
         """
-        if not self.current_model:
+        # A background load can swap or clear both at any time, so each is
+        #  read once
+        model = self.current_model
+        progress = self._load_progress
+        if not model:
             return "No backup loaded."
 
         # Access the domain object
-        device = self.current_model.backup_metadata.source_device
+        device = model.backup_metadata.source_device
 
         # Logic: Clean up the model string (e.g. "iPhone12,1" -> "iPhone 12,1")
         raw_model = device.model.split(",")[0]
@@ -138,7 +168,15 @@ class BackupService:
         brand_name = self.technical_to_branded.get(device.model)
 
         # Access the backup_metadata fields regarding backup info specifically
-        device_metadata = self.current_model.backup_metadata
+        device_metadata = model.backup_metadata
+
+        if progress is not None and not progress.is_complete:
+            assets_loaded = (
+                f"{progress.loaded_assets} of "
+                f"{progress.total_assets} (still loading)"
+            )
+        else:
+            assets_loaded = len(model.assets)
 
         # Logic: Clean up the formatting of the backup date.
         formatted_backup_date = device_metadata.backup_date
@@ -156,30 +194,219 @@ class BackupService:
             f"- Backup UUID/GUID: .......... {device_metadata.backup_uuid}\n"
             f"- Backup Date: ............... {formatted_backup_date}\n"
             f"Backup Contents:\n"
-            f"- User Albums loaded: ........ {len(self.current_model.albums)}\n"
-            f"- Unhidden Assets Loaded: .... {len(self.current_model.assets)}\n"
+            f"- User Albums loaded: ........ {len(model.albums)}\n"
+            f"- Unhidden Assets Loaded: .... {assets_loaded}\n"
         )
 
     def attempt_load_backup(self, path_str):
         """
         Orchestrates the backup loading process.
 
+        Returns as soon as the device metadata and albums are loaded. The
+        assets keep loading in the background; see is_loading,
+        get_load_status, wait_for_backup_load and take_load_outcome.
+
         Args:
             path_str (str): The file path to the selected iPhone backup directory.
         Returns:
-            tuple: A boolean indicating success, and a corresponding message string.
+            tuple: A boolean indicating success, a corresponding message
+            string, and the iCloud warning if the load already finished.
         """
         if not path_str:
             return False, "No folder selected. Please try again.", None
 
-        # Call the Backup Locator & Validator
-        result = build_backup_model(Path(path_str))
+        # Call the Backup Locator & Validator. Unchanged backups that were
+        #  loaded before come straight from the on-disk cache.
+        progress = start_backup_model_load(Path(path_str))
+        progress.wait_for_partial()
+
+        if progress.is_complete:
+            result = progress.result
+            self._load_stats = result.load_stats
+            self._file_report = result.file_report
+            if result.success:
+                self.current_model = result.backup_model
+                self._load_progress = None
+                return True, "Backup loaded successfully!", result.icloud_warning
+            else:
+                return False, f"Error loading backup: {result.error}", None
+
+        with self._load_lock:
+            self.current_model = progress.backup_model
+            self._load_progress = progress
+            self._load_outcome = None
+        progress.add_done_callback(self._on_load_finished)
+        return (
+            True,
+            "Backup metadata loaded! Assets are still loading in the background.",
+            None,
+        )
+
+    def _on_load_finished(self, progress):
+        """Swaps in the complete model once a background load ends.
+
+        Runs at most once per load: the swap clears _load_progress under
+        _load_lock, so a second call for the same load does nothing.
+        """
+        with self._load_lock:
+            if progress is not self._load_progress:
+                return  # Already swapped in, or replaced by a newer load
+
+            result = progress.result
+            self._load_stats = result.load_stats
+            self._file_report = result.file_report
+            if result.success:
+                self.current_model = result.backup_model
+                self._load_outcome = (
+                    True, "Backup loaded successfully!", result.icloud_warning
+                )
+            else:
+                self.current_model = None
+                self._load_outcome = (
+                    False, f"Error loading backup: {result.error}", None
+                )
+            self._load_progress = None
+
+    def is_loading(self):
+        """Returns True while the current backup's assets are still loading."""
+        progress = self._load_progress
+        return progress is not None and not progress.is_complete
+
+    def get_load_status(self):
+        """Returns a "loaded N of M" line for the backup load in progress."""
+        progress = self._load_progress
+        if progress is None:
+            return "No backup is loading."
+        return (
+            f"Assets loaded: {progress.loaded_assets} of {progress.total_assets}"
+        )
+
+    def wait_for_backup_load(self, on_progress=None, poll_interval=0.25):
+        """
+        Blocks until the current backup's assets have finished loading.
+
+        Args:
+            on_progress: Optional callable taking (loaded, total), called
+                periodically while waiting.
+            poll_interval (float): Seconds between on_progress calls.
+        Returns:
+            The complete BackupModel, or None if the load failed.
+        """
+        progress = self._load_progress
+        if progress is not None:
+            while progress.wait(poll_interval) is None:
+                if on_progress:
+                    on_progress(progress.loaded_assets, progress.total_assets)
+            # Make sure the done callback has swapped the model in
+            self._on_load_finished(progress)
+        return self.current_model
+
+    def take_load_outcome(self):
+        """
+        Returns the outcome of a background load that has finished since
+        attempt_load_backup returned, once.
+
+        Returns:
+            tuple: (success, message, icloud_warning), or None if there is
+            nothing new to report.
+        """
+        with self._load_lock:
+            outcome, self._load_outcome = self._load_outcome, None
+        return outcome
+
+    def get_formatted_load_stats(self):
+        """
+        Formats the per-phase timings and row counts of the last finished
+        backup load for display in the UI.
+
+        Returns:
+            str: The formatted statistics, or a message if no load has
+            finished yet.
+        """
+        stats = self._load_stats
+        if stats is None:
+            return "No load statistics available."
 
-        if result.success:
-            self.current_model = result.backup_model
-            return True, "Backup loaded successfully!", result.icloud_warning
+        source = "on-disk cache" if stats.from_cache else "backup databases"
+        lines = [f"Load Statistics (from {source}):", "Phase Timings:"]
+
+        # Known phases in load order, then any others
+        phases = sorted(
+            stats.phase_seconds,
+            key=lambda p: PHASE_ORDER.index(p) if p in PHASE_ORDER else len(PHASE_ORDER),
+        )
+        for phase in phases:
+            label = f"- {phase}: ".ljust(32, ".")
+            lines.append(f"{label} {stats.phase_seconds[phase]:.3f} s")
+
+        if stats.counters:
+            lines.append("Counters:")
+            for counter, value in stats.counters.items():
+                label = f"- {counter}: ".ljust(32, ".")
+                lines.append(f"{label} {value}")
+
+        report = self._file_report
+        if report is not None:
+            lines.append("Backup Files:")
+            lines.append(
+                f"{'- Asset files present: '.ljust(32, '.')} "
+                f"{report.present_assets} of {report.checked_assets}"
+            )
+            lines.append(
+                f"{'- Asset files missing: '.ljust(32, '.')} {report.missing_assets}"
+            )
+            lines.append(
+                f"{'- Total size: '.ljust(32, '.')} "
+                f"{report.total_bytes / (1024 ** 3):.2f} GB"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def scan_backup_folder(self, path_str):
+        """
+        Scans a folder holding several backups (such as MobileSync/Backup)
+        into the backup catalog. Backups that are unchanged since their last
+        scan are not read again.
+
+        Args:
+            path_str (str): The folder holding the backup folders.
+        Returns:
+            tuple: A boolean indicating success, a corresponding message
+            string, and the list of BackupCatalogEntry objects found.
+        """
+        if not path_str:
+            return False, "No folder selected. Please try again.", []
+
+        try:
+            entries = scan_backup_catalog(Path(path_str))
+        except OSError as e:
+            return False, f"Error scanning backups: {e}", []
+
+        if not entries:
+            return False, "No backups found in that folder.", []
+        return True, f"Found {len(entries)} backup(s).", entries
+
+    def format_catalog_entry(self, entry):
+        """
+        Formats a BackupCatalogEntry as a one line summary for the UI.
+
+        Returns:
+            str: Device, backup date and Photos library size of the backup.
+        """
+        folder = Path(entry.backup_path).name
+        if entry.error:
+            return f"{folder}: [!] {entry.error}"
+
+        brand_name = self.technical_to_branded.get(entry.device_model)
+        backup_date = (entry.backup_date or "unknown date").replace("T", " ")
+        if entry.is_encrypted:
+            contents = "encrypted"
         else:
-            return False, f"Error loading backup: {result.error}", None
+            contents = f"{entry.asset_count} assets, {entry.album_count} albums"
+        return (
+            f"{entry.device_name} ({brand_name or entry.device_model}, "
+            f"iOS {entry.ios_version}) - {backup_date} - {contents} [{folder}]"
+        )
 
 
 class SettingsService:
@@ -369,6 +596,16 @@ class ExportService:
     writing it to the local destination path.
     """
 
+    def __init__(self):
+        # (backup_model, AssetColumns) of the last model columns were built for
+        self._asset_columns = None
+
+    def _get_asset_columns(self, backup_model):
+        """Returns the AssetColumns of backup_model, reusing the last build."""
+        if self._asset_columns is None or self._asset_columns[0] is not backup_model:
+            self._asset_columns = (backup_model, AssetColumns.from_model(backup_model))
+        return self._asset_columns[1]
+
     def get_album_list(self, backup_model):
         """
         Retrieves a list of all available albums contained within the parsed backup.
@@ -392,11 +629,8 @@ class ExportService:
             else:
                 result.append(album.title)
 
-        # NUAs: scan assets to find which smart folders are actually present
-        present_nuas = set()
-        for asset in backup_model.assets:
-            for nua in asset.relationships.smart_folders:
-                present_nuas.add(nua)
+        # NUAs: find which smart folders are actually present
+        present_nuas = self._get_asset_columns(backup_model).present_smart_folders()
 
         # Display names for each canonical NUA name
         NUA_DISPLAY = {
@@ -439,10 +673,9 @@ class ExportService:
                 blacklist.current_list.append(ListEntry(nua))
 
             # Compute present NUAs for folder creation
-            present_nuas = set()
-            for asset in backup_model.assets:
-                for nua in asset.relationships.smart_folders:
-                    present_nuas.add(nua)
+            present_nuas = self._get_asset_columns(
+                backup_model
+            ).present_smart_folders()
 
             try:
                 test = pathlib.Path(tempfile.mkdtemp()) / "test_link"
@@ -452,27 +685,6 @@ class ExportService:
             except (OSError, NotImplementedError):
                 os_supports_symlinks = False
 
-            # Saving orignal maybe convert function
-            original_maybe_convert = extract_files.maybe_convert
-
-            def wrapped_maybe_convert(asset, convert_dict, temp_dir=None):
-                """
-                This function adds another part to the maybe convert function,
-                which takes note of the files being converted.
-                """
-                ext = asset.file_extension.upper()
-                if ext in convert_dict:
-                    progress_tracker.add_log(
-                        f"Converting: {asset.original_filename} → {convert_dict[ext]}"
-                    )
-                else:
-
-                    progress_tracker.add_log(f"Exporting: {asset.original_filename}")
-
-                return original_maybe_convert(asset, convert_dict, temp_dir)
-
-            extract_files.maybe_convert = wrapped_maybe_convert
-
             engine_error = []
 
             def run():
@@ -553,6 +765,27 @@ class ExportService:
             is_blacklist=True,
         )
 
+        # Only assets in a collection the blacklist lets through can be
+        #  exported, so hand the engine just those (plus their whole bursts)
+        columns = self._get_asset_columns(backup_model)
+        ua_names = {e.name for e in single_album_blacklist.current_list if not e.is_NUA}
+        nua_names = {e.name for e in single_album_blacklist.current_list if e.is_NUA}
+        selected = columns.with_bursts(columns.select(
+            album_uuids=[
+                album.album_uuid
+                for album in backup_model.albums
+                if album.title not in ua_names
+            ],
+            smart_folders=[
+                nua
+                for nua in ["favorites", "hidden", "selfies", "recently_deleted"]
+                if nua not in nua_names
+            ],
+        ))
+        album_model = backup_model.model_copy(
+            update={"assets": columns.assets_at(selected)}
+        )
+
         # Album UUID Debugging:
         # print(f"Target album: {album_name}")
         # for album in backup_model.albums:
@@ -574,28 +807,12 @@ class ExportService:
             except (OSError, NotImplementedError):
                 os_supports_symlinks = False
 
-            original_maybe_convert = extract_files.maybe_convert
-
-            def wrapped_maybe_convert(asset, convert_dict, temp_dir=None):
-                ext = asset.file_extension.upper()
-                if ext in convert_dict:
-                    progress_tracker.add_log(
-                        f"Converting: {asset.original_filename} → {convert_dict[ext]}"
-                    )
-                else:
-
-                    progress_tracker.add_log(f"Exporting: {asset.original_filename}")
-
-                return original_maybe_convert(asset, convert_dict, temp_dir)
-
-            extract_files.maybe_convert = wrapped_maybe_convert
-
             engine_error = []
 
             def run():
                 try:
                     run_extraction_engine(
-                        backup_model=backup_model,
+                        backup_model=album_model,
                         blacklist=single_album_blacklist,
                         output_root=Path(destination_str),
                         os_supports_symlinks=os_supports_symlinks,
@@ -4,7 +4,7 @@ Date: 2026-03-05
 Description: Builds Album domain objects from raw Photos.sqlite data.
 """
 
-from typing import List
+from typing import Iterable, List
 
 from functional_components.backup_locator_and_validator.domain.backup_model import (
     Album,
@@ -19,7 +19,7 @@ def _get_sort_order(row: dict) -> str:
         return "date"
     return "none"
 
-def build_albums(raw_albums: List[dict]) -> List[Album]:
+def build_albums(raw_albums: Iterable[dict]) -> List[Album]:
     """Converts raw album rows into Album domain objects."""
     albums = []
     for row in raw_albums:
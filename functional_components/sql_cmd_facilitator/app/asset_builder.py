@@ -4,114 +4,183 @@ Date: 2026-02-23
 Description: Builds Asset domain objects from raw Photos.sqlite data.
 """
 
-from datetime import datetime, timezone
+import sys
+import time
+
+from array import array
 
 from pathlib import Path
 
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
 from functional_components.backup_locator_and_validator.domain.backup_model import (
-    Asset,
+    AssetRecord,
     Flags,
     Relationships,
+    backup_file_path,
+)
+
+from functional_components.backup_locator_and_validator.domain.asset_columns import (
+    MEDIA_TYPE_CODES,
+    SMART_FOLDER_BITS,
+    SUBTYPE_CODES,
+)
+
+from functional_components.backup_locator_and_validator.domain.load_stats import (
+    LoadStats,
+)
+
+from functional_components.sql_cmd_facilitator.domain.album_memberships import (
+    AlbumMemberships,
+)
+
+from functional_components.sql_cmd_facilitator.domain.manifest_index import (
+    ManifestIndex,
 )
 
 
-# Seconds between Unix epoch (1970-01-01) and Apple epoch (2001-01-01)
-APPLE_EPOCH_OFFSET = 978307200
-
-# Maps ZKIND integer values to media_type literals
-MEDIA_TYPE_MAP = {
-    0: "photo",
-    1: "video",
-}
-
-# Maps ZKINDSUBTYPE integer values to subtype literals
-SUBTYPE_MAP = {
-    2: "live_photo_still",
-    4: "live_photo_video",
-    8: "screenshot",
-    16: "portrait",
-    32: "panorama",
-    64: "slo_mo",
-    128: "time_lapse",
-    768: "burst_frame",
-}
-
-
-def _convert_apple_epoch(apple_time: float) -> str:
-    """Converts Apple epoch timestamp to ISO 8601 string."""
-    if apple_time is None:
-        return ""
-    unix_time = apple_time + APPLE_EPOCH_OFFSET
-    return datetime.fromtimestamp(unix_time, tz=timezone.utc).isoformat()
-
-def _get_subtype(row: dict) -> str:
-    """Maps row data to a subtype literal."""
-    if row.get("ZAVALANCHEUUID") is not None:
-        return "burst_frame"
-    zkindsubtype = row.get("ZKINDSUBTYPE")
-    if zkindsubtype is None:
-        return "standard"
-    return SUBTYPE_MAP.get(zkindsubtype, "standard")
-
-def _get_media_type(zkind: int) -> str:
-    """Maps ZKIND integer to a media_type literal."""
-    return MEDIA_TYPE_MAP.get(zkind, "photo")
-
-def _build_flags(row: dict) -> Flags:
-    """Builds a Flags object from raw asset row data."""
-    return Flags(
-        is_favorite=bool(row.get("ZFAVORITE", 0)),
-        is_hidden=bool(row.get("ZHIDDEN", 0)),
-        is_recently_deleted=bool(row.get("ZTRASHEDSTATE", 0)),
-        # Correctly find selfies.
-        is_selfie=row.get("ZDERIVEDCAMERACAPTUREDEVICE") == 1
+# The literals of the media_type_code and subtype_code columns of the
+#  asset query
+_MEDIA_TYPES = {code: media_type for media_type, code in MEDIA_TYPE_CODES.items()}
+_SUBTYPES = {code: subtype for subtype, code in SUBTYPE_CODES.items()}
+
+
+def _build_flag_set(flag_bits: int) -> tuple:
+    """Builds the (Flags, smart_folders) pair of a flag_bits mask."""
+    flags = Flags(
+        is_favorite=bool(flag_bits & SMART_FOLDER_BITS["favorites"]),
+        is_hidden=bool(flag_bits & SMART_FOLDER_BITS["hidden"]),
+        is_recently_deleted=bool(flag_bits & SMART_FOLDER_BITS["recently_deleted"]),
+        is_selfie=bool(flag_bits & SMART_FOLDER_BITS["selfies"]),
     )
+    smart_folders = [
+        folder for folder, bit in SMART_FOLDER_BITS.items() if flag_bits & bit
+    ]
+    return flags, smart_folders
+
+# Flags and smart folders depend only on flag_bits, so assets with the
+#  same mask share one (Flags, smart_folders) pair.
+_FLAG_SETS: List[tuple] = [
+    _build_flag_set(flag_bits)
+    for flag_bits in range(sum(SMART_FOLDER_BITS.values()) + 1)
+]
 
 def _build_relationships(
-    asset_pk: int,
-    membership_lookup: dict,
+    album_indexes: tuple,
+    membership_lookup: AlbumMemberships,
+    flag_bits: int,
+    relationships_cache: dict,
 ) -> Relationships:
-    """Builds a Relationships object for an asset."""
-    user_albums = membership_lookup.get(asset_pk, [])
-    return Relationships(user_albums=user_albums)
-
-def _derive_smart_folders(flags: Flags) -> list:
-    """Derives smart_folders list from flags."""
-    smart_folders = []
-    if flags.is_favorite:
-        smart_folders.append("favorites")
-    if flags.is_hidden:
-        smart_folders.append("hidden")
-    if flags.is_recently_deleted:
-        smart_folders.append("recently_deleted")
-    if flags.is_selfie:
-        smart_folders.append("selfies")
-    return smart_folders
-
-def build_membership_lookup(raw_memberships: List[dict]) -> dict:
-    """Builds a dict mapping asset Z_PK to a list of album UUIDs.
+    """Builds a Relationships object for an asset.
+
+    Most assets share their album and smart folder combination with many
+    others (often none at all), so one object per combination is built
+    and shared through relationships_cache. Album UUIDs are only resolved
+    once per combination.
+    """
+    key = (album_indexes, flag_bits)
+    relationships = relationships_cache.get(key)
+    if relationships is None:
+        relationships = Relationships(
+            user_albums=membership_lookup.uuids_of(album_indexes),
+            smart_folders=_FLAG_SETS[flag_bits][1],
+        )
+        relationships_cache[key] = relationships
+    return relationships
+
+def _is_unchanged(
+    previous: AssetRecord,
+    row: dict,
+    backup_relative_path: str,
+    user_albums: list,
+) -> bool:
+    """Checks whether a previously built asset still matches its ZASSET row.
+
+    Photos bumps ZMODIFICATIONDATE on any edit to an asset, so together
+    with the resolved file and album membership this covers every field
+    build_assets derives.
+    """
+    return (
+        previous.backup_relative_path == backup_relative_path
+        and previous.modification_time == row.get("ZMODIFICATIONDATE")
+        and previous.relationships.user_albums == user_albums
+        and previous.flags == _FLAG_SETS[row["flag_bits"]][0]
+    )
+
+def build_membership_lookup(raw_memberships: Iterable[dict]) -> AlbumMemberships:
+    """Builds the AlbumMemberships of every asset from membership rows.
 
     This is precomputed once and passed into build_assets so we
-    don't do a lookup query per asset.
+    don't do a lookup query per asset. Each album UUID is stored once and
+    memberships are kept as integer album indexes, grouped by Z_PK with a
+    counting sort that keeps each asset's albums in row order. Rows
+    missing either key belong to no asset or album and are skipped.
     """
-    lookup = {}
+    album_index_by_uuid = {}
+    asset_pks = array("I")
+    album_indexes = array("I")
     for row in raw_memberships:
-        asset_pk = row["asset_pk"]
         album_uuid = row["album_uuid"]
-        if asset_pk not in lookup:
-            lookup[asset_pk] = []
-        lookup[asset_pk].append(album_uuid)
-    return lookup
+        if row["asset_pk"] is None or album_uuid is None:
+            continue
+        album_index = album_index_by_uuid.get(album_uuid)
+        if album_index is None:
+            album_index = len(album_index_by_uuid)
+            album_index_by_uuid[album_uuid] = album_index
+        asset_pks.append(row["asset_pk"])
+        album_indexes.append(album_index)
+
+    # Count memberships per Z_PK, then turn the counts into start offsets
+    offsets = array("I", bytes(4 * ((max(asset_pks) if asset_pks else -1) + 2)))
+    for asset_pk in asset_pks:
+        offsets[asset_pk + 1] += 1
+    for position in range(1, len(offsets)):
+        offsets[position] += offsets[position - 1]
+
+    grouped = array("I", bytes(4 * len(album_indexes)))
+    cursor = array("I", offsets)
+    for asset_pk, album_index in zip(asset_pks, album_indexes):
+        grouped[cursor[asset_pk]] = album_index
+        cursor[asset_pk] += 1
+
+    return AlbumMemberships(
+        album_uuids=list(album_index_by_uuid),
+        offsets=offsets,
+        album_indexes=grouped,
+    )
 
 def build_assets(
-    raw_assets: List[dict],
-    membership_lookup: dict,
+    raw_assets: Iterable[dict],
+    membership_lookup: AlbumMemberships,
     backup_root: Path,
     manifest_conn,
-) -> tuple[List[Asset], int]:
-    """Converts raw asset rows into Asset domain objects."""
+    manifest_index: Optional[ManifestIndex] = None,
+    previous_assets: Optional[Dict[str, AssetRecord]] = None,
+    stats: Optional[LoadStats] = None,
+) -> tuple[List[AssetRecord], int]:
+    """Converts raw asset rows into AssetRecord domain objects.
+
+    Every field is derived here from trusted database values, so records
+    are built without pydantic validation. Media type, subtype and flags
+    are unpacked from the codes the asset query computes.
+
+    Records keep the dates as raw Apple epoch times and their file as a
+    fileID under one shared backup root string; AssetRecord formats the
+    dates and joins the path only when they are read. Repeated strings
+    (UTIs and file extensions) are interned so all records share one
+    copy of each.
+
+    raw_assets is consumed once, so it can be a stream from iter_assets.
+    When a ManifestIndex is given, every file lookup (path, filename stem
+    fallback and live photo companion) is done in memory and Manifest.db
+    is only queried per asset without one.
+
+    previous_assets maps asset UUID to the record from an earlier load of
+    the same backup; unchanged ones are reused as-is instead of rebuilt.
+
+    If stats is given, the time of both passes and the lookup and reuse
+    counts are recorded on it.
+    """
     from functional_components.sql_cmd_facilitator.data.asset_reader import (
         get_file_id_for_asset,
         get_file_id_for_mov_companion,
@@ -120,7 +189,12 @@ def build_assets(
 
     assets = []
     skipped = 0
+    relationships_cache = {}
+    root = sys.intern(str(backup_root))
+    fallback_hits = 0
+    reused = 0
 
+    first_pass_start = time.perf_counter()
     for row in raw_assets:
         # Resolve the hashed file path from Manifest.db
         original_filename = row.get("ZORIGINALFILENAME") or row.get("ZFILENAME", "")
@@ -129,59 +203,62 @@ def build_assets(
         relative_path = f"Media/{directory}/{zfilename}"
 
         try:
-            file_id = get_file_id_for_asset(manifest_conn, relative_path)
-            backup_relative_path = str(backup_root / file_id[:2] / file_id)
-            backup_hashed_filename = file_id
+            if manifest_index is not None:
+                file_id = manifest_index.find_file_id(relative_path)
+            else:
+                file_id = get_file_id_for_asset(manifest_conn, relative_path)
         except FileNotFoundError:
             try:
-                file_id = get_file_id_fallback(manifest_conn, original_filename, zfilename)
-                backup_relative_path = str(backup_root / file_id[:2] / file_id)
-                backup_hashed_filename = file_id
+                if manifest_index is not None:
+                    file_id = manifest_index.find_fallback(original_filename, zfilename)
+                else:
+                    file_id = get_file_id_fallback(manifest_conn, original_filename, zfilename)
+                fallback_hits += 1
             except FileNotFoundError:
                 skipped += 1
                 continue
 
+        album_indexes = membership_lookup.album_indexes_of(row["Z_PK"])
+
+        # Reuse the previous load's record when nothing about it changed
+        if previous_assets is not None:
+            previous = previous_assets.get(row["ZUUID"])
+            if previous is not None and _is_unchanged(
+                previous,
+                row,
+                backup_file_path(root, file_id),
+                membership_lookup.uuids_of(album_indexes),
+            ):
+                assets.append(previous)
+                reused += 1
+                continue
+
         # Derive file extension from original filename
-        file_extension = (
+        file_extension = sys.intern(
             Path(original_filename).suffix.lstrip(".").upper()
             if original_filename else ""
         )
 
-        # Build flags
-        flags = _build_flags(row)
-
-        # Build relationships
-        asset_pk = row["Z_PK"]
-        relationships = _build_relationships(asset_pk, membership_lookup)
-
-        # Derive smart folders from flags and attach to relationships
-        smart_folders = _derive_smart_folders(flags)
-        relationships = Relationships(
-            user_albums=relationships.user_albums,
-            smart_folders=smart_folders,
+        # Shared flags and relationships
+        flag_bits = row["flag_bits"]
+        flags = _FLAG_SETS[flag_bits][0]
+        relationships = _build_relationships(
+            album_indexes, membership_lookup, flag_bits, relationships_cache
         )
 
-        # TEMP DEBUG - remove after investigation
-        # if row.get("ZAVALANCHEUUID") is not None:
-        #     print(
-        #         f"BURST ROW: ZKINDSUBTYPE={row.get('ZKINDSUBTYPE')} "
-        #         f"ZAVALANCHEPICKTYPE={row.get('ZAVALANCHEPICKTYPE')} "
-        #         f"FILE={row.get('ZFILENAME')}"
-        #     )
-
-        assets.append(Asset(
+        assets.append(AssetRecord(
             asset_uuid=row["ZUUID"],
             local_identifier=row["ZUUID"],
             original_filename=original_filename,
             file_extension=file_extension,
-            uti_type=row.get("ZUNIFORMTYPEIDENTIFIER") or "",
-            creation_date=_convert_apple_epoch(row.get("ZDATECREATED")),
-            modification_date=_convert_apple_epoch(row.get("ZMODIFICATIONDATE")),
+            uti_type=sys.intern(row.get("ZUNIFORMTYPEIDENTIFIER") or ""),
+            creation_time=row.get("ZDATECREATED"),
+            modification_time=row.get("ZMODIFICATIONDATE"),
             timezone_offset="",
-            backup_relative_path=backup_relative_path,
-            backup_hashed_filename=backup_hashed_filename,
-            media_type=_get_media_type(row.get("ZKIND")),
-            subtype=_get_subtype(row),
+            backup_root=root,
+            backup_hashed_filename=file_id,
+            media_type=_MEDIA_TYPES[row["media_type_code"]],
+            subtype=_SUBTYPES[row["subtype_code"]],
             live_photo_group_uuid=row.get("ZMEDIAGROUPUUID"),
             burst_uuid=row.get("ZAVALANCHEUUID"),
             is_primary_burst_frame=bool(
@@ -191,19 +268,12 @@ def build_assets(
             relationships=relationships,
         ))
 
-    # Add the index to make the LIKE query fast
-    try:
-        manifest_conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_files_path ON Files(relativePath)"
-        )
-    except Exception:
-        pass
-
-    # Debug print
-    # print(f"Assets skipped (unresolvable in Manifest.db): {skipped}")
+    first_pass_seconds = time.perf_counter() - first_pass_start
+    row_count = len(assets) + skipped
 
     # Second pass: synthesize live_photo_video assets for iOS 26+
     # where companion MOV files exist in Manifest.db but have no ZASSET row.
+    second_pass_start = time.perf_counter()
     live_stills = [
         a for a in assets
         if a.subtype == "live_photo_still"
@@ -213,21 +283,34 @@ def build_assets(
         stem = Path(still.original_filename).stem
         mov_filename = stem + ".MOV"
         try:
-            file_id = get_file_id_for_mov_companion(manifest_conn, mov_filename)
-            mov_backup_path = str(backup_root / file_id[:2] / file_id)
+            if manifest_index is not None:
+                file_id = manifest_index.find_mov_companion(mov_filename)
+            else:
+                file_id = get_file_id_for_mov_companion(manifest_conn, mov_filename)
         except FileNotFoundError:
             continue
 
-        assets.append(Asset(
+        # An unchanged still keeps its previously synthesized companion
+        if previous_assets is not None:
+            previous = previous_assets.get(still.asset_uuid + "_mov")
+            if (
+                previous is not None
+                and previous_assets.get(still.asset_uuid) is still
+                and previous.backup_relative_path == backup_file_path(root, file_id)
+            ):
+                assets.append(previous)
+                continue
+
+        assets.append(AssetRecord(
             asset_uuid=still.asset_uuid + "_mov",
             local_identifier=still.local_identifier + "_mov",
             original_filename=mov_filename,
             file_extension="MOV",
             uti_type="com.apple.quicktime-movie",
-            creation_date=still.creation_date,
-            modification_date=still.modification_date,
+            creation_time=still.creation_time,
+            modification_time=still.modification_time,
             timezone_offset=still.timezone_offset,
-            backup_relative_path=mov_backup_path,
+            backup_root=root,
             backup_hashed_filename=file_id,
             media_type="video",
             subtype="live_photo_video",
@@ -238,4 +321,16 @@ def build_assets(
             relationships=still.relationships,
         ))
 
+    if stats is not None:
+        stats.phase_seconds["build_assets_first_pass"] = first_pass_seconds
+        stats.phase_seconds["build_assets_second_pass"] = (
+            time.perf_counter() - second_pass_start
+        )
+        stats.count("assets_built", row_count - skipped - reused)
+        stats.count("assets_reused", reused)
+        stats.count("assets_skipped", skipped)
+        stats.count("path_hits", row_count - skipped - fallback_hits)
+        stats.count("fallback_hits", fallback_hits)
+        stats.count("mov_companions", len(assets) - row_count + skipped)
+
     return assets, skipped
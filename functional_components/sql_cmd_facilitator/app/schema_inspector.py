@@ -5,10 +5,25 @@ Description: Inspects the Photos.sqlite schema to discover dynamic
     table and column names that vary across iOS versions.
 """
 
+import hashlib
+
 import re
 
 import sqlite3
 
+import threading
+
+from typing import Dict
+
+from functional_components.sql_cmd_facilitator.domain.schema_profile import (
+    SchemaProfile,
+)
+
+
+# SchemaProfiles already built in this process, keyed by fingerprint
+_PROFILE_CACHE: Dict[str, SchemaProfile] = {}
+_PROFILE_CACHE_LOCK = threading.Lock()
+
 
 def find_album_asset_join_table(conn: sqlite3.Connection) -> str:
     """Finds the album-to-asset join table name dynamically.
@@ -63,3 +78,58 @@ def find_join_table_columns(conn: sqlite3.Connection, join_table: str) -> dict:
         "asset_fk": asset_fk,
         "sort_col": sort_col,
     }
+
+
+def get_table_columns(conn: sqlite3.Connection, table: str) -> frozenset:
+    """Returns the column names of a table, or an empty set if it is absent."""
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return frozenset(row["name"] for row in rows)
+
+
+def get_schema_fingerprint(conn: sqlite3.Connection) -> str:
+    """Hashes the schema SQL in sqlite_master.
+
+    Two databases with the same tables, columns and indexes get the same
+    fingerprint, whatever rows they hold.
+    """
+    rows = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master ORDER BY type, name"
+    ).fetchall()
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(f"{row[0]}\0{row[1]}\0{row[2]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_schema_profile(conn: sqlite3.Connection, fingerprint: str) -> SchemaProfile:
+    """Inspects the schema of Photos.sqlite into a SchemaProfile."""
+    join_table = find_album_asset_join_table(conn)
+    join_cols = find_join_table_columns(conn, join_table)
+    return SchemaProfile(
+        fingerprint=fingerprint,
+        join_table=join_table,
+        album_fk=join_cols["album_fk"],
+        asset_fk=join_cols["asset_fk"],
+        sort_col=join_cols["sort_col"],
+        zasset_columns=get_table_columns(conn, "ZASSET"),
+        additional_attribute_columns=get_table_columns(
+            conn, "ZADDITIONALASSETATTRIBUTES"
+        ),
+    )
+
+
+def get_schema_profile(conn: sqlite3.Connection) -> SchemaProfile:
+    """Returns the SchemaProfile of Photos.sqlite, inspecting it only once
+    per schema.
+
+    Backups of the same iOS version share a schema, so loading several of
+    them in one session only inspects the first.
+    """
+    fingerprint = get_schema_fingerprint(conn)
+    with _PROFILE_CACHE_LOCK:
+        profile = _PROFILE_CACHE.get(fingerprint)
+    if profile is None:
+        profile = build_schema_profile(conn, fingerprint)
+        with _PROFILE_CACHE_LOCK:
+            _PROFILE_CACHE[fingerprint] = profile
+    return profile
@@ -5,21 +5,19 @@ Description: Queries Photos.sqlite for album data.
 """
 
 import sqlite3
-from typing import List
+from typing import Iterator, List
 
 from functional_components.sql_cmd_facilitator.data.sql_executor import (
     execute_query,
+    iter_query,
 )
 from functional_components.sql_cmd_facilitator.data.row_mapper import (
     map_rows,
+    iter_map_rows,
 )
 
 
-def get_albums(conn: sqlite3.Connection) -> List[dict]:
-    """Returns all user-created and burst albums from ZGENERICALBUM."""
-    rows = execute_query(
-        conn,
-        """
+_ALBUMS_QUERY = """
         SELECT
             ZUUID,
             ZTITLE,
@@ -31,5 +29,20 @@ def get_albums(conn: sqlite3.Connection) -> List[dict]:
         WHERE ZKIND = 2
         ORDER BY ZTITLE
         """
-    )
+
+
+def get_albums(conn: sqlite3.Connection) -> List[dict]:
+    """Returns all user-created and burst albums from ZGENERICALBUM."""
+    rows = execute_query(conn, _ALBUMS_QUERY)
     return map_rows(rows)
+
+
+def iter_albums(conn: sqlite3.Connection) -> Iterator[dict]:
+    """Streams the rows of get_albums one dict at a time."""
+    return iter_map_rows(iter_query(conn, _ALBUMS_QUERY))
+
+
+def count_albums(conn: sqlite3.Connection) -> int:
+    """Returns the number of albums get_albums would return."""
+    rows = execute_query(conn, "SELECT COUNT(*) FROM ZGENERICALBUM WHERE ZKIND = 2")
+    return rows[0][0]
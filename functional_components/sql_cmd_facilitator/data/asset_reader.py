@@ -5,47 +5,197 @@ Description: Queries Photos.sqlite for asset data.
 """
 
 import sqlite3
-from typing import List
+from functools import lru_cache
+from typing import Iterator, List, Optional
 
 from functional_components.sql_cmd_facilitator.data.sql_executor import (
     execute_query,
+    iter_query,
 )
 from functional_components.sql_cmd_facilitator.data.row_mapper import (
     map_rows,
+    iter_map_rows,
+)
+from functional_components.sql_cmd_facilitator.domain.schema_profile import (
+    SchemaProfile,
+)
+from functional_components.backup_locator_and_validator.domain.asset_columns import (
+    MEDIA_TYPE_CODES,
+    SMART_FOLDER_BITS,
+    SUBTYPE_CODES,
 )
 
 
-def get_assets(conn: sqlite3.Connection) -> List[dict]:
-    """Returns all assets from ZASSET joined with ZADDITIONALASSETATTRIBUTES."""
-    rows = execute_query(
-        conn,
+# ZASSET columns read for every asset. The others are selected as NULL
+#  when a schema lacks them, but an asset cannot be built without these.
+ZASSET_COLUMNS = (
+    "ZUUID",
+    "Z_PK",
+    "ZFILENAME",
+    "ZDIRECTORY",
+    "ZUNIFORMTYPEIDENTIFIER",
+    "ZDATECREATED",
+    "ZMODIFICATIONDATE",
+    "ZKIND",
+    "ZKINDSUBTYPE",
+    "ZFAVORITE",
+    "ZHIDDEN",
+    "ZTRASHEDSTATE",
+    "ZAVALANCHEUUID",
+    "ZAVALANCHEPICKTYPE",
+    "ZMEDIAGROUPUUID",
+    "ZDERIVEDCAMERACAPTUREDEVICE",
+)
+_REQUIRED_ZASSET_COLUMNS = ("ZUUID", "Z_PK")
+
+# Maps ZKIND integer values to media_type literals
+MEDIA_TYPE_MAP = {
+    0: "photo",
+    1: "video",
+}
+
+# Maps ZKINDSUBTYPE integer values to subtype literals
+SUBTYPE_MAP = {
+    2: "live_photo_still",
+    4: "live_photo_video",
+    8: "screenshot",
+    16: "portrait",
+    32: "panorama",
+    64: "slo_mo",
+    128: "time_lapse",
+    768: "burst_frame",
+}
+
+
+def _code_columns(zasset_columns: frozenset) -> List[str]:
+    """Returns the select expressions that derive each asset's codes.
+
+    media_type_code and subtype_code are MEDIA_TYPE_CODES and
+    SUBTYPE_CODES values, and flag_bits is a SMART_FOLDER_BITS mask, so
+    SQLite does the per-row mapping and Python only looks the codes up.
+    """
+    def column(name: str) -> str:
+        return f"ZASSET.{name}" if name in zasset_columns else "NULL"
+
+    media_type_cases = " ".join(
+        f"WHEN {zkind} THEN {MEDIA_TYPE_CODES[media_type]}"
+        for zkind, media_type in MEDIA_TYPE_MAP.items()
+    )
+    subtype_cases = " ".join(
+        f"WHEN {zkindsubtype} THEN {SUBTYPE_CODES[subtype]}"
+        for zkindsubtype, subtype in SUBTYPE_MAP.items()
+    )
+    flag_terms = (
+        (f"COALESCE({column('ZFAVORITE')}, 0) != 0", "favorites"),
+        (f"COALESCE({column('ZHIDDEN')}, 0) != 0", "hidden"),
+        (f"COALESCE({column('ZTRASHEDSTATE')}, 0) != 0", "recently_deleted"),
+        (f"{column('ZDERIVEDCAMERACAPTUREDEVICE')} IS 1", "selfies"),
+    )
+    flag_bits = "\n                | ".join(
+        f"(({condition}) * {SMART_FOLDER_BITS[folder]})"
+        for condition, folder in flag_terms
+    )
+
+    return [
+        f"CASE {column('ZKIND')} {media_type_cases} "
+        f"ELSE {MEDIA_TYPE_CODES['photo']} END AS media_type_code",
+        f"CASE WHEN {column('ZAVALANCHEUUID')} IS NOT NULL "
+        f"THEN {SUBTYPE_CODES['burst_frame']} "
+        f"ELSE CASE {column('ZKINDSUBTYPE')} {subtype_cases} "
+        f"ELSE {SUBTYPE_CODES['standard']} END END AS subtype_code",
+        f"({flag_bits}) AS flag_bits",
+    ]
+
+
+@lru_cache(maxsize=None)
+def build_assets_query(profile: Optional[SchemaProfile] = None) -> str:
+    """Returns the asset query for a schema, generated once per profile.
+
+    Columns the schema lacks are selected as NULL so every row has the
+    same keys. Without a profile every column is assumed to exist.
+
+    Every row also carries the media_type_code, subtype_code and
+    flag_bits derived by _code_columns.
+    """
+    if profile is None:
+        zasset_columns = frozenset(ZASSET_COLUMNS)
+        has_original_filename = True
+    else:
+        zasset_columns = profile.zasset_columns
+        has_original_filename = (
+            "ZORIGINALFILENAME" in profile.additional_attribute_columns
+            and "ZASSET" in profile.additional_attribute_columns
+        )
+        missing = [c for c in _REQUIRED_ZASSET_COLUMNS if c not in zasset_columns]
+        if missing:
+            raise RuntimeError(
+                f"ZASSET is missing required columns {missing}. "
+                f"The backup may be from an unsupported iOS version."
+            )
+
+    select = [
+        f"ZASSET.{column}" if column in zasset_columns else f"NULL AS {column}"
+        for column in ZASSET_COLUMNS
+    ]
+    if has_original_filename:
+        select.append("ZADDITIONALASSETATTRIBUTES.ZORIGINALFILENAME")
+        join = """
+        LEFT JOIN ZADDITIONALASSETATTRIBUTES
+            ON ZADDITIONALASSETATTRIBUTES.ZASSET = ZASSET.Z_PK"""
+    else:
+        select.append("NULL AS ZORIGINALFILENAME")
+        join = ""
+    select.extend(_code_columns(zasset_columns))
+
+    columns = ",\n            ".join(select)
+    return f"""
+        SELECT
+            {columns}
+        FROM ZASSET{join}
         """
+
+
+def _memberships_query(join_table: str, album_fk: str, asset_fk: str) -> str:
+    """Returns the asset-to-album mapping query for the given join table."""
+    return f"""
         SELECT
-            ZASSET.ZUUID,
-            ZASSET.Z_PK,
-            ZASSET.ZFILENAME,
-            ZASSET.ZDIRECTORY,
-            ZASSET.ZUNIFORMTYPEIDENTIFIER,
-            ZASSET.ZDATECREATED,
-            ZASSET.ZMODIFICATIONDATE,
-            ZASSET.ZKIND,
-            ZASSET.ZKINDSUBTYPE,
-            ZASSET.ZFAVORITE,
-            ZASSET.ZHIDDEN,
-            ZASSET.ZTRASHEDSTATE,
-            ZASSET.ZAVALANCHEUUID,
-            ZASSET.ZAVALANCHEPICKTYPE,
-            ZASSET.ZMEDIAGROUPUUID,
-            ZASSET.ZDERIVEDCAMERACAPTUREDEVICE,
-            ZADDITIONALASSETATTRIBUTES.ZORIGINALFILENAME
-        FROM ZASSET
-        LEFT JOIN ZADDITIONALASSETATTRIBUTES
-            ON ZADDITIONALASSETATTRIBUTES.ZASSET = ZASSET.Z_PK
+            {join_table}.{asset_fk} AS asset_pk,
+            ZGENERICALBUM.ZUUID AS album_uuid
+        FROM {join_table}
+        JOIN ZGENERICALBUM
+            ON ZGENERICALBUM.Z_PK = {join_table}.{album_fk}
+        WHERE ZGENERICALBUM.ZKIND = 2
+            AND {join_table}.{asset_fk} IS NOT NULL
+            AND ZGENERICALBUM.ZUUID IS NOT NULL
         """
-    )
+
+
+def get_assets(
+    conn: sqlite3.Connection,
+    profile: Optional[SchemaProfile] = None,
+) -> List[dict]:
+    """Returns all assets from ZASSET joined with ZADDITIONALASSETATTRIBUTES.
+
+    The query is generated from profile when one is given.
+    """
+    rows = execute_query(conn, build_assets_query(profile))
     return map_rows(rows)
 
 
+def iter_assets(
+    conn: sqlite3.Connection,
+    profile: Optional[SchemaProfile] = None,
+) -> Iterator[dict]:
+    """Streams the rows of get_assets one dict at a time."""
+    return iter_map_rows(iter_query(conn, build_assets_query(profile)))
+
+
+def count_assets(conn: sqlite3.Connection) -> int:
+    """Returns the number of rows get_assets would return."""
+    rows = execute_query(conn, "SELECT COUNT(*) FROM ZASSET")
+    return rows[0][0]
+
+
 def get_asset_album_memberships(
     conn: sqlite3.Connection,
     join_table: str,
@@ -55,19 +205,23 @@ def get_asset_album_memberships(
     """Returns all asset-to-album mappings from the join table."""
     rows = execute_query(
         conn,
-        f"""
-        SELECT
-            {join_table}.{asset_fk} AS asset_pk,
-            ZGENERICALBUM.ZUUID AS album_uuid
-        FROM {join_table}
-        JOIN ZGENERICALBUM
-            ON ZGENERICALBUM.Z_PK = {join_table}.{album_fk}
-        WHERE ZGENERICALBUM.ZKIND = 2
-        """
+        _memberships_query(join_table, album_fk, asset_fk)
     )
     return map_rows(rows)
 
 
+def iter_asset_album_memberships(
+    conn: sqlite3.Connection,
+    join_table: str,
+    album_fk: str,
+    asset_fk: str,
+) -> Iterator[dict]:
+    """Streams the rows of get_asset_album_memberships one dict at a time."""
+    return iter_map_rows(
+        iter_query(conn, _memberships_query(join_table, album_fk, asset_fk))
+    )
+
+
 def get_file_id_for_asset(
     conn: sqlite3.Connection,
     relative_path: str,
@@ -11,10 +11,20 @@ from functional_components.sql_cmd_facilitator.data.sqlite_connection_manager im
 )
 from functional_components.sql_cmd_facilitator.data.sql_executor import (
     execute_query,
+    iter_query,
 )
 from functional_components.sql_cmd_facilitator.data.row_mapper import (
     map_rows,
 )
+from functional_components.sql_cmd_facilitator.domain.manifest_index import (
+    ManifestIndex,
+)
+
+
+_DCIM_PREFIX = "Media/DCIM/"
+
+# Lowercased path fragments that mark sidecar files the fallback must skip
+_FALLBACK_EXCLUDED_PARTS = (".pvt", "thumbnails", "mutations", ".aae")
 
 
 def get_photos_sqlite_path(backup_root: Path) -> Path:
@@ -45,3 +55,47 @@ def get_photos_sqlite_path(backup_root: Path) -> Path:
     # Get the path to the Photos.sqlite file and return it.
     file_id = results[0]["fileID"]
     return backup_root / file_id[:2] / file_id
+
+
+def get_manifest_index(conn) -> ManifestIndex:
+    """Reads every Media/ row of the Files table into a ManifestIndex.
+
+    One table scan here replaces the per-asset path, MOV companion and
+    filename stem fallback queries in build_assets.
+    """
+    rows = iter_query(
+        conn,
+        "SELECT fileID, relativePath FROM Files WHERE relativePath LIKE 'Media/%'"
+    )
+
+    index = ManifestIndex()
+    stem_candidates = {}
+    for file_id, relative_path in rows:
+        # Keep the first row for a path, matching the per-row query
+        index.file_id_by_path.setdefault(relative_path, file_id)
+
+        # Files nested anywhere below Media/DCIM/ are indexed by basename.
+        #  Lowercased since the LIKE query this replaces ignores case.
+        if relative_path.startswith(_DCIM_PREFIX):
+            folder, _, name = relative_path[len(_DCIM_PREFIX):].rpartition("/")
+            if folder:
+                index.dcim_file_id_by_name.setdefault(name.lower(), file_id)
+
+        # Index the file under every "<stem>." prefix of its name, which is
+        #  what the fallback's LIKE '%/<stem>.%' query matched.
+        lowered = relative_path.lower()
+        if any(part in lowered for part in _FALLBACK_EXCLUDED_PARTS):
+            continue
+        name = lowered.rpartition("/")[2]
+        dot = name.find(".")
+        while dot != -1:
+            stem_candidates.setdefault(name[:dot], []).append(
+                (len(relative_path), file_id)
+            )
+            dot = name.find(".", dot + 1)
+
+    # Shortest path first, like the fallback query's ORDER BY
+    for stem, candidates in stem_candidates.items():
+        candidates.sort(key=lambda candidate: candidate[0])
+        index.file_ids_by_stem[stem] = [file_id for _, file_id in candidates]
+    return index
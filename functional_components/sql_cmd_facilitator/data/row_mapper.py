@@ -5,7 +5,7 @@ Description: Converts raw SQLite rows into plain Python dicts.
 """
 
 import sqlite3
-from typing import List
+from typing import Iterable, Iterator, List
 
 
 def map_rows(rows: List[sqlite3.Row]) -> List[dict]:
@@ -18,3 +18,15 @@ def map_rows(rows: List[sqlite3.Row]) -> List[dict]:
         A list of dicts where each key is a column name.
     """
     return [dict(row) for row in rows]
+
+def iter_map_rows(rows: Iterable[sqlite3.Row]) -> Iterator[dict]:
+    """Lazily converts sqlite3.Row objects into plain dicts, one at a time.
+
+    Args:
+        rows: Raw rows yielded by sql_executor.iter_query.
+
+    Yields:
+        A dict per row where each key is a column name.
+    """
+    for row in rows:
+        yield dict(row)
@@ -5,7 +5,11 @@ Description: Executes SQL queries against an open SQLite connection.
 """
 
 import sqlite3
-from typing import List
+from typing import Iterator, List
+
+
+# Rows pulled from SQLite per fetchmany call when streaming results
+DEFAULT_BATCH_SIZE = 2000
 
 
 def execute_query(conn: sqlite3.Connection, query: str, params: tuple = ()) -> List[sqlite3.Row]:
@@ -25,4 +29,44 @@ def execute_query(conn: sqlite3.Connection, query: str, params: tuple = ()) -> L
         return cursor.fetchall()
     except sqlite3.OperationalError as e:
         raise RuntimeError(f"Query failed: {e}\nQuery was: {query}")
-        
\ No newline at end of file
+
+def _fetch_batches(cursor: sqlite3.Cursor, query: str, batch_size: int) -> Iterator:
+    """Yields every remaining row of an executed cursor, batch by batch."""
+    try:
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield from batch
+    except sqlite3.OperationalError as e:
+        raise RuntimeError(f"Query failed: {e}\nQuery was: {query}")
+    finally:
+        cursor.close()
+
+def iter_query(
+    conn: sqlite3.Connection,
+    query: str,
+    params: tuple = (),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[sqlite3.Row]:
+    """Executes a SQL query and yields its rows without loading them all.
+
+    Rows are pulled with fetchmany, so at most batch_size rows are held
+    in memory at once. The query runs when iteration starts.
+
+    Args:
+        conn: An open SQLite connection.
+        query: The SQL query string to execute.
+        params: Optional tuple of parameters to bind to the query.
+        batch_size: Number of rows fetched from SQLite at a time.
+
+    Yields:
+        sqlite3.Row objects (or whatever the connection's row_factory makes).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+    except sqlite3.OperationalError as e:
+        cursor.close()
+        raise RuntimeError(f"Query failed: {e}\nQuery was: {query}")
+    yield from _fetch_batches(cursor, query, batch_size)
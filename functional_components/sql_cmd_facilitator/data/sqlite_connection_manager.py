@@ -10,10 +10,38 @@ from contextlib import contextmanager
 from pathlib import Path
 
 
+# Connection modes accepted by open_db
+READ_ONLY = "ro"  # Immutable, tuned for scanning backup databases (default)
+READ_WRITE = "rw"  # Plain connection that may modify the file
+IN_MEMORY = "memory"  # Read-only snapshot copied into RAM
+
+# Tuning applied to read-only connections. Backup databases never change
+#  while we read them, so SQLite can memory-map them and skip locking.
+_MMAP_SIZE = 256 * 1024 * 1024
+_CACHE_SIZE_KIB = 64 * 1024
+
+
+def _connect_read_only(db_path: Path) -> sqlite3.Connection:
+    """Opens db_path as an immutable, read-only URI connection."""
+    uri = db_path.resolve().as_uri() + "?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True)
+
+def _apply_read_pragmas(conn: sqlite3.Connection) -> None:
+    """Tunes a connection for read-only scans and rejects any writes."""
+    conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{_CACHE_SIZE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA query_only = ON")
+
 @contextmanager
-def open_db(db_path: Path):
+def open_db(db_path: Path, mode: str = READ_ONLY):
     """Opens a SQLite database connection and closes it when done.
 
+    By default the database is opened read-only and immutable, since
+    iPhone backup files must never be modified. IN_MEMORY copies the
+    whole database into RAM first, which is faster for many random
+    lookups on slow drives. READ_WRITE opens a normal connection.
+
     Usage Example:
         with open_db(path) as conn:
             cursor = conn.cursor()
@@ -23,7 +51,23 @@ def open_db(db_path: Path):
         raise FileNotFoundError(f"Database file not found: {db_path}")
 
     # Open connection to DB
-    conn = sqlite3.connect(db_path)
+    if mode == READ_WRITE:
+        conn = sqlite3.connect(db_path)
+    elif mode == READ_ONLY:
+        conn = _connect_read_only(db_path)
+        _apply_read_pragmas(conn)
+    elif mode == IN_MEMORY:
+        source = _connect_read_only(db_path)
+        conn = sqlite3.connect(":memory:")
+        try:
+            # Copy every page of the file into the in-memory database
+            source.backup(conn)
+        finally:
+            source.close()
+        _apply_read_pragmas(conn)
+    else:
+        raise ValueError(f"Unknown database open mode: {mode}")
+
     # Make every row behave like both a tuple and a dictionary at once
     #  E.g., row["ZUUID"] and row[0] will both work.
     conn.row_factory = sqlite3.Row
@@ -31,4 +75,3 @@ def open_db(db_path: Path):
         yield conn
     finally:
         conn.close()
-        
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the AlbumMemberships object.
+"""
+
+from array import array
+
+from dataclasses import dataclass, field
+
+from typing import List, Tuple
+
+
+@dataclass
+class AlbumMemberships:
+    """The user albums of every asset, keyed by asset Z_PK.
+
+    Albums are stored as small integer indexes into album_uuids, in
+    compressed sparse row form: the albums of the asset with Z_PK pk are
+    album_indexes[offsets[pk]:offsets[pk + 1]]. UUIDs are only resolved
+    when an asset's Relationships are built.
+    """
+    # Maps album index to album UUID
+    album_uuids: List[str] = field(default_factory=list)
+
+    # Start of each Z_PK's run in album_indexes, plus a final end offset
+    offsets: array = field(default_factory=lambda: array("I", [0]))
+
+    # Album index of every membership, grouped by asset Z_PK
+    album_indexes: array = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        """Returns the number of memberships."""
+        return len(self.album_indexes)
+
+    def album_indexes_of(self, asset_pk: int) -> Tuple[int, ...]:
+        """Returns the album indexes of an asset, in membership order."""
+        if asset_pk is None or not 0 <= asset_pk < len(self.offsets) - 1:
+            return ()
+        start = self.offsets[asset_pk]
+        end = self.offsets[asset_pk + 1]
+        if start == end:
+            return ()
+        return tuple(self.album_indexes[start:end])
+
+    def uuids_of(self, album_indexes: Tuple[int, ...]) -> List[str]:
+        """Resolves album indexes to album UUIDs."""
+        return [self.album_uuids[index] for index in album_indexes]
+
+    def get(self, asset_pk: int) -> List[str]:
+        """Returns the album UUIDs of an asset."""
+        return self.uuids_of(self.album_indexes_of(asset_pk))
@@ -0,0 +1,62 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-17
+Description: Definition for the ManifestIndex object.
+"""
+
+from dataclasses import dataclass, field
+
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ManifestIndex:
+    """In-memory lookup of the Media/ rows in Manifest.db's Files table.
+
+    Built once per load so that assets can be resolved to their hashed
+    fileIDs without a Manifest.db query per asset.
+    """
+    # Maps relativePath (e.g. "Media/DCIM/100APPLE/IMG_0001.HEIC") to fileID
+    file_id_by_path: Dict[str, str] = field(default_factory=dict)
+
+    # Maps lowercased basename of files under Media/DCIM/ to fileID, used to
+    #  find live photo MOV companions regardless of their DCIM subfolder
+    dcim_file_id_by_name: Dict[str, str] = field(default_factory=dict)
+
+    # Maps lowercased filename stem to candidate fileIDs, shortest path
+    #  first, with sidecar files (.pvt, .AAE, Thumbnails, Mutations) left out
+    file_ids_by_stem: Dict[str, List[str]] = field(default_factory=dict)
+
+    def find_file_id(self, relative_path: str) -> str:
+        """Returns the fileID for an exact relative path."""
+        file_id = self.file_id_by_path.get(relative_path)
+        if file_id is None:
+            raise FileNotFoundError(
+                f"No file found in Manifest.db for path: {relative_path}"
+            )
+        return file_id
+
+    def find_mov_companion(self, mov_filename: str) -> str:
+        """Returns the fileID of a live photo MOV companion under Media/DCIM/."""
+        file_id = self.dcim_file_id_by_name.get(mov_filename.lower())
+        if file_id is None:
+            raise FileNotFoundError(f"No MOV companion found for: {mov_filename}")
+        return file_id
+
+    def find_fallback(
+        self,
+        original_filename: str,
+        zfilename: Optional[str] = None,
+    ) -> str:
+        """Returns the best fileID by filename stem when the path lookup fails."""
+        candidates = []
+        if zfilename:
+            candidates.append(zfilename.rsplit(".", 1)[0])
+        candidates.append(original_filename.rsplit(".", 1)[0])
+
+        for stem in candidates:
+            file_ids = self.file_ids_by_stem.get(stem.lower())
+            if file_ids:
+                return file_ids[0]
+
+        raise FileNotFoundError(f"No fallback match found for: {original_filename}")
@@ -0,0 +1,39 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Definition for the SchemaProfile object.
+"""
+
+from dataclasses import dataclass
+
+from typing import FrozenSet
+
+
+@dataclass(frozen=True)
+class SchemaProfile:
+    """The parts of a Photos.sqlite schema that vary across iOS versions.
+
+    Profiles are keyed by fingerprint, a hash of the schema SQL in
+    sqlite_master, so backups of the same iOS version share one profile.
+    """
+    fingerprint: str
+
+    # Album-to-asset join table (e.g. "Z_33ASSETS") and its columns
+    join_table: str
+    album_fk: str
+    asset_fk: str
+    sort_col: str
+
+    # Columns present in ZASSET and ZADDITIONALASSETATTRIBUTES; the latter
+    #  is empty if the table does not exist
+    zasset_columns: FrozenSet[str]
+    additional_attribute_columns: FrozenSet[str]
+
+    @property
+    def join_cols(self) -> dict:
+        """The join table columns, as returned by find_join_table_columns."""
+        return {
+            "album_fk": self.album_fk,
+            "asset_fk": self.asset_fk,
+            "sort_col": self.sort_col,
+        }
@@ -11,6 +11,8 @@ warnings.filterwarnings("ignore", message=".*chardet.*")
 warnings.filterwarnings("ignore", message=".*charset_normalizer.*")
 warnings.filterwarnings("ignore", message=".*character detection.*")
 
+import multiprocessing
+
 import sys
 
 from cli_components.main_menu import main as cli_main
@@ -64,6 +66,9 @@ def launch_prompt():
 
 
 if __name__ == "__main__":
+    # Exports convert media in worker processes, which PyInstaller builds
+    #  can only start after this call
+    multiprocessing.freeze_support()
     try:
         print(
             f"\033[33m"
@@ -0,0 +1,414 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-18
+Description: Writes synthetic iPhone backups for benchmarks and large tests.
+
+The backup has the files iExtract reads from a real one: Info.plist,
+Manifest.plist, a Manifest.db Files table, hashed files in the
+backup_root/xx/ shard directories, and a Photos.sqlite with ZASSET,
+ZADDITIONALASSETATTRIBUTES, ZGENERICALBUM and a Z_33ASSETS join table.
+Asset count, album count, burst and live photo ratios, and the share of
+missing or iCloud-only files are configurable, and the same seed always
+writes the same backup.
+
+Run from the repository root to write a backup and time loading and
+exporting it:
+
+    python -m tests.synthetic_backup OUTPUT_DIR --assets 100000 --benchmark
+"""
+
+import argparse
+import hashlib
+import plistlib
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+
+# Apple epoch seconds of 2015-01-01 and 2025-01-01, the range of creation dates
+_FIRST_CREATION_TIME = 441763200.0
+_LAST_CREATION_TIME = 757382400.0
+
+# Files per DCIM folder, like the camera's 100APPLE, 101APPLE, ...
+_FILES_PER_FOLDER = 1000
+
+_PHOTOS_SQLITE_PATH = "Media/PhotoData/Photos.sqlite"
+
+# Join table of the iOS 17 schema
+_JOIN_TABLE = "Z_33ASSETS"
+_ALBUM_FK = "Z_33ALBUMS"
+_ASSET_FK = "Z_3ASSETS"
+_SORT_COL = "Z_FOK_3ASSETS"
+
+
+@dataclass
+class SyntheticBackupSpec:
+    """What to put in a synthetic backup. Ratios are shares of all assets."""
+    asset_count: int = 1000
+    album_count: int = 20
+
+    # Average number of user albums each asset is in
+    albums_per_asset: float = 0.5
+
+    video_ratio: float = 0.1
+    live_photo_ratio: float = 0.2
+    burst_ratio: float = 0.05
+    burst_size: int = 5
+    favorite_ratio: float = 0.05
+    hidden_ratio: float = 0.01
+    selfie_ratio: float = 0.05
+
+    # Assets listed in Manifest.db whose file was not written to the backup
+    missing_file_ratio: float = 0.0
+
+    # Assets not in Manifest.db at all, like iCloud-only originals
+    icloud_ratio: float = 0.0
+
+    # Size in bytes of every asset file written
+    file_size: int = 1024
+
+    seed: int = 0
+
+
+@dataclass
+class SyntheticBackupSummary:
+    """What a synthetic backup holds, to check a load against."""
+    backup_root: Path
+    asset_rows: int = 0
+    album_count: int = 0
+    album_memberships: int = 0
+    live_photo_companions: int = 0
+    burst_groups: int = 0
+    missing_files: int = 0
+    icloud_assets: int = 0
+    files_written: int = 0
+
+    # UUIDs of the assets whose file is missing from the shard directories
+    missing_asset_uuids: list = field(default_factory=list)
+
+    @property
+    def expected_model_assets(self) -> int:
+        """The number of assets build_backup_model should return."""
+        return self.asset_rows - self.icloud_assets + self.live_photo_companions
+
+
+def _file_id(relative_path: str) -> str:
+    """Hashes a path into a fileID the way iOS backups do."""
+    return hashlib.sha1(f"CameraRollDomain-{relative_path}".encode("utf-8")).hexdigest()
+
+def _write_plists(backup_root: Path, rng: random.Random) -> None:
+    """Writes Info.plist and an unencrypted Manifest.plist."""
+    info = {
+        "Device Name": "Synthetic iPhone",
+        "Product Type": "iPhone15,2",
+        "Product Version": "17.0",
+        "GUID": uuid.UUID(int=rng.getrandbits(128)).hex.upper(),
+        "Last Backup Date": datetime(2026, 1, 1, 12, 0, 0),
+    }
+    with (backup_root / "Info.plist").open("wb") as f:
+        plistlib.dump(info, f)
+    with (backup_root / "Manifest.plist").open("wb") as f:
+        plistlib.dump({"IsEncrypted": False}, f)
+
+def _create_photos_schema(conn: sqlite3.Connection) -> None:
+    """Creates the Photos.sqlite tables the loader reads."""
+    conn.execute(
+        "CREATE TABLE ZASSET ("
+        "Z_PK INTEGER PRIMARY KEY, ZUUID TEXT, ZFILENAME TEXT, "
+        "ZDIRECTORY TEXT, ZDATECREATED REAL, ZMODIFICATIONDATE REAL, "
+        "ZKIND INTEGER, ZKINDSUBTYPE INTEGER, ZFAVORITE INTEGER, "
+        "ZHIDDEN INTEGER, ZTRASHEDSTATE INTEGER, ZAVALANCHEUUID TEXT, "
+        "ZAVALANCHEPICKTYPE INTEGER, ZMEDIAGROUPUUID TEXT, "
+        "ZUNIFORMTYPEIDENTIFIER TEXT, ZDERIVEDCAMERACAPTUREDEVICE INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE ZADDITIONALASSETATTRIBUTES ("
+        "Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, ZORIGINALFILENAME TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE ZGENERICALBUM ("
+        "Z_PK INTEGER PRIMARY KEY, ZUUID TEXT, ZTITLE TEXT, "
+        "ZKIND INTEGER, ZCUSTOMSORTKEY REAL, ZCUSTOMSORTASCENDING INTEGER, "
+        "ZCACHEDCOUNT INTEGER)"
+    )
+    conn.execute(
+        f"CREATE TABLE {_JOIN_TABLE} ("
+        f"{_ALBUM_FK} INTEGER, {_ASSET_FK} INTEGER, {_SORT_COL} INTEGER)"
+    )
+
+def _create_manifest_schema(conn: sqlite3.Connection) -> None:
+    """Creates Manifest.db's Files table and its indexes."""
+    conn.execute(
+        "CREATE TABLE Files (fileID TEXT PRIMARY KEY, domain TEXT, "
+        "relativePath TEXT, flags INTEGER, file BLOB)"
+    )
+    conn.execute("CREATE INDEX FilesDomainIdx ON Files(domain)")
+    conn.execute("CREATE INDEX FilesRelativePathIdx ON Files(relativePath)")
+
+def _write_file(backup_root: Path, file_id: str, payload: bytes) -> None:
+    """Writes a hashed file into its shard directory."""
+    (backup_root / file_id[:2] / file_id).write_bytes(payload)
+
+def write_synthetic_backup(
+    backup_root: Path,
+    spec: SyntheticBackupSpec = SyntheticBackupSpec(),
+) -> SyntheticBackupSummary:
+    """Writes a synthetic backup described by spec into backup_root.
+
+    Bursts, live photos and videos are assigned to asset rows in that
+    order of precedence. Live photos get a MOV companion in Manifest.db
+    but no ZASSET row of their own, like on iOS 26.
+    """
+    rng = random.Random(spec.seed)
+    backup_root.mkdir(parents=True, exist_ok=True)
+    for index in range(256):
+        (backup_root / f"{index:02x}").mkdir(exist_ok=True)
+    payload = b"\0" * spec.file_size
+
+    summary = SyntheticBackupSummary(
+        backup_root=backup_root,
+        asset_rows=spec.asset_count,
+        album_count=spec.album_count,
+    )
+    _write_plists(backup_root, rng)
+
+    asset_rows = []
+    attribute_rows = []
+    manifest_rows = [(
+        _file_id(_PHOTOS_SQLITE_PATH), "CameraRollDomain", _PHOTOS_SQLITE_PATH, 1, None
+    )]
+    files = []
+
+    # Bursts are runs of burst_size consecutive assets
+    burst_frames = int(spec.asset_count * spec.burst_ratio)
+    burst_frames -= burst_frames % max(spec.burst_size, 1)
+    burst_uuid = None
+
+    for pk in range(1, spec.asset_count + 1):
+        asset_uuid = str(uuid.UUID(int=rng.getrandbits(128))).upper()
+        directory = f"DCIM/{100 + (pk - 1) // _FILES_PER_FOLDER}APPLE"
+        stem = f"IMG_{pk:04d}"
+
+        kind, subtype, media_group = 0, 0, None
+        avalanche_uuid, pick_type = None, None
+        if pk <= burst_frames:
+            if (pk - 1) % spec.burst_size == 0:
+                burst_uuid = str(uuid.UUID(int=rng.getrandbits(128))).upper()
+                summary.burst_groups += 1
+                pick_type = 2
+            else:
+                pick_type = 0
+            avalanche_uuid = burst_uuid
+        elif rng.random() < spec.live_photo_ratio:
+            subtype = 2
+            media_group = str(uuid.UUID(int=rng.getrandbits(128))).upper()
+        elif rng.random() < spec.video_ratio:
+            kind = 1
+
+        if kind == 1:
+            filename, uti = f"{stem}.MOV", "com.apple.quicktime-movie"
+        else:
+            filename, uti = f"{stem}.HEIC", "public.heic"
+
+        created = rng.uniform(_FIRST_CREATION_TIME, _LAST_CREATION_TIME)
+        asset_rows.append((
+            pk, asset_uuid, filename, directory, created, created + rng.uniform(0, 86400),
+            kind, subtype,
+            int(rng.random() < spec.favorite_ratio),
+            int(rng.random() < spec.hidden_ratio),
+            0,
+            avalanche_uuid, pick_type, media_group, uti,
+            1 if rng.random() < spec.selfie_ratio else 0,
+        ))
+        attribute_rows.append((pk, pk, filename))
+
+        # iCloud-only assets have no file in the backup at all
+        if rng.random() < spec.icloud_ratio:
+            summary.icloud_assets += 1
+            continue
+
+        relative_path = f"Media/{directory}/{filename}"
+        file_id = _file_id(relative_path)
+        manifest_rows.append((file_id, "CameraRollDomain", relative_path, 1, None))
+        if rng.random() < spec.missing_file_ratio:
+            summary.missing_files += 1
+            summary.missing_asset_uuids.append(asset_uuid)
+        else:
+            files.append(file_id)
+
+        if media_group is not None:
+            mov_path = f"Media/{directory}/{stem}.MOV"
+            mov_id = _file_id(mov_path)
+            manifest_rows.append((mov_id, "CameraRollDomain", mov_path, 1, None))
+            files.append(mov_id)
+            summary.live_photo_companions += 1
+
+    # Albums, and each asset's memberships in album order
+    album_rows = [
+        (
+            album_pk,
+            str(uuid.UUID(int=rng.getrandbits(128))).upper(),
+            f"Album {album_pk:04d}",
+            2,
+            None,
+            rng.choice((0, 1)),
+            0,
+        )
+        for album_pk in range(1, spec.album_count + 1)
+    ]
+    membership_rows = []
+    if spec.album_count:
+        positions = [0] * (spec.album_count + 1)
+        max_albums = min(spec.album_count, max(1, round(spec.albums_per_asset * 2)))
+        for pk in range(1, spec.asset_count + 1):
+            album_total = sum(
+                1 for _ in range(max_albums)
+                if rng.random() < spec.albums_per_asset / max_albums
+            )
+            for album_pk in rng.sample(range(1, spec.album_count + 1), album_total):
+                positions[album_pk] += 1
+                membership_rows.append((album_pk, pk, positions[album_pk]))
+    summary.album_memberships = len(membership_rows)
+
+    # Photos.sqlite is itself a hashed file of the backup
+    photos_path = backup_root / manifest_rows[0][0][:2] / manifest_rows[0][0]
+    photos_conn = sqlite3.connect(photos_path)
+    try:
+        _create_photos_schema(photos_conn)
+        photos_conn.executemany(
+            f"INSERT INTO ZASSET VALUES ({', '.join('?' * 16)})", asset_rows
+        )
+        photos_conn.executemany(
+            "INSERT INTO ZADDITIONALASSETATTRIBUTES VALUES (?, ?, ?)", attribute_rows
+        )
+        photos_conn.executemany(
+            "INSERT INTO ZGENERICALBUM VALUES (?, ?, ?, ?, ?, ?, ?)", album_rows
+        )
+        photos_conn.executemany(
+            f"INSERT INTO {_JOIN_TABLE} VALUES (?, ?, ?)", membership_rows
+        )
+        photos_conn.commit()
+    finally:
+        photos_conn.close()
+
+    manifest_conn = sqlite3.connect(backup_root / "Manifest.db")
+    try:
+        _create_manifest_schema(manifest_conn)
+        manifest_conn.executemany(
+            "INSERT INTO Files VALUES (?, ?, ?, ?, ?)", manifest_rows
+        )
+        manifest_conn.commit()
+    finally:
+        manifest_conn.close()
+
+    for file_id in files:
+        _write_file(backup_root, file_id, payload)
+    summary.files_written = len(files)
+    return summary
+
+
+def _run_benchmark(backup_root: Path, export: bool) -> None:
+    """Times a full load of backup_root and, if asked, an export of it."""
+    from functional_components.backup_locator_and_validator.app.backup_model_builder import (
+        load_backup_model,
+    )
+
+    # A fresh cache directory, so the load is never served from the cache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        result = load_backup_model(backup_root, cache_dir=Path(cache_dir))
+        print(f"load_backup_model: {time.perf_counter() - start:.2f} s")
+    if not result.success:
+        print(f"Load failed: {result.error}")
+        return
+    print(f"Assets loaded: {len(result.backup_model.assets)}")
+    print(f"Missing files: {result.file_report.missing_assets}")
+    for phase, seconds in result.load_stats.phase_seconds.items():
+        print(f"  {phase}: {seconds:.3f} s")
+
+    if not export:
+        return
+    if result.file_report.missing_assets:
+        print("Export skipped: copying a missing file stops the export")
+        return
+
+    from functional_components.file_extraction_engine.app.extract_files import (
+        run_extraction_engine,
+    )
+    from functional_components.file_extraction_engine.domain.blacklist import (
+        Blacklist,
+    )
+
+    class _Progress:
+        percent = 0
+
+        def add_log(self, message):
+            pass
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        run_extraction_engine(
+            backup_model=result.backup_model,
+            blacklist=Blacklist(current_list=[]),
+            output_root=Path(output_dir),
+            os_supports_symlinks=False,
+            user_set_symlinks=False,
+            convert_type_dict={},
+            progress=_Progress(),
+        )
+        print(f"run_extraction_engine: {time.perf_counter() - start:.2f} s")
+
+def main(argv=None) -> None:
+    """Writes a synthetic backup from command line options."""
+    defaults = SyntheticBackupSpec()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("backup_root", type=Path)
+    parser.add_argument("--assets", type=int, default=defaults.asset_count)
+    parser.add_argument("--albums", type=int, default=defaults.album_count)
+    parser.add_argument("--albums-per-asset", type=float, default=defaults.albums_per_asset)
+    parser.add_argument("--video-ratio", type=float, default=defaults.video_ratio)
+    parser.add_argument("--live-ratio", type=float, default=defaults.live_photo_ratio)
+    parser.add_argument("--burst-ratio", type=float, default=defaults.burst_ratio)
+    parser.add_argument("--missing-ratio", type=float, default=defaults.missing_file_ratio)
+    parser.add_argument("--icloud-ratio", type=float, default=defaults.icloud_ratio)
+    parser.add_argument("--file-size", type=int, default=defaults.file_size)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--benchmark", action="store_true", help="time loading the backup"
+    )
+    parser.add_argument(
+        "--export", action="store_true", help="with --benchmark, also time an export"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = write_synthetic_backup(args.backup_root, SyntheticBackupSpec(
+        asset_count=args.assets,
+        album_count=args.albums,
+        albums_per_asset=args.albums_per_asset,
+        video_ratio=args.video_ratio,
+        live_photo_ratio=args.live_ratio,
+        burst_ratio=args.burst_ratio,
+        missing_file_ratio=args.missing_ratio,
+        icloud_ratio=args.icloud_ratio,
+        file_size=args.file_size,
+        seed=args.seed,
+    ))
+    print(
+        f"Wrote {summary.asset_rows} assets ({summary.files_written} files, "
+        f"{summary.missing_files} missing, {summary.icloud_assets} iCloud-only) "
+        f"to {summary.backup_root} in {time.perf_counter() - start:.2f} s"
+    )
+
+    if args.benchmark:
+        _run_benchmark(args.backup_root, args.export)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,40 @@ Date: 2026-02-23
 Description: Tests the process to build the BackupModel.
 """
 
+import queue
+import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from functional_components.backup_locator_and_validator.app.backup_model_builder import (
+    _drain_assets,
+    _prefetch_assets,
     build_device,
     build_backup_model,
 )
+from functional_components.backup_locator_and_validator.data.backup_shard_scanner import (
+    list_shard,
+)
+from functional_components.backup_locator_and_validator.app.backup_file_validator import (
+    prevalidate_backup_files,
+)
 from functional_components.backup_locator_and_validator.domain.backup_model import (
+    AssetRecord,
+    BackupModel,
+    Flags,
+    Relationships,
     SourceDevice,
 )
+from functional_components.backup_locator_and_validator.domain.load_stats import (
+    LoadStats,
+)
+from functional_components.sql_cmd_facilitator.domain.schema_profile import (
+    SchemaProfile,
+)
 
 
 MOCK_RAW_INFO = {
@@ -26,6 +48,16 @@ MOCK_RAW_INFO = {
     "Last Backup Date": datetime(2026, 1, 21, 11, 38, 37),
 }
 
+FAKE_SCHEMA_PROFILE = SchemaProfile(
+    fingerprint="fake",
+    join_table="Z_33ASSETS",
+    album_fk="Z_33ALBUMS",
+    asset_fk="Z_3ASSETS",
+    sort_col="Z_FOK_3ASSETS",
+    zasset_columns=frozenset({"Z_PK", "ZUUID"}),
+    additional_attribute_columns=frozenset(),
+)
+
 
 class TestBuildDevice(unittest.TestCase):
 
@@ -54,31 +86,31 @@ class TestBuildBackupModel(unittest.TestCase):
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.build_membership_lookup"
+        ".backup_model_builder.get_manifest_index"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.get_asset_album_memberships"
+        ".backup_model_builder.build_membership_lookup"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.get_assets"
+        ".backup_model_builder.iter_asset_album_memberships"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.build_albums"
+        ".backup_model_builder.iter_assets"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.get_albums"
+        ".backup_model_builder.build_albums"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.find_join_table_columns"
+        ".backup_model_builder.iter_albums"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
-        ".backup_model_builder.find_album_asset_join_table"
+        ".backup_model_builder.get_schema_profile"
     )
     @patch(
         "functional_components.backup_locator_and_validator.app"
@@ -102,13 +134,13 @@ class TestBuildBackupModel(unittest.TestCase):
         mock_get_encryption_status,
         mock_get_photos_sqlite_path,
         mock_open_db,
-        mock_find_join_table,
-        mock_find_join_cols,
-        mock_get_albums,
+        mock_get_schema_profile,
+        mock_iter_albums,
         mock_build_albums,
-        mock_get_assets,
-        mock_get_asset_album_memberships,
+        mock_iter_assets,
+        mock_iter_asset_album_memberships,
         mock_build_membership_lookup,
+        mock_get_manifest_index,
         mock_build_assets,
     ):
         mock_get_device_info.return_value = MOCK_RAW_INFO
@@ -116,16 +148,11 @@ class TestBuildBackupModel(unittest.TestCase):
         mock_get_photos_sqlite_path.return_value = Path("fake/Photos.sqlite")
         mock_open_db.return_value.__enter__ = lambda s: s
         mock_open_db.return_value.__exit__ = lambda s, *a: False
-        mock_find_join_table.return_value = "Z_33ASSETS"
-        mock_find_join_cols.return_value = {
-            "album_fk": "Z_33ALBUMS",
-            "asset_fk": "Z_3ASSETS",
-            "sort_col": "Z_FOK_3ASSETS",
-        }
-        mock_get_albums.return_value = []
+        mock_get_schema_profile.return_value = FAKE_SCHEMA_PROFILE
+        mock_iter_albums.return_value = iter([])
         mock_build_albums.return_value = []
-        mock_get_assets.return_value = []
-        mock_get_asset_album_memberships.return_value = []
+        mock_iter_assets.return_value = iter([])
+        mock_iter_asset_album_memberships.return_value = iter([])
         mock_build_membership_lookup.return_value = {}
         mock_build_assets.return_value = ([], 0)
 
@@ -210,5 +237,171 @@ class TestBuildBackupModel(unittest.TestCase):
         self.assertIn("Manifest.plist not found", result.error)
 
 
+class TestPrefetchAssets(unittest.TestCase):
+
+    def setUp(self):
+        open_db_patcher = patch(
+            "functional_components.backup_locator_and_validator.app"
+            ".backup_model_builder.open_db"
+        )
+        mock_open_db = open_db_patcher.start()
+        self.addCleanup(open_db_patcher.stop)
+        mock_open_db.return_value.__enter__ = lambda s: s
+        mock_open_db.return_value.__exit__ = lambda s, *a: False
+
+    def _run(self, rows):
+        row_queue = queue.Queue(maxsize=2)
+        with patch(
+            "functional_components.backup_locator_and_validator.app"
+            ".backup_model_builder.iter_assets",
+            MagicMock(return_value=rows),
+        ):
+            producer = threading.Thread(
+                target=_prefetch_assets,
+                args=(
+                    Path("fake/Photos.sqlite"),
+                    FAKE_SCHEMA_PROFILE,
+                    row_queue,
+                    threading.Event(),
+                ),
+            )
+            producer.start()
+            try:
+                return list(_drain_assets(row_queue))
+            finally:
+                producer.join(timeout=5)
+
+    def test_rows_arrive_in_order(self):
+        rows = [{"Z_PK": pk} for pk in range(5000)]
+
+        self.assertEqual(self._run(iter(rows)), rows)
+
+    def test_read_error_is_raised_to_consumer(self):
+        def failing_rows():
+            yield {"Z_PK": 1}
+            raise RuntimeError("Query failed: disk I/O error")
+
+        with self.assertRaises(RuntimeError):
+            self._run(failing_rows())
+
+    def test_scan_recorded_before_consumer_is_released(self):
+        """Stats are complete once the consumer has taken the last item."""
+
+        class SlowQueue(queue.Queue):
+            # Holds the producer back after each put, as a preemption would
+            def put(self, item, block=True, timeout=None):
+                super().put(item, block, timeout)
+                time.sleep(0.2)
+
+        def failing_rows():
+            yield {"Z_PK": 1}
+            raise RuntimeError("Query failed: disk I/O error")
+
+        for rows in (iter([{"Z_PK": 1}]), failing_rows()):
+            stats = LoadStats()
+            row_queue = SlowQueue(maxsize=2)
+            with patch(
+                "functional_components.backup_locator_and_validator.app"
+                ".backup_model_builder.iter_assets",
+                MagicMock(return_value=rows),
+            ):
+                producer = threading.Thread(
+                    target=_prefetch_assets,
+                    args=(
+                        Path("fake/Photos.sqlite"),
+                        FAKE_SCHEMA_PROFILE,
+                        row_queue,
+                        threading.Event(),
+                        stats,
+                    ),
+                )
+                producer.start()
+                try:
+                    list(_drain_assets(row_queue))
+                except RuntimeError:
+                    pass  # The read error, raised once the consumer takes it
+                self.assertIn("asset_scan", stats.phase_seconds)
+                self.assertIn("asset_rows", stats.counters)
+                producer.join(timeout=5)
+
+
+class TestPrevalidateBackupFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backup_root = Path(self.temp_dir.name)
+        self.present_id = "ab" + "1" * 38
+        (self.backup_root / "ab").mkdir()
+        (self.backup_root / "ab" / self.present_id).write_bytes(b"x" * 10)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _make_model(self, *file_ids):
+        assets = [
+            AssetRecord(
+                asset_uuid=f"uuid-{i}",
+                local_identifier=f"uuid-{i}",
+                original_filename="IMG.HEIC",
+                file_extension="HEIC",
+                uti_type="public.heic",
+                timezone_offset="",
+                backup_relative_path=str(self.backup_root / file_id[:2] / file_id),
+                backup_hashed_filename=file_id,
+                media_type="photo",
+                subtype="standard",
+                flags=Flags(),
+                relationships=Relationships(),
+            )
+            for i, file_id in enumerate(file_ids)
+        ]
+        return BackupModel.model_construct(assets=assets, albums=[])
+
+    def test_sizes_and_missing_files_are_recorded(self):
+        missing_id = "cd" + "2" * 38
+        model = self._make_model(self.present_id, missing_id)
+
+        report = prevalidate_backup_files(model, self.backup_root)
+
+        self.assertEqual(model.assets[0].file_size, 10)
+        self.assertIsNone(model.assets[1].file_size)
+        self.assertEqual(report.checked_assets, 2)
+        self.assertEqual(report.present_assets, 1)
+        self.assertEqual(report.missing_asset_uuids, ["uuid-1"])
+        self.assertEqual(report.total_bytes, 10)
+        self.assertEqual(report.shards_scanned, 1)
+
+    def test_only_asset_files_are_stat(self):
+        """Other files in a shard are skipped by name, without a stat call."""
+        asset_entry = MagicMock()
+        asset_entry.name = self.present_id
+        asset_entry.stat.return_value.st_size = 10
+        other_entry = MagicMock()
+        other_entry.name = "ab" + "9" * 38
+        listing = MagicMock()
+        listing.__enter__.return_value = iter([other_entry, asset_entry])
+
+        with patch(
+            "functional_components.backup_locator_and_validator.data"
+            ".backup_shard_scanner.os.scandir",
+            return_value=listing,
+        ):
+            sizes = list_shard(self.backup_root / "ab", frozenset({self.present_id}))
+
+        self.assertEqual(sizes, {self.present_id: 10})
+        other_entry.stat.assert_not_called()
+        other_entry.is_file.assert_not_called()
+
+    def test_no_file_is_stat_per_asset(self):
+        model = self._make_model(self.present_id)
+
+        with patch("pathlib.Path.stat") as mock_stat, \
+                patch("pathlib.Path.exists") as mock_exists:
+            prevalidate_backup_files(model, self.backup_root)
+
+        mock_stat.assert_not_called()
+        mock_exists.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -4,10 +4,18 @@ Date: 2026-02-24
 Description: Tests the process to build the BackupModel.
 """
 
+import os
 import unittest 
+from datetime import datetime
+from types import SimpleNamespace
 from pydantic import ValidationError
+from functional_components.backup_locator_and_validator.domain.asset_columns import (
+    AssetColumns,
+)
 from functional_components.backup_locator_and_validator.domain.backup_model import (
     Asset,
+    AssetRecord,
+    as_asset,
     Flags,
     Relationships,
     BackupMetadata,
@@ -101,5 +109,158 @@ class TestBackupModel(unittest.TestCase):
         self.assertEqual(backup.backup_metadata.source_device.model, "iPhone 13")
 
 
+class TestAssetRecord(unittest.TestCase):
+    def _make_record(self, **overrides):
+        fields = dict(
+            asset_uuid="123",
+            local_identifier="ABC",
+            original_filename="IMG_0001.JPG",
+            file_extension="JPG",
+            uti_type="public.jpeg",
+            creation_date="2024-01-01T12:00:00",
+            modification_date="2024-01-01T12:00:00",
+            timezone_offset="+00:00",
+            backup_relative_path="Media/DCIM/100APPLE",
+            backup_hashed_filename="hash.jpg",
+            media_type="photo",
+            subtype="standard",
+            flags=Flags(),
+            relationships=Relationships(),
+        )
+        fields.update(overrides)
+        return AssetRecord(**fields)
+
+    def test_record_converts_to_equal_asset(self):
+        record = self._make_record()
+        asset = as_asset(record)
+
+        self.assertIsInstance(asset, Asset)
+        self.assertEqual(record, asset)
+
+    def test_invalid_record_fails_at_boundary(self):
+        """Records skip validation until converted to an Asset."""
+        record = self._make_record(media_type="audio")  # invalid
+
+        with self.assertRaises(ValidationError):
+            record.to_asset()
+
+    def test_model_copy_updates_field(self):
+        record = self._make_record()
+        copy = record.model_copy(update={"backup_relative_path": "/tmp/x.png"})
+
+        self.assertEqual(copy.backup_relative_path, "/tmp/x.png")
+        self.assertEqual(record.backup_relative_path, "Media/DCIM/100APPLE")
+
+    def test_record_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self._make_record(), "__dict__"))
+
+    def test_dates_are_formatted_from_raw_times(self):
+        record = self._make_record(
+            creation_date=None,
+            modification_date=None,
+            creation_time=0.0,
+            modification_time=86400.0,
+        )
+
+        self.assertEqual(record.creation_date, "2001-01-01T00:00:00+00:00")
+        self.assertEqual(record.modification_date, "2001-01-02T00:00:00+00:00")
+        self.assertEqual(record.to_asset().modification_time, 86400.0)
+
+    def test_path_is_derived_from_shared_root(self):
+        record = self._make_record(
+            backup_relative_path=None,
+            backup_root=os.path.join("backups", "device"),
+            backup_hashed_filename="ab" + "1" * 38,
+        )
+
+        self.assertEqual(
+            record.backup_relative_path,
+            os.path.join("backups", "device", "ab", "ab" + "1" * 38),
+        )
+
+        converted = record.model_copy(update={"backup_relative_path": "/tmp/x.png"})
+        renamed = record.model_copy(update={"backup_hashed_filename": "cd" + "2" * 38})
+
+        self.assertEqual(converted.backup_relative_path, "/tmp/x.png")
+        self.assertEqual(
+            renamed.backup_relative_path,
+            os.path.join("backups", "device", "cd", "cd" + "2" * 38),
+        )
+
+    def test_model_copy_reformats_changed_time(self):
+        record = self._make_record(creation_date=None, creation_time=0.0)
+        self.assertEqual(record.creation_date, "2001-01-01T00:00:00+00:00")
+
+        copy = record.model_copy(update={"creation_time": 86400.0})
+
+        self.assertEqual(copy.creation_date, "2001-01-02T00:00:00+00:00")
+
+
+class TestAssetColumns(unittest.TestCase):
+    def setUp(self):
+        def record(uuid, created, media_type="photo", albums=(), smart=(), **extra):
+            return AssetRecord(
+                asset_uuid=uuid,
+                local_identifier=uuid,
+                original_filename=f"{uuid}.JPG",
+                file_extension="JPG",
+                uti_type="public.jpeg",
+                creation_date=created,
+                modification_date=created,
+                timezone_offset="+00:00",
+                backup_relative_path=f"/backup/{uuid}",
+                backup_hashed_filename=uuid,
+                media_type=media_type,
+                subtype=extra.pop("subtype", "standard"),
+                flags=Flags(),
+                relationships=Relationships(
+                    user_albums=list(albums), smart_folders=list(smart)
+                ),
+                **extra,
+            )
+
+        self.assets = [
+            record("a", "2024-01-01T00:00:00", albums=["album-1"]),
+            record("b", "2024-06-01T00:00:00", media_type="video", smart=["favorites"]),
+            record("c", "", albums=["album-1", "album-2"], smart=["hidden"]),
+            record("d", "2025-01-01T00:00:00", subtype="burst_frame", burst_uuid="burst",
+                   albums=["album-2"]),
+            record("e", "2025-01-01T00:00:01", subtype="burst_frame", burst_uuid="burst"),
+        ]
+        albums = [
+            SimpleNamespace(album_uuid="album-1"),
+            SimpleNamespace(album_uuid="album-2"),
+        ]
+        self.columns = AssetColumns(self.assets, albums)
+
+    def test_select_without_criteria_returns_all(self):
+        self.assertEqual(list(self.columns.select()), [0, 1, 2, 3, 4])
+
+    def test_select_by_album_and_smart_folder(self):
+        self.assertEqual(list(self.columns.select(album_uuids=["album-1"])), [0, 2])
+        self.assertEqual(
+            list(self.columns.select(album_uuids=["album-2"], smart_folders=["favorites"])),
+            [1, 2, 3],
+        )
+
+    def test_select_by_media_type_and_date(self):
+        self.assertEqual(list(self.columns.select(media_types=["video"])), [1])
+        self.assertEqual(
+            list(self.columns.select(
+                created_after=datetime(2024, 3, 1),
+                created_before=datetime(2024, 12, 31),
+            )),
+            [1],
+        )
+
+    def test_with_bursts_adds_whole_burst(self):
+        selected = self.columns.select(album_uuids=["album-2"])
+
+        self.assertEqual(list(self.columns.with_bursts(selected)), [2, 3, 4])
+
+    def test_present_smart_folders(self):
+        self.assertEqual(self.columns.present_smart_folders(), {"favorites", "hidden"})
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -6,9 +6,12 @@ Description: Unit tests for the file extraction engine helpers and main loop.
 
 import os
 import tempfile
+import threading
 import unittest
+from datetime import datetime
 from pathlib import Path
 from typing import Dict
+from unittest.mock import patch
 
 from functional_components.backup_locator_and_validator.domain.backup_model import (
     Asset,
@@ -19,6 +22,9 @@ from functional_components.backup_locator_and_validator.domain.backup_model impo
     Relationships,
     SourceDevice,
 )
+from functional_components.file_extraction_engine.app.conversion_pool import (
+    ConversionPool,
+)
 from functional_components.file_extraction_engine.app.extract_files import (
     run_extraction_engine,
 )
@@ -27,6 +33,16 @@ from functional_components.file_extraction_engine.app.extraction_helpers import
     get_dest_name,
     maybe_convert,
 )
+from functional_components.file_extraction_engine.data.copy_pool import (
+    CopyPool,
+)
+from functional_components.file_extraction_engine.data.file_management import (
+    copy_to_path,
+    ensure_folder_exists,
+)
+from functional_components.file_extraction_engine.data.name_allocator import (
+    NameAllocator,
+)
 from functional_components.file_extraction_engine.domain.blacklist import (
     Blacklist,
     ListEntry,
@@ -103,6 +119,21 @@ class TestExtractionHelpers(unittest.TestCase):
         self.assertNotIn("Album A", titles)
         self.assertNotIn("nua_favorites", titles)
 
+    def test_get_active_collections_cache_is_per_combination(self):
+        blacklist = Blacklist(current_list=[ListEntry(name="Album A")])
+        mapping = {"uuidA": "Album A", "uuidB": "Album B"}
+        first = _make_asset("u1", "a.jpg", "JPG", "/src/a.jpg", user_albums=["uuidB"])
+        second = _make_asset("u2", "b.jpg", "JPG", "/src/b.jpg", user_albums=["uuidB"])
+        other = _make_asset("u3", "c.jpg", "JPG", "/src/c.jpg", user_albums=["uuidA"])
+        cache = {}
+
+        cols = get_active_collections(first, blacklist, mapping, cache)
+
+        self.assertEqual([c.title for c in cols], ["Album B"])
+        self.assertIs(get_active_collections(second, blacklist, mapping, cache), cols)
+        self.assertEqual(get_active_collections(other, blacklist, mapping, cache), [])
+        self.assertEqual(len(cache), 2)
+
     def test_maybe_convert_no_rule(self):
         asset = _make_asset("u", "f.jpg", "JPG", "/src/f.jpg")
         out = maybe_convert(asset, {})
@@ -184,6 +215,304 @@ class TestRunExtractionEngine(unittest.TestCase):
         self.assertTrue((self.output / "non_exclusive_assets" / "a.jpg").exists())
         self.assertEqual(progress.percent, 100)
 
+    def test_names_do_not_depend_on_copy_workers(self):
+        """Same-named assets get the same numbered names for any pool size."""
+        album = Album(album_uuid="uuid1", title="One", type="user", sort_order="none", asset_count=20)
+        assets = []
+        for index in range(20):
+            src = self.src_dir / f"src{index}.jpg"
+            src.write_text(str(index))
+            assets.append(_make_asset(
+                f"u{index}", "a.jpg", "JPG", str(src), user_albums=["uuid1"]
+            ))
+        model = BackupModel(
+            backup_metadata=self.backup_meta,
+            assets=assets,
+            albums=[album],
+        )
+
+        outputs = {}
+        for workers in (1, 8):
+            output = self.output / f"workers{workers}"
+            run_extraction_engine(
+                model,
+                Blacklist(current_list=[]),
+                output,
+                os_supports_symlinks=False,
+                user_set_symlinks=False,
+                convert_type_dict={},
+                progress=type("P", (), {"percent": 0})(),
+                copy_workers=workers,
+            )
+            outputs[workers] = {
+                path.name: path.read_text() for path in (output / "One").iterdir()
+            }
+
+        self.assertEqual(len(outputs[1]), 20)
+        self.assertEqual(outputs[1]["a (5).jpg"], "5")
+        self.assertEqual(outputs[8], outputs[1])
+
+    def test_exports_are_logged_to_progress(self):
+        asset = _make_asset("u5", "a.jpg", "JPG", str(self.src_dir / "a.jpg"))
+        model = BackupModel(
+            backup_metadata=self.backup_meta,
+            assets=[asset],
+            albums=[],
+        )
+        logs = []
+        progress = type("P", (), {"percent": 0, "add_log": lambda self, m: logs.append(m)})()
+
+        run_extraction_engine(
+            model,
+            Blacklist(current_list=[]),
+            self.output,
+            os_supports_symlinks=False,
+            user_set_symlinks=False,
+            convert_type_dict={},
+            progress=progress,
+        )
+
+        self.assertEqual(logs, ["Exporting: a.jpg"])
+
+    def test_dry_run_plans_without_writing(self):
+        album = Album(album_uuid="uuid1", title="One", type="user", sort_order="none", asset_count=1)
+        asset1 = _make_asset("u1", "a.jpg", "JPG", str(self.src_dir / "a.jpg"), user_albums=["uuid1"])
+        asset2 = _make_asset("u2", "a.heic", "HEIC", str(self.src_dir / "b.jpg"), user_albums=["uuid1"])
+        asset1.file_size = 1
+        model = BackupModel(
+            backup_metadata=self.backup_meta,
+            assets=[asset1, asset2],
+            albums=[album],
+        )
+        output = self.output / "dry"
+
+        plan = run_extraction_engine(
+            model,
+            Blacklist(current_list=[]),
+            output,
+            os_supports_symlinks=False,
+            user_set_symlinks=False,
+            convert_type_dict={"HEIC": "JPG"},
+            progress=type("P", (), {"percent": 0})(),
+            dry_run=True,
+        )
+
+        self.assertFalse(output.exists())
+        self.assertEqual(plan.folders, [output / "One"])
+        self.assertEqual(
+            [f.dest_paths for f in plan.files],
+            [[output / "One" / "a.jpg"], [output / "One" / "a (1).jpg"]],
+        )
+        self.assertEqual(plan.files[1].convert_to, "JPG")
+        self.assertEqual(plan.total_bytes, 1)
+
+    def test_symlinks_are_planned_to_non_exclusive_copy(self):
+        album1 = Album(album_uuid="uuid1", title="One", type="user", sort_order="none", asset_count=1)
+        album2 = Album(album_uuid="uuid2", title="Two", type="user", sort_order="none", asset_count=1)
+        asset = _make_asset(
+            "u1", "a.jpg", "JPG", str(self.src_dir / "a.jpg"), user_albums=["uuid1", "uuid2"]
+        )
+        model = BackupModel(
+            backup_metadata=self.backup_meta,
+            assets=[asset],
+            albums=[album1, album2],
+        )
+
+        plan = run_extraction_engine(
+            model,
+            Blacklist(current_list=[]),
+            self.output,
+            os_supports_symlinks=True,
+            user_set_symlinks=True,
+            convert_type_dict={},
+            progress=type("P", (), {"percent": 0})(),
+        )
+
+        copy_path = self.output / "non_exclusive_assets" / "a.jpg"
+        self.assertEqual(plan.files[0].dest_paths, [copy_path])
+        self.assertEqual(
+            [(link.target, link.link_path) for link in plan.links],
+            [
+                (copy_path, self.output / "One" / "a.jpg"),
+                (copy_path, self.output / "Two" / "a.jpg"),
+            ],
+        )
+        self.assertEqual((self.output / "Two" / "a.jpg").read_text(), "a")
+
+    def test_each_folder_is_made_once(self):
+        """Placing files makes no mkdir calls beyond one per planned folder."""
+        album = Album(album_uuid="uuid1", title="One", type="user", sort_order="none", asset_count=10)
+        assets = [
+            _make_asset(f"u{i}", "a.jpg", "JPG", str(self.src_dir / "a.jpg"), user_albums=["uuid1"])
+            for i in range(10)
+        ]
+        model = BackupModel(
+            backup_metadata=self.backup_meta,
+            assets=assets,
+            albums=[album],
+        )
+        original_mkdir = Path.mkdir
+
+        with patch.object(Path, "mkdir", autospec=True, side_effect=original_mkdir) as mkdir:
+            plan = run_extraction_engine(
+                model,
+                Blacklist(current_list=[]),
+                self.output,
+                os_supports_symlinks=False,
+                user_set_symlinks=False,
+                convert_type_dict={},
+                progress=type("P", (), {"percent": 0})(),
+            )
+
+        self.assertEqual(len(list((self.output / "One").iterdir())), 10)
+        self.assertEqual(mkdir.call_count, len(plan.folders))
+
+    def test_known_folder_is_not_made_again(self):
+        known_dirs = set()
+        folder = ensure_folder_exists(self.output / "x" / "y", known_dirs)
+
+        self.assertIn(self.output / "x", known_dirs)
+        folder.rmdir()
+        ensure_folder_exists(folder, known_dirs)
+        self.assertFalse(folder.exists())
+
+    def test_copied_file_gets_modification_time(self):
+        iso_asset = _make_asset("u4", "a.jpg", "JPG", str(self.src_dir / "a.jpg"))
+        raw_asset = iso_asset.model_copy(update={"modification_time": 86400.0})
+
+        iso_path = self.output / "iso.jpg"
+        raw_path = self.output / "raw.jpg"
+        copy_to_path(self.src_dir / "a.jpg", iso_path, iso_asset)
+        copy_to_path(self.src_dir / "a.jpg", raw_path, raw_asset)
+
+        self.assertEqual(
+            os.path.getmtime(iso_path),
+            datetime.fromisoformat("2026-03-01T00:00:00").timestamp(),
+        )
+        self.assertEqual(os.path.getmtime(raw_path), 978307200 + 86400.0)
+
+
+class TestCopyPool(unittest.TestCase):
+    def test_runs_every_task(self):
+        done = []
+        with CopyPool(4) as pool:
+            for index in range(50):
+                pool.submit(done.append, index)
+        self.assertEqual(sorted(done), list(range(50)))
+
+    def test_task_error_is_raised(self):
+        def fail():
+            raise OSError("disk full")
+
+        pool = CopyPool(2)
+        pool.submit(fail)
+        with self.assertRaises(OSError):
+            pool.wait()
+
+
+class TestConversionPool(unittest.TestCase):
+    def test_jobs_resolve_in_order(self):
+        """Jobs come back in order whether or not they went to a worker."""
+        with tempfile.TemporaryDirectory() as temp:
+            assets = [
+                _make_asset(f"u{i}", f"{i}.jpg", "JPG" if i % 2 else "PNG", f"/src/{i}")
+                for i in range(10)
+            ]
+            # JPG has a rule but no converter, so each one fails in a worker
+            #  and comes back unconverted
+            with ConversionPool({"JPG": "PNG"}, Path(temp), max_workers=2) as pool:
+                results = list(pool.resolve_in_order(
+                    (asset.asset_uuid, [asset]) for asset in assets
+                ))
+
+        self.assertEqual([uuid for uuid, _ in results], [a.asset_uuid for a in assets])
+        self.assertEqual(
+            [resolved[0].backup_relative_path for _, resolved in results],
+            [a.backup_relative_path for a in assets],
+        )
+
+    def test_workers_convert_files(self):
+        """Real conversions on two spawned workers each write their output."""
+        from PIL import Image
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+        with tempfile.TemporaryDirectory() as temp:
+            src_dir = Path(temp) / "src"
+            src_dir.mkdir()
+            assets = []
+            for i in range(4):
+                src = src_dir / f"{i}.heic"
+                Image.new("RGB", (8, 8), (i * 60, 0, 0)).save(src)
+                assets.append(_make_asset(f"u{i}", src.name, "HEIC", str(src)))
+
+            temp_dir = Path(temp) / "convert"
+            with ConversionPool({"HEIC": "JPG"}, temp_dir, max_workers=2) as pool:
+                results = list(pool.resolve_in_order(
+                    (asset.asset_uuid, [asset]) for asset in assets
+                ))
+
+            for (uuid, (converted,)), asset in zip(results, assets):
+                self.assertEqual(uuid, asset.asset_uuid)
+                out = Path(converted.backup_relative_path)
+                self.assertEqual(out, temp_dir / uuid / f"{Path(asset.original_filename).stem}.jpg")
+                self.assertTrue(out.is_file())
+
+
+class TestNameAllocator(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.folder = Path(self.temp.name)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_numbers_around_taken_names(self):
+        """Names on disk and names handed out are both skipped."""
+        (self.folder / "a.jpg").write_text("")
+        (self.folder / "a (2).jpg").write_text("")
+        names = NameAllocator()
+
+        allocated = [
+            names.allocate(self.folder, name)
+            for name in ["a.jpg", "a.jpg", "b.jpg", "a (1).jpg", "a.jpg", "a.jpg"]
+        ]
+
+        self.assertEqual(
+            allocated,
+            ["a (1).jpg", "a (3).jpg", "b.jpg", "a (1) (1).jpg", "a (4).jpg", "a (5).jpg"],
+        )
+
+    def test_folder_is_listed_once(self):
+        names = NameAllocator()
+        names.allocate(self.folder, "a.jpg")
+        (self.folder / "b.jpg").write_text("")
+
+        # Files written by others after the listing are not seen
+        self.assertEqual(names.allocate(self.folder, "b.jpg"), "b.jpg")
+
+    def test_reserved_paths_are_taken(self):
+        names = NameAllocator()
+        names.reserve([self.folder / "a.jpg"])
+
+        self.assertEqual(names.allocate(self.folder, "a.jpg"), "a (1).jpg")
+
+    def test_threads_get_distinct_names(self):
+        names = NameAllocator()
+        allocated = []
+
+        def allocate_many():
+            for _ in range(200):
+                allocated.append(names.allocate(self.folder, "IMG_0001.JPG"))
+
+        threads = [threading.Thread(target=allocate_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(allocated)), 800)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,21 +12,35 @@ Components exercised together:
     - get_encryption_status (reads Manifest.plist)
     - get_photos_sqlite_path (queries Manifest.db)
     - find_album_asset_join_table / find_join_table_columns (schema discovery)
-    - get_albums / build_albums
-    - get_assets / build_assets
+    - iter_albums / build_albums
+    - iter_assets / build_assets
     - build_backup_model (orchestrates all of the above)
 """
 
+import os
 import plistlib
+import shutil
 import sqlite3
 import tempfile
 import unittest
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from functional_components.backup_locator_and_validator.app.backup_model_builder import (
     build_backup_model,
+    load_backup_model,
+    start_backup_model_load,
 )
+from functional_components.backup_locator_and_validator.app.backup_catalog_scanner import (
+    list_backup_catalog,
+    scan_backup,
+    scan_backup_catalog,
+)
+from functional_components.backup_locator_and_validator.domain.backup_load_progress import (
+    BackupLoadProgress,
+)
+from tests.synthetic_backup import SyntheticBackupSpec, write_synthetic_backup
 
 
 # ---------------------------------------------------------------------------
@@ -160,6 +174,22 @@ class TestBuildBackupModelIntegration(unittest.TestCase):
         self.assertEqual(result.backup_model.assets, [])
         self.assertEqual(result.backup_model.albums, [])
 
+    def test_load_stats_recorded(self):
+        """Every phase of the build is timed on the result."""
+        result = build_backup_model(self.backup_root)
+
+        stats = result.load_stats
+        self.assertFalse(stats.from_cache)
+        for phase in (
+            "device_info", "manifest_plist", "locate_photos_sqlite",
+            "manifest_index", "schema_inspection", "albums", "memberships",
+            "asset_scan", "build_assets_first_pass",
+            "build_assets_second_pass", "total",
+        ):
+            self.assertIn(phase, stats.phase_seconds)
+        self.assertEqual(stats.counters["asset_rows"], 0)
+        self.assertEqual(stats.counters["fallback_hits"], 0)
+
     def test_encrypted_returns_failure(self):
         """IsEncrypted=True in Manifest.plist causes a failure result."""
         with (self.backup_root / "Manifest.plist").open("wb") as f:
@@ -180,5 +210,315 @@ class TestBuildBackupModelIntegration(unittest.TestCase):
         self.assertIsNone(result.backup_model)
 
 
+class TestLoadBackupModelCacheIntegration(unittest.TestCase):
+    """Integration tests for load_backup_model's on-disk cache.
+
+    Each test uses its own temp backup and temp cache directory.
+    """
+
+    BUILDER = (
+        "functional_components.backup_locator_and_validator.app"
+        ".backup_model_builder.build_backup_model"
+    )
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backup_root = Path(self.temp_dir.name) / "backup"
+        self.backup_root.mkdir()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        _build_minimal_backup(self.backup_root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_second_load_comes_from_cache(self):
+        """An unchanged backup is not rebuilt on the second load."""
+        first = load_backup_model(self.backup_root, self.cache_dir)
+
+        with patch(self.BUILDER) as mock_build:
+            second = load_backup_model(self.backup_root, self.cache_dir)
+
+        mock_build.assert_not_called()
+        self.assertTrue(second.success)
+        self.assertEqual(
+            second.backup_model.backup_metadata,
+            first.backup_model.backup_metadata,
+        )
+
+    def test_cached_load_reports_cache_stats(self):
+        """A cache hit carries its own stats, not the original build's."""
+        load_backup_model(self.backup_root, self.cache_dir)
+
+        result = load_backup_model(self.backup_root, self.cache_dir)
+
+        self.assertTrue(result.load_stats.from_cache)
+        self.assertIn("cache_lookup", result.load_stats.phase_seconds)
+        self.assertNotIn("asset_scan", result.load_stats.phase_seconds)
+
+    def test_every_load_prevalidates_files(self):
+        """Built and cached loads both check the backup's files."""
+        built = load_backup_model(self.backup_root, self.cache_dir)
+        cached = load_backup_model(self.backup_root, self.cache_dir)
+
+        for result in (built, cached):
+            self.assertEqual(result.file_report.shards_scanned, 1)
+            self.assertEqual(result.file_report.missing_assets, 0)
+            self.assertIn("file_prevalidation", result.load_stats.phase_seconds)
+
+    def test_changed_manifest_db_rebuilds(self):
+        """Rewriting Manifest.db invalidates the cached model."""
+        load_backup_model(self.backup_root, self.cache_dir)
+
+        mconn = sqlite3.connect(self.backup_root / "Manifest.db")
+        mconn.execute("INSERT INTO Files VALUES ('ff', 'Media/new.jpg')")
+        mconn.commit()
+        mconn.close()
+
+        with patch(self.BUILDER, wraps=build_backup_model) as mock_build:
+            result = load_backup_model(self.backup_root, self.cache_dir)
+
+        mock_build.assert_called_once()
+        self.assertTrue(result.success)
+
+        # The rebuild starts from the previously cached model
+        self.assertIsNotNone(mock_build.call_args.args[1])
+        self.assertEqual(len(list(self.cache_dir.glob("*.bmc"))), 1)
+
+    def test_failed_load_is_not_cached(self):
+        """Failures are rebuilt every time rather than served from cache."""
+        with (self.backup_root / "Manifest.plist").open("wb") as f:
+            plistlib.dump({"IsEncrypted": True}, f)
+
+        load_backup_model(self.backup_root, self.cache_dir)
+
+        self.assertFalse(any(self.cache_dir.glob("*.bmc")))
+
+
+class TestProgressiveLoadIntegration(unittest.TestCase):
+    """Integration tests for loading a backup progressively."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backup_root = Path(self.temp_dir.name) / "backup"
+        self.backup_root.mkdir()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        _build_minimal_backup(self.backup_root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_metadata_published_before_result(self):
+        """build_backup_model publishes metadata and albums to progress."""
+        published = []
+        progress = BackupLoadProgress()
+        original_publish = progress.publish_partial
+
+        def record_publish(backup_model, total_assets):
+            published.append(progress.result)
+            original_publish(backup_model, total_assets)
+
+        progress.publish_partial = record_publish
+        result = build_backup_model(self.backup_root, progress=progress)
+
+        self.assertTrue(result.success, msg=result.error)
+        self.assertEqual(published, [None])
+        self.assertEqual(progress.total_assets, 0)
+        self.assertEqual(
+            progress.backup_model.backup_metadata.source_device.name,
+            "Integration Test iPhone",
+        )
+
+    def test_background_load_completes(self):
+        """start_backup_model_load finishes with the full result."""
+        progress = start_backup_model_load(self.backup_root, self.cache_dir)
+        result = progress.wait(timeout=30)
+
+        self.assertTrue(progress.is_complete)
+        self.assertTrue(result.success, msg=result.error)
+        self.assertIs(progress.backup_model, result.backup_model)
+
+    def test_background_load_failure_releases_waiters(self):
+        """A load that fails before any metadata still ends the wait."""
+        (self.backup_root / "Info.plist").unlink()
+
+        progress = start_backup_model_load(self.backup_root, self.cache_dir)
+
+        self.assertTrue(progress.wait_for_partial(timeout=30))
+        self.assertFalse(progress.wait(timeout=30).success)
+
+
+class TestBackupCatalogIntegration(unittest.TestCase):
+    """Integration tests for scanning a folder of backups into the catalog."""
+
+    SCANNER = (
+        "functional_components.backup_locator_and_validator.app"
+        ".backup_catalog_scanner.scan_backup"
+    )
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backups_root = Path(self.temp_dir.name) / "Backup"
+        self.catalog_path = Path(self.temp_dir.name) / "catalog.sqlite"
+        for name in ("backup-a", "backup-b"):
+            (self.backups_root / name).mkdir(parents=True)
+            _build_minimal_backup(self.backups_root / name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan_reads_every_backup(self):
+        """Each backup's metadata and row counts are cataloged."""
+        entries = scan_backup_catalog(self.backups_root, self.catalog_path)
+
+        self.assertEqual(len(entries), 2)
+        for entry in entries:
+            self.assertIsNone(entry.error)
+            self.assertEqual(entry.device_name, "Integration Test iPhone")
+            self.assertEqual(entry.asset_count, 0)
+            self.assertEqual(entry.album_count, 0)
+        self.assertEqual(len(list_backup_catalog(self.catalog_path)), 2)
+
+    def test_unchanged_backups_are_not_rescanned(self):
+        """A second scan serves unchanged backups from the catalog."""
+        scan_backup_catalog(self.backups_root, self.catalog_path)
+
+        with patch(self.SCANNER, wraps=scan_backup) as mock_scan:
+            entries = scan_backup_catalog(self.backups_root, self.catalog_path)
+
+        mock_scan.assert_not_called()
+        self.assertEqual(len(entries), 2)
+
+    def test_removed_backup_leaves_catalog(self):
+        """Backups deleted from the folder are dropped from the catalog."""
+        scan_backup_catalog(self.backups_root, self.catalog_path)
+        shutil.rmtree(self.backups_root / "backup-b")
+
+        scan_backup_catalog(self.backups_root, self.catalog_path)
+
+        self.assertEqual(
+            [Path(e.backup_path).name for e in list_backup_catalog(self.catalog_path)],
+            ["backup-a"],
+        )
+
+    def test_other_spellings_of_root_share_entries(self):
+        """A symlink or ".." to the same folder neither rescans nor duplicates."""
+        scan_backup_catalog(self.backups_root, self.catalog_path)
+        link = Path(self.temp_dir.name) / "Backup-link"
+        link.symlink_to(self.backups_root, target_is_directory=True)
+
+        with patch(self.SCANNER, wraps=scan_backup) as mock_scan:
+            for root in (link, self.backups_root / "backup-a" / ".."):
+                entries = scan_backup_catalog(root, self.catalog_path)
+                self.assertEqual(len(entries), 2)
+
+        mock_scan.assert_not_called()
+        self.assertEqual(len(list_backup_catalog(self.catalog_path)), 2)
+
+    def test_unreadable_backup_is_recorded(self):
+        """A broken backup gets an entry with an error instead of failing."""
+        (self.backups_root / "backup-b" / "Manifest.plist").unlink()
+
+        entries = scan_backup_catalog(self.backups_root, self.catalog_path)
+
+        self.assertIsNone(entries[0].error)
+        self.assertIn("Manifest.plist", entries[1].error)
+
+
+class TestSyntheticBackupIntegration(unittest.TestCase):
+    """Integration tests loading a generated backup with albums, bursts,
+    live photos and missing files.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backup_root = Path(self.temp_dir.name) / "backup"
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        self.summary = write_synthetic_backup(self.backup_root, SyntheticBackupSpec(
+            asset_count=200,
+            album_count=5,
+            burst_ratio=0.1,
+            live_photo_ratio=0.2,
+            missing_file_ratio=0.05,
+            icloud_ratio=0.05,
+            seed=7,
+        ))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_generated_backup_loads(self):
+        """Every generated asset and album is loaded, and the missing files
+        are the ones reported.
+        """
+        result = load_backup_model(self.backup_root, self.cache_dir)
+
+        self.assertTrue(result.success, result.error)
+        model = result.backup_model
+        self.assertEqual(len(model.assets), self.summary.expected_model_assets)
+        self.assertEqual(len(model.albums), self.summary.album_count)
+        self.assertGreater(self.summary.live_photo_companions, 0)
+        self.assertGreater(self.summary.missing_files, 0)
+        self.assertEqual(
+            sorted(result.file_report.missing_asset_uuids),
+            sorted(self.summary.missing_asset_uuids),
+        )
+
+    def test_copied_backup_is_not_served_from_original_cache(self):
+        """A copy of a backup gets its own cache entry, with paths into the
+        copy, and does not evict the original's entry.
+        """
+        load_backup_model(self.backup_root, self.cache_dir)
+        copy_root = Path(self.temp_dir.name) / "copy"
+        shutil.copytree(self.backup_root, copy_root)
+        load_backup_model(copy_root, self.cache_dir)
+        self.assertEqual(len(list(self.cache_dir.glob("*.bmc"))), 2)
+
+        shutil.rmtree(self.backup_root)
+        result = load_backup_model(copy_root, self.cache_dir)
+
+        self.assertTrue(result.load_stats.from_cache)
+        self.assertEqual(
+            result.file_report.missing_assets, self.summary.missing_files
+        )
+        for asset in result.backup_model.assets:
+            self.assertTrue(asset.backup_relative_path.startswith(str(copy_root)))
+
+    def test_relative_root_is_cached_with_absolute_paths(self):
+        """A load through a relative path caches paths that still exist when
+        the same backup is loaded from another working directory.
+        """
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.temp_dir.name)
+        load_backup_model(Path("backup"), self.cache_dir)
+
+        os.chdir(self.backup_root.parent.parent)
+        result = load_backup_model(self.backup_root, self.cache_dir)
+
+        self.assertTrue(result.load_stats.from_cache)
+        self.assertEqual(
+            result.file_report.missing_assets, self.summary.missing_files
+        )
+        for asset in result.backup_model.assets:
+            self.assertTrue(
+                asset.backup_relative_path.startswith(str(self.backup_root.resolve()))
+            )
+
+    def test_same_seed_writes_same_backup(self):
+        """A seed always produces the same Photos.sqlite rows."""
+        other_root = Path(self.temp_dir.name) / "other"
+        other = write_synthetic_backup(other_root, SyntheticBackupSpec(
+            asset_count=200,
+            album_count=5,
+            burst_ratio=0.1,
+            live_photo_ratio=0.2,
+            missing_file_ratio=0.05,
+            icloud_ratio=0.05,
+            seed=7,
+        ))
+
+        self.assertEqual(other.missing_asset_uuids, self.summary.missing_asset_uuids)
+        self.assertEqual(other.album_memberships, self.summary.album_memberships)
+
+
 if __name__ == "__main__":
     unittest.main()
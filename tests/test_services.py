@@ -4,13 +4,28 @@ Date: 2026-03-08
 Description: Unit tests for the service functions.
 """
 
+import threading
+import time
 import unittest
+from unittest.mock import patch
 from functional_components.services import BackupService
 from functional_components.backup_locator_and_validator.domain.backup_model import (
     BackupModel,
     BackupMetadata,
     SourceDevice,
 )
+from functional_components.backup_locator_and_validator.domain.backup_model_result import (
+    BackupModelResult,
+)
+from functional_components.backup_locator_and_validator.domain.backup_load_progress import (
+    BackupLoadProgress,
+)
+from functional_components.backup_locator_and_validator.domain.load_stats import (
+    LoadStats,
+)
+from functional_components.backup_locator_and_validator.domain.backup_file_report import (
+    BackupFileReport,
+)
 
 
 class TestBackupServiceMetadataFormatting(unittest.TestCase):
@@ -43,6 +58,155 @@ class TestBackupServiceMetadataFormatting(unittest.TestCase):
         self.assertIn("iPhone 12", output)
 
 
+class TestBackupServiceProgressiveLoad(unittest.TestCase):
+    def setUp(self):
+        self.service = BackupService()
+        metadata = BackupMetadata(
+            backup_uuid="uuid",
+            backup_date="2024-01-01T10:00:00",
+            is_encrypted=False,
+            source_device=SourceDevice(
+                name="iPhone", model="iPhone12,1", ios_version="16.0"
+            ),
+        )
+        self.partial = BackupModel(backup_metadata=metadata, assets=[], albums=[])
+        self.complete = BackupModel(backup_metadata=metadata, assets=[], albums=[])
+
+        self.progress = BackupLoadProgress()
+        self.progress.publish_partial(self.partial, 10)
+        patcher = patch(
+            "functional_components.services.start_backup_model_load",
+            return_value=self.progress,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_returns_once_metadata_is_loaded(self):
+        success, message, warning = self.service.attempt_load_backup("/fake")
+
+        self.assertTrue(success)
+        self.assertIn("still loading", message)
+        self.assertIs(self.service.current_model, self.partial)
+        self.assertTrue(self.service.is_loading())
+
+        self.progress.advance(4)
+        self.assertEqual(self.service.get_load_status(), "Assets loaded: 4 of 10")
+        self.assertIn("4 of 10", self.service.get_formatted_device_metadata())
+
+    def test_metadata_formatted_while_load_fails(self):
+        """A load failing partway through formatting does not break it."""
+        service = self.service
+        service.attempt_load_backup("/fake")
+        self.progress.advance(4)
+
+        class FailingProgress(BackupLoadProgress):
+            @property
+            def is_complete(self):
+                # The loader thread clears the load as soon as it is checked
+                service._load_progress = None
+                service.current_model = None
+                return False
+
+        self.progress.__class__ = FailingProgress
+
+        self.assertIn("4 of 10", service.get_formatted_device_metadata())
+
+    def test_complete_model_swapped_in_when_load_ends(self):
+        self.service.attempt_load_backup("/fake")
+
+        self.progress.finish(BackupModelResult(
+            success=True, backup_model=self.complete, icloud_warning="warn"
+        ))
+
+        self.assertFalse(self.service.is_loading())
+        self.assertIs(self.service.wait_for_backup_load(), self.complete)
+        self.assertEqual(
+            self.service.take_load_outcome(),
+            (True, "Backup loaded successfully!", "warn"),
+        )
+        self.assertIsNone(self.service.take_load_outcome())
+
+    def test_model_swapped_in_once_when_finish_races(self):
+        """The done callback and wait_for_backup_load never both swap."""
+        swaps = []
+
+        class SlowResult:
+            success = True
+            backup_model = self.complete
+            file_report = None
+            icloud_warning = None
+
+            @property
+            def load_stats(self):
+                swaps.append(1)
+                time.sleep(0.05)  # Widen the window between check and swap
+                return None
+
+        self.service.attempt_load_backup("/fake")
+        self.progress.result = SlowResult()
+        threads = [
+            threading.Thread(target=self.service._on_load_finished, args=(self.progress,))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(swaps), 1)
+        self.assertIsNotNone(self.service.take_load_outcome())
+        self.service._on_load_finished(self.progress)
+        self.assertIsNone(self.service.take_load_outcome())
+
+    def test_load_stats_formatted_once_load_ends(self):
+        self.service.attempt_load_backup("/fake")
+        self.assertEqual(
+            self.service.get_formatted_load_stats(), "No load statistics available."
+        )
+
+        stats = LoadStats(
+            phase_seconds={"total": 2.5, "device_info": 0.25},
+            counters={"fallback_hits": 3},
+        )
+        self.progress.finish(BackupModelResult(
+            success=True, backup_model=self.complete, load_stats=stats
+        ))
+
+        output = self.service.get_formatted_load_stats()
+        self.assertLess(output.index("device_info"), output.index("total"))
+        self.assertIn("2.500 s", output)
+        self.assertIn("fallback_hits", output)
+        self.assertNotIn("Backup Files:", output)
+
+    def test_file_report_formatted_with_load_stats(self):
+        self.service.attempt_load_backup("/fake")
+        self.progress.finish(BackupModelResult(
+            success=True,
+            backup_model=self.complete,
+            load_stats=LoadStats(),
+            file_report=BackupFileReport(
+                checked_assets=3,
+                present_assets=2,
+                missing_asset_uuids=["u3"],
+                total_bytes=3 * 1024 ** 3,
+            ),
+        ))
+
+        output = self.service.get_formatted_load_stats()
+        self.assertIn("2 of 3", output)
+        self.assertIn("3.00 GB", output)
+
+    def test_failed_asset_load_clears_model(self):
+        self.service.attempt_load_backup("/fake")
+
+        self.progress.finish(BackupModelResult(success=False, error="boom"))
+
+        self.assertIsNone(self.service.wait_for_backup_load())
+        success, message, _ = self.service.take_load_outcome()
+        self.assertFalse(success)
+        self.assertIn("boom", message)
+
+
 class TestSettingsServiceSmartAlbum(unittest.TestCase):
     """Unit tests for smart album exclusion functionality in SettingsService."""
 
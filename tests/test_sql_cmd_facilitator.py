@@ -0,0 +1,547 @@
+"""
+Author: Kevin Gustafson
+Date: 2026-10-17
+Description: Unit tests for the SQL command facilitator readers and builders.
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from functional_components.backup_locator_and_validator.domain.asset_columns import (
+    SMART_FOLDER_BITS,
+    SUBTYPE_CODES,
+)
+from functional_components.sql_cmd_facilitator.app.asset_builder import (
+    build_assets,
+    build_membership_lookup,
+)
+from functional_components.sql_cmd_facilitator.app.schema_inspector import (
+    get_schema_fingerprint,
+    get_schema_profile,
+)
+from functional_components.sql_cmd_facilitator.data.asset_reader import (
+    get_asset_album_memberships,
+    get_assets,
+)
+from functional_components.sql_cmd_facilitator.data.manifest_db_reader import (
+    get_manifest_index,
+)
+from functional_components.sql_cmd_facilitator.data.sql_executor import (
+    iter_query,
+)
+from functional_components.sql_cmd_facilitator.data.sqlite_connection_manager import (
+    IN_MEMORY,
+    READ_WRITE,
+    open_db,
+)
+
+
+def _make_manifest_conn(rows) -> sqlite3.Connection:
+    """Returns an in-memory Manifest.db holding the given (fileID, path) rows."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE Files (fileID TEXT PRIMARY KEY, relativePath TEXT)"
+    )
+    conn.executemany("INSERT INTO Files VALUES (?, ?)", rows)
+    return conn
+
+
+def _make_row(pk: int, filename: str, directory: str = "DCIM/100APPLE", **extra) -> dict:
+    """Returns a raw ZASSET row dict like the ones get_assets produces."""
+    row = {
+        "Z_PK": pk,
+        "ZUUID": f"uuid-{pk}",
+        "ZFILENAME": filename,
+        "ZDIRECTORY": directory,
+        "ZUNIFORMTYPEIDENTIFIER": "public.heic",
+        "ZDATECREATED": 0.0,
+        "ZMODIFICATIONDATE": 0.0,
+        "ZKIND": 0,
+        "ZKINDSUBTYPE": 0,
+        "ZFAVORITE": 0,
+        "ZHIDDEN": 0,
+        "ZTRASHEDSTATE": 0,
+        "ZAVALANCHEUUID": None,
+        "ZAVALANCHEPICKTYPE": None,
+        "ZMEDIAGROUPUUID": None,
+        "ZDERIVEDCAMERACAPTUREDEVICE": None,
+        "ZORIGINALFILENAME": filename,
+        "media_type_code": 0,
+        "subtype_code": 0,
+        "flag_bits": 0,
+    }
+    row.update(extra)
+    return row
+
+
+def _make_photos_conn(join_table: str = "Z_33ASSETS", with_attributes: bool = True):
+    """Returns an in-memory Photos.sqlite with one asset and a reduced schema."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE ZASSET (Z_PK INTEGER PRIMARY KEY, ZUUID TEXT, "
+        "ZFILENAME TEXT, ZDIRECTORY TEXT, ZKIND INTEGER)"
+    )
+    conn.execute(
+        f"CREATE TABLE {join_table} "
+        f"(Z_3ASSETS INTEGER, Z_33ALBUMS INTEGER, Z_FOK_3ASSETS INTEGER)"
+    )
+    conn.execute(
+        "INSERT INTO ZASSET VALUES (1, 'uuid-1', 'IMG_0001.HEIC', 'DCIM/100APPLE', 0)"
+    )
+    if with_attributes:
+        conn.execute(
+            "CREATE TABLE ZADDITIONALASSETATTRIBUTES "
+            "(Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, ZORIGINALFILENAME TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO ZADDITIONALASSETATTRIBUTES VALUES (1, 1, 'original.heic')"
+        )
+    return conn
+
+
+class TestSchemaProfile(unittest.TestCase):
+
+    def test_same_schema_has_same_fingerprint(self):
+        first = _make_photos_conn()
+        second = _make_photos_conn()
+        second.execute("INSERT INTO ZASSET (Z_PK, ZUUID) VALUES (2, 'uuid-2')")
+        other = _make_photos_conn(join_table="Z_42ASSETS")
+
+        self.assertEqual(
+            get_schema_fingerprint(first), get_schema_fingerprint(second)
+        )
+        self.assertNotEqual(
+            get_schema_fingerprint(first), get_schema_fingerprint(other)
+        )
+
+    def test_profile_is_inspected_once_per_schema(self):
+        conn = _make_photos_conn(join_table="Z_26ASSETS")
+        profile = get_schema_profile(conn)
+
+        with patch(
+            "functional_components.sql_cmd_facilitator.app.schema_inspector"
+            ".build_schema_profile"
+        ) as mock_build:
+            cached = get_schema_profile(_make_photos_conn(join_table="Z_26ASSETS"))
+
+        mock_build.assert_not_called()
+        self.assertIs(cached, profile)
+        self.assertEqual(profile.join_table, "Z_26ASSETS")
+        self.assertEqual(profile.join_cols["album_fk"], "Z_33ALBUMS")
+
+    def test_missing_columns_are_read_as_null(self):
+        conn = _make_photos_conn()
+
+        rows = get_assets(conn, get_schema_profile(conn))
+
+        self.assertEqual(rows[0]["ZUUID"], "uuid-1")
+        self.assertIsNone(rows[0]["ZFAVORITE"])
+        self.assertEqual(rows[0]["ZORIGINALFILENAME"], "original.heic")
+
+    def test_missing_attributes_table_reads_without_original_filename(self):
+        conn = _make_photos_conn(with_attributes=False)
+
+        rows = get_assets(conn, get_schema_profile(conn))
+
+        self.assertEqual(rows[0]["ZFILENAME"], "IMG_0001.HEIC")
+        self.assertIsNone(rows[0]["ZORIGINALFILENAME"])
+
+
+class TestAssetCodes(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        columns = ", ".join(
+            "Z_PK INTEGER PRIMARY KEY" if c == "Z_PK" else c
+            for c in (
+                "Z_PK", "ZUUID", "ZFILENAME", "ZDIRECTORY",
+                "ZUNIFORMTYPEIDENTIFIER", "ZDATECREATED", "ZMODIFICATIONDATE",
+                "ZKIND", "ZKINDSUBTYPE", "ZFAVORITE", "ZHIDDEN", "ZTRASHEDSTATE",
+                "ZAVALANCHEUUID", "ZAVALANCHEPICKTYPE", "ZMEDIAGROUPUUID",
+                "ZDERIVEDCAMERACAPTUREDEVICE",
+            )
+        )
+        self.conn.execute(f"CREATE TABLE ZASSET ({columns})")
+        self.conn.execute(
+            "CREATE TABLE ZADDITIONALASSETATTRIBUTES "
+            "(Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, ZORIGINALFILENAME TEXT)"
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _codes(self, **values) -> dict:
+        columns = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        self.conn.execute(
+            f"INSERT INTO ZASSET (Z_PK, ZUUID, {columns}) "
+            f"VALUES (1, 'uuid-1', {placeholders})",
+            tuple(values.values()),
+        )
+        return get_assets(self.conn)[0]
+
+    def test_subtype_code_maps_zkindsubtype(self):
+        row = self._codes(ZKIND=1, ZKINDSUBTYPE=64)
+
+        self.assertEqual(row["media_type_code"], 1)
+        self.assertEqual(row["subtype_code"], SUBTYPE_CODES["slo_mo"])
+
+    def test_burst_uuid_overrides_subtype(self):
+        row = self._codes(ZKINDSUBTYPE=2, ZAVALANCHEUUID="burst-1")
+
+        self.assertEqual(row["subtype_code"], SUBTYPE_CODES["burst_frame"])
+
+    def test_unknown_and_null_values_are_standard_photos(self):
+        row = self._codes(ZKIND=None, ZKINDSUBTYPE=9999)
+
+        self.assertEqual(row["media_type_code"], 0)
+        self.assertEqual(row["subtype_code"], SUBTYPE_CODES["standard"])
+        self.assertEqual(row["flag_bits"], 0)
+
+    def test_flag_bits_combine_flags(self):
+        row = self._codes(
+            ZFAVORITE=1, ZTRASHEDSTATE=1, ZDERIVEDCAMERACAPTUREDEVICE=1
+        )
+
+        self.assertEqual(
+            row["flag_bits"],
+            SMART_FOLDER_BITS["favorites"]
+            | SMART_FOLDER_BITS["recently_deleted"]
+            | SMART_FOLDER_BITS["selfies"],
+        )
+
+    def test_build_assets_unpacks_codes(self):
+        manifest_conn = _make_manifest_conn([
+            ("ab" + "0" * 38, "Media/DCIM/100APPLE/IMG_0001.MOV"),
+        ])
+        row = _make_row(
+            1,
+            "IMG_0001.MOV",
+            media_type_code=1,
+            subtype_code=SUBTYPE_CODES["time_lapse"],
+            flag_bits=SMART_FOLDER_BITS["hidden"] | SMART_FOLDER_BITS["selfies"],
+        )
+
+        assets, _ = build_assets(
+            [row], build_membership_lookup([]), Path("root"), None, get_manifest_index(manifest_conn)
+        )
+
+        self.assertEqual(assets[0].media_type, "video")
+        self.assertEqual(assets[0].subtype, "time_lapse")
+        self.assertTrue(assets[0].flags.is_hidden)
+        self.assertTrue(assets[0].flags.is_selfie)
+        self.assertFalse(assets[0].flags.is_favorite)
+        self.assertEqual(
+            assets[0].relationships.smart_folders, ["hidden", "selfies"]
+        )
+
+
+class TestAlbumMemberships(unittest.TestCase):
+
+    def setUp(self):
+        self.memberships = build_membership_lookup([
+            {"asset_pk": 7, "album_uuid": "album-b"},
+            {"asset_pk": 2, "album_uuid": "album-a"},
+            {"asset_pk": 7, "album_uuid": "album-a"},
+            {"asset_pk": 2, "album_uuid": "album-c"},
+        ])
+
+    def test_albums_are_grouped_by_asset_in_row_order(self):
+        self.assertEqual(self.memberships.get(7), ["album-b", "album-a"])
+        self.assertEqual(self.memberships.get(2), ["album-a", "album-c"])
+        self.assertEqual(len(self.memberships), 4)
+
+    def test_album_uuids_are_stored_once(self):
+        self.assertEqual(
+            self.memberships.album_uuids, ["album-b", "album-a", "album-c"]
+        )
+        self.assertEqual(self.memberships.album_indexes_of(7), (0, 1))
+
+    def test_assets_without_albums_have_none(self):
+        self.assertEqual(self.memberships.album_indexes_of(3), ())
+        self.assertEqual(self.memberships.album_indexes_of(100), ())
+        self.assertEqual(build_membership_lookup([]).get(1), [])
+
+    def test_rows_with_null_keys_are_skipped(self):
+        memberships = build_membership_lookup([
+            {"asset_pk": None, "album_uuid": "album-a"},
+            {"asset_pk": 4, "album_uuid": None},
+            {"asset_pk": 4, "album_uuid": "album-b"},
+        ])
+
+        self.assertEqual(memberships.get(4), ["album-b"])
+        self.assertEqual(memberships.album_uuids, ["album-b"])
+
+    def test_reader_drops_rows_with_null_keys(self):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute("CREATE TABLE Z_33ASSETS (Z_3ASSETS INTEGER, Z_33ALBUMS INTEGER)")
+        conn.execute(
+            "CREATE TABLE ZGENERICALBUM (Z_PK INTEGER PRIMARY KEY, ZUUID TEXT, ZKIND INTEGER)"
+        )
+        conn.executemany(
+            "INSERT INTO ZGENERICALBUM VALUES (?, ?, 2)",
+            [(1, "album-a"), (2, None)],
+        )
+        conn.executemany(
+            "INSERT INTO Z_33ASSETS VALUES (?, ?)",
+            [(5, 1), (None, 1), (6, 2), (7, None)],
+        )
+
+        rows = get_asset_album_memberships(conn, "Z_33ASSETS", "Z_33ALBUMS", "Z_3ASSETS")
+
+        self.assertEqual(rows, [{"asset_pk": 5, "album_uuid": "album-a"}])
+
+    def test_assets_with_same_albums_share_relationships(self):
+        manifest_conn = _make_manifest_conn([
+            ("aa" + "0" * 38, "Media/DCIM/100APPLE/IMG_0001.HEIC"),
+            ("bb" + "0" * 38, "Media/DCIM/100APPLE/IMG_0002.HEIC"),
+        ])
+        memberships = build_membership_lookup([
+            {"asset_pk": 1, "album_uuid": "album-a"},
+            {"asset_pk": 2, "album_uuid": "album-a"},
+        ])
+
+        assets, _ = build_assets(
+            [_make_row(1, "IMG_0001.HEIC"), _make_row(2, "IMG_0002.HEIC")],
+            memberships,
+            Path("root"),
+            None,
+            get_manifest_index(manifest_conn),
+        )
+
+        self.assertEqual(assets[0].relationships.user_albums, ["album-a"])
+        self.assertIs(assets[0].relationships, assets[1].relationships)
+
+    def test_repeated_strings_are_shared(self):
+        manifest_conn = _make_manifest_conn([
+            ("aa" + "0" * 38, "Media/DCIM/100APPLE/IMG_0001.HEIC"),
+            ("bb" + "0" * 38, "Media/DCIM/100APPLE/IMG_0002.HEIC"),
+        ])
+        rows = [
+            _make_row(1, "IMG_0001.HEIC", ZUNIFORMTYPEIDENTIFIER="".join(["public.", "heic"])),
+            _make_row(2, "IMG_0002.HEIC", ZUNIFORMTYPEIDENTIFIER="".join(["public.", "heic"])),
+        ]
+
+        assets, _ = build_assets(
+            rows,
+            build_membership_lookup([]),
+            Path("root"),
+            None,
+            get_manifest_index(manifest_conn),
+        )
+
+        self.assertIs(assets[0].uti_type, assets[1].uti_type)
+        self.assertIs(assets[0].file_extension, assets[1].file_extension)
+        self.assertEqual(
+            assets[1].backup_relative_path,
+            str(Path("root") / "bb" / ("bb" + "0" * 38)),
+        )
+
+
+class TestManifestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = _make_manifest_conn([
+            ("aa" + "1" * 38, "Media/DCIM/100APPLE/IMG_0001.HEIC"),
+            ("bb" + "2" * 38, "Media/DCIM/100APPLE/IMG_0002.HEIC"),
+            ("cc" + "3" * 38, "Library/Preferences/com.apple.plist"),
+        ])
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_index_only_holds_media_rows(self):
+        index = get_manifest_index(self.conn)
+
+        self.assertEqual(len(index.file_id_by_path), 2)
+        self.assertEqual(
+            index.find_file_id("Media/DCIM/100APPLE/IMG_0001.HEIC"),
+            "aa" + "1" * 38,
+        )
+
+    def test_missing_path_raises(self):
+        index = get_manifest_index(self.conn)
+
+        with self.assertRaises(FileNotFoundError):
+            index.find_file_id("Media/DCIM/100APPLE/IMG_9999.HEIC")
+
+    def test_mov_companion_found_in_any_dcim_folder(self):
+        conn = _make_manifest_conn([
+            ("dd" + "4" * 38, "Media/DCIM/101APPLE/IMG_0003.MOV"),
+            ("ee" + "5" * 38, "Media/IMG_0004.MOV"),
+        ])
+        index = get_manifest_index(conn)
+        conn.close()
+
+        self.assertEqual(
+            index.find_mov_companion("img_0003.mov"), "dd" + "4" * 38
+        )
+        with self.assertRaises(FileNotFoundError):
+            index.find_mov_companion("IMG_0004.MOV")
+
+    def test_fallback_prefers_shortest_non_sidecar_path(self):
+        conn = _make_manifest_conn([
+            ("ff" + "6" * 38, "Media/PhotoData/Thumbnails/IMG_0005.JPG"),
+            ("ab" + "7" * 38, "Media/DCIM/100APPLE/sub/IMG_0005.JPG"),
+            ("ac" + "8" * 38, "Media/DCIM/100APPLE/IMG_0005.JPG"),
+            ("ad" + "9" * 38, "Media/DCIM/100APPLE/IMG_0005.AAE"),
+        ])
+        index = get_manifest_index(conn)
+        conn.close()
+
+        self.assertEqual(
+            index.find_fallback("IMG_0005.HEIC", "img_0005.heic"),
+            "ac" + "8" * 38,
+        )
+        with self.assertRaises(FileNotFoundError):
+            index.find_fallback("IMG_0006.HEIC")
+
+    def test_build_assets_matches_per_row_lookup(self):
+        raw_assets = [
+            _make_row(1, "IMG_0001.HEIC"),
+            _make_row(2, "IMG_0002.HEIC"),
+        ]
+        index = get_manifest_index(self.conn)
+
+        indexed, indexed_skipped = build_assets(
+            raw_assets, build_membership_lookup([]), Path("root"), self.conn, index
+        )
+        queried, queried_skipped = build_assets(
+            raw_assets, build_membership_lookup([]), Path("root"), self.conn
+        )
+
+        self.assertEqual(indexed_skipped, queried_skipped)
+        self.assertEqual(
+            [a.backup_hashed_filename for a in indexed],
+            [a.backup_hashed_filename for a in queried],
+        )
+
+
+class TestIncrementalBuildAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = _make_manifest_conn([
+            ("aa" + "1" * 38, "Media/DCIM/100APPLE/IMG_0001.HEIC"),
+            ("bb" + "2" * 38, "Media/DCIM/100APPLE/IMG_0002.HEIC"),
+        ])
+        self.index = get_manifest_index(self.conn)
+        self.rows = [
+            _make_row(1, "IMG_0001.HEIC", ZMODIFICATIONDATE=10.0),
+            _make_row(2, "IMG_0002.HEIC", ZMODIFICATIONDATE=10.0),
+        ]
+        previous, _ = build_assets(
+            self.rows, build_membership_lookup([]), Path("root"), self.conn, self.index
+        )
+        self.previous = {asset.asset_uuid: asset for asset in previous}
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_unchanged_assets_are_reused(self):
+        assets, _ = build_assets(
+            self.rows, build_membership_lookup([]), Path("root"), self.conn, self.index, self.previous
+        )
+
+        self.assertIs(assets[0], self.previous["uuid-1"])
+        self.assertIs(assets[1], self.previous["uuid-2"])
+
+    def test_modified_asset_is_rebuilt(self):
+        rows = [dict(self.rows[0]), dict(self.rows[1], ZMODIFICATIONDATE=20.0)]
+
+        assets, _ = build_assets(
+            rows, build_membership_lookup([]), Path("root"), self.conn, self.index, self.previous
+        )
+
+        self.assertIs(assets[0], self.previous["uuid-1"])
+        self.assertIsNot(assets[1], self.previous["uuid-2"])
+
+    def test_new_album_membership_is_rebuilt(self):
+        assets, _ = build_assets(
+            self.rows,
+            build_membership_lookup([{"asset_pk": 1, "album_uuid": "album-uuid"}]),
+            Path("root"),
+            self.conn,
+            self.index,
+            self.previous,
+        )
+
+        self.assertEqual(assets[0].relationships.user_albums, ["album-uuid"])
+        self.assertIs(assets[1], self.previous["uuid-2"])
+
+
+class TestStreamingQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = _make_manifest_conn([
+            (f"{i:040d}", f"Media/DCIM/100APPLE/IMG_{i:04d}.JPG")
+            for i in range(25)
+        ])
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_iter_query_yields_every_row_across_batches(self):
+        rows = list(iter_query(
+            self.conn, "SELECT fileID FROM Files ORDER BY fileID", batch_size=4
+        ))
+
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[-1]["fileID"], f"{24:040d}")
+
+    def test_bad_query_raises_runtime_error(self):
+        with self.assertRaises(RuntimeError):
+            list(iter_query(self.conn, "SELECT nope FROM Files"))
+
+
+class TestOpenDb(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "Manifest.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE Files (fileID TEXT, relativePath TEXT)")
+        conn.execute("INSERT INTO Files VALUES ('abc', 'Media/a.jpg')")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_default_mode_is_read_only(self):
+        with open_db(self.db_path) as conn:
+            row = conn.execute("SELECT fileID FROM Files").fetchone()
+            self.assertEqual(row["fileID"], "abc")
+
+            with self.assertRaises(sqlite3.Error):
+                conn.execute("CREATE INDEX idx ON Files(relativePath)")
+
+    def test_in_memory_mode_reads_snapshot(self):
+        with open_db(self.db_path, mode=IN_MEMORY) as conn:
+            rows = conn.execute("SELECT relativePath FROM Files").fetchall()
+
+        self.assertEqual([row["relativePath"] for row in rows], ["Media/a.jpg"])
+
+    def test_read_write_mode_allows_writes(self):
+        with open_db(self.db_path, mode=READ_WRITE) as conn:
+            conn.execute("INSERT INTO Files VALUES ('def', 'Media/b.jpg')")
+            conn.commit()
+
+        with open_db(self.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM Files").fetchone()[0]
+        self.assertEqual(count, 2)
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            with open_db(self.db_path, mode="bogus"):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()